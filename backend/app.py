@@ -1,10 +1,32 @@
-from flask import Flask, request, jsonify, session
+from flask import Flask, Response, request, jsonify, session, g, stream_with_context
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from dotenv import load_dotenv
-import psycopg2
 import os
+import json
+import base64
+import binascii
+import queue
+import re
+import functools
+import hashlib
+import heapq
+import io
+from urllib.parse import urlencode
+
+from psycopg2.extras import execute_values
+
+from availability import merge_intervals, working_windows, free_intervals, rank_slots
+from avatars import is_data_url, load_avatar, store_avatar
+from cache import TTLCache
+from calendar_io import CONTENT_TYPES, PARSERS, WRITERS, copy_buffer, validate_activity
+from db import get_pool
+from outbox import enqueue_event, outbox_stats
+from response_cache import create_response_cache
+from serialization import RowEncoder, dumps, hhmm, json_response, stream_json_array, stream_json_object
+from realtime import get_listener
+from recurrence import expand_rows, occurrences, parse_series
 
 load_dotenv()
 
@@ -17,23 +39,48 @@ if frontend_url:
 else:
     CORS(app)
 
-# DB_HOST = "localhost"
-# DB_NAME = "planit"
-# DB_USER = os.getenv("DB_USER")
-# DB_PASS = os.getenv("DB_PASS")
-# DB_PORT = "5432"
+MAX_PAGE_SIZE = 1000
+BULK_PAGE_SIZE = 1000
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+SSE_KEEPALIVE_SECONDS = 15
+SSE_RETRY_MS = 5000
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 50
+BULK_MAX_REPORTED_ERRORS = 1000
+CALENDAR_MAX_DAYS = 92
+AVAILABILITY_MAX_DAYS = 31
+USER_BATCH_MAX = 5000
+# How far ahead a recurring item being saved is checked for conflicts
+RECURRENCE_CONFLICT_DAYS = 366
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+# Endpoints that never finish, serve binary bodies or write files are not available in /api/batch
+BATCH_EXCLUDED_ENDPOINTS = {'stream_notifications', 'export_calendar', 'get_avatar'}
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))
+# Let Postgres render the nested goal and team documents instead of regrouping rows in Python
+DB_JSON_DOCUMENTS = os.getenv("DB_JSON_DOCUMENTS", "false").lower() == "true"
+# Stream unpaged activity, goal and notification lists from named cursors instead of fetchall()
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "false").lower() == "true"
+STREAM_ITERSIZE = int(os.getenv("STREAM_ITERSIZE", "500"))
+# The pool, cache and outbox stats endpoints expose server internals and have no access control
+STATS_ENDPOINTS = os.getenv("STATS_ENDPOINTS", "false").lower() == "true"
+
+google_id_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+user_profile_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+response_cache = create_response_cache(os.getenv("RESPONSE_CACHE_URL"), int(os.getenv("RESPONSE_CACHE_TTL", "300")))
 
 def get_db_connection():
-    """Create and return a database connection"""
-    # conn = psycopg2.connect(
-    #     host=DB_HOST,
-    #     database=DB_NAME,
-    #     user=DB_USER,
-    #     password=DB_PASS,
-    #     port=DB_PORT
-    # )
-    conn = psycopg2.connect(os.getenv("DATABASE_URL"))
-    return conn
+    """Return the pooled connection for the current request, checking one out on first use"""
+    if 'db_conn' not in g:
+        g.db_conn = get_pool().getconn()
+    return g.db_conn
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    """Hand the request's connection back to the pool; uncommitted work is rolled back"""
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        get_pool().putconn(conn)
 
 def _get_internal_user_id(cur, user_id_param):
     """
@@ -44,9 +91,347 @@ def _get_internal_user_id(cur, user_id_param):
     try:
         return int(user_id_param)
     except (ValueError, TypeError):
-        cur.execute("SELECT UserId FROM Users WHERE GoogleId = %s", (str(user_id_param),))
-        result = cur.fetchone()
-        return result[0] if result else None
+        google_id = str(user_id_param)
+        user_id = google_id_cache.get(google_id)
+        if user_id is None:
+            cur.execute("SELECT UserId FROM Users WHERE GoogleId = %s", (google_id,))
+            result = cur.fetchone()
+            if not result:
+                return None
+            user_id = result[0]
+            google_id_cache.set(google_id, user_id)
+        return user_id
+
+def _user_profile_from_row(row):
+    """Build the public profile dict from (UserId, UserName, UserEmail, UserDOB, UserBio, UserProfilePicture, GoogleId)"""
+    return {
+        'userid': row[0],
+        'username': row[1],
+        'useremail': row[2],
+        'userdob': row[3].isoformat() if row[3] else None,
+        'userbio': row[4],
+        'userprofilepicture': row[5],
+        'isgoogleuser': row[6] is not None
+    }
+
+def _get_user_profiles(cur, user_ids):
+    """
+    Return {user_id: profile dict} for the given users, serving cached profiles and
+    fetching the rest in one query. Users that do not exist are left out.
+    """
+    profiles = {}
+    missing_ids = []
+    for user_id in dict.fromkeys(user_ids):
+        profile = user_profile_cache.get(user_id)
+        if profile is None:
+            missing_ids.append(user_id)
+        else:
+            profiles[user_id] = dict(profile)
+
+    if missing_ids:
+        cur.execute(
+            """
+            SELECT UserId, UserName, UserEmail, UserDOB, UserBio, UserProfilePicture, GoogleId
+            FROM Users
+            WHERE UserId = ANY(%s)
+            """,
+            (missing_ids,)
+        )
+        for row in cur.fetchall():
+            profile = _user_profile_from_row(row)
+            user_profile_cache.set(row[0], profile)
+            profiles[row[0]] = dict(profile)
+    return profiles
+
+def _invalidate_user_cache(user_id=None, google_id=None):
+    """Drop cached identity and profile entries after a committed user change"""
+    if user_id is not None:
+        user_profile_cache.delete(user_id)
+    if google_id is not None:
+        google_id_cache.delete(google_id)
+
+def _request_cache_key():
+    """Path plus the sorted query string (which carries userId) and, when known, the user's data version"""
+    key = request.path + '?' + urlencode(sorted(request.args.items(multi=True)))
+    if 'data_version' in g:
+        key += f'#v{g.data_version}'
+    return key
+
+def conditional_get(view):
+    """
+    Give a per-user GET endpoint a strong ETag derived from the user's data version.
+    The version is read before the view runs, so a matching If-None-Match is answered
+    with 304 without running the view's queries, and a version read ahead of a concurrent
+    write can only make the ETag older than the body, never newer.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        user_id_param = request.args.get('userId')
+        if not user_id_param:
+            return view(*args, **kwargs)
+
+        try:
+            cur = get_db_connection().cursor()
+            internal_user_id = _get_internal_user_id(cur, user_id_param)
+            if internal_user_id is None:
+                return view(*args, **kwargs)
+            cur.execute("SELECT Version FROM UserDataVersion WHERE UserId = %s", (internal_user_id,))
+            row = cur.fetchone()
+        except Exception as e:
+            print(f"Error reading data version: {str(e)}")
+            # The failed query aborted the transaction the view is about to reuse
+            get_db_connection().rollback()
+            return view(*args, **kwargs)
+
+        g.data_version = row[0] if row else 0
+        etag = hashlib.sha1(_request_cache_key().encode()).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return wrapper
+
+def cached_response(view):
+    """
+    Serve a GET endpoint through the shared response cache, keyed by _request_cache_key.
+    The view declares what its payload depends on with _tag_response.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        # Batched reads see an older snapshot, which must not be written back to the shared cache
+        if response_cache is None or 'batch_snapshot' in g:
+            return view(*args, **kwargs)
+
+        streamed = []
+
+        def compute():
+            g.cache_tags = set()
+            response = app.make_response(view(*args, **kwargs))
+            tags = g.pop('cache_tags')
+            # Reading a streamed body here would buffer all of it; such responses go out uncached
+            if response.is_streamed or response.direct_passthrough:
+                streamed.append(response)
+                return response.status_code, None, tags
+            return response.status_code, response.get_data(as_text=True), tags
+
+        try:
+            entry, hit = response_cache.get_or_compute(_request_cache_key(), compute)
+        except Exception as e:
+            print(f"Response cache error: {e}")
+            g.pop('cache_tags', None)
+            return view(*args, **kwargs)
+
+        if streamed:
+            streamed[0].headers['X-Cache'] = 'BYPASS'
+            return streamed[0]
+        response = Response(entry['body'], status=entry['status'], mimetype='application/json')
+        response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
+    return wrapper
+
+def _tag_response(*tags):
+    """Record cache tags for the response being built, if it is being cached"""
+    if 'cache_tags' in g:
+        g.cache_tags.update(tags)
+
+def _invalidate_response_cache(*tags):
+    """Expire cached responses carrying any of the tags; call after commit"""
+    if response_cache is None or not tags:
+        return
+    try:
+        response_cache.invalidate(tags)
+    except Exception as e:
+        print(f"Response cache invalidation failed: {e}")
+
+def _get_meeting_members(cur, meeting_ids):
+    """
+    Fetch the invited members of every given meeting in a single query.
+    Returns a dict mapping each meeting ID to its list of member dicts, ordered by user name.
+    """
+    members_by_meeting = {meeting_id: [] for meeting_id in meeting_ids}
+    if not meeting_ids:
+        return members_by_meeting
+
+    cur.execute(
+        "SELECT MeetingId, UserId, Status, InvitationType FROM MeetingInvitations WHERE MeetingId = ANY(%s)",
+        (list(meeting_ids),)
+    )
+    invitations = cur.fetchall()
+    profiles = _get_user_profiles(cur, [row[1] for row in invitations])
+    _tag_response(*(f'meeting:{meeting_id}' for meeting_id in meeting_ids))
+    _tag_response(*(f'profile:{user_id}' for user_id in profiles))
+    for meeting_id, user_id, status, invitation_type in invitations:
+        profile = profiles.get(user_id)
+        if profile is None:
+            continue
+        members_by_meeting[meeting_id].append({
+            'userid': user_id,
+            'username': profile['username'],
+            'useremail': profile['useremail'],
+            'userprofilepicture': profile['userprofilepicture'],
+            'status': status,
+            'invitationtype': invitation_type
+        })
+    for members in members_by_meeting.values():
+        members.sort(key=lambda member: member['username'] or '')
+    return members_by_meeting
+
+def _iter_query(query, params, name='stream'):
+    """
+    Execute query on a named (server-side) cursor of the request's connection and return
+    an iterator over its rows, fetched STREAM_ITERSIZE at a time. The query runs right
+    away, so errors surface in the caller; the cursor is closed once the rows run out.
+    """
+    cur = get_db_connection().cursor(name=name)
+    cur.itersize = STREAM_ITERSIZE
+    cur.execute(query, params)
+
+    def rows():
+        try:
+            yield from cur
+        finally:
+            cur.close()
+    return rows()
+
+def _stream_response(chunks, **kwargs):
+    """Response whose body is written from a generator that may still use the request's connection"""
+    kwargs.setdefault('mimetype', 'application/json')
+    return Response(stream_with_context(chunks), **kwargs)
+
+def _stream_json_documents(query, params, head, tail, on_row=None):
+    """
+    Stream a query whose first column is a JSON text per row as the elements of an array
+    between head and tail, so neither the rows nor the response body are held in memory.
+    on_row, if given, sees every row as it is written (e.g. to record cache tags).
+    """
+    rows = _iter_query(query, params, name='json_documents')
+
+    def documents():
+        for row in rows:
+            if on_row:
+                on_row(row)
+            yield row[0]
+
+    return _stream_response(stream_json_array(documents(), head, tail))
+
+def _record_deletions(cur, entity_type, user_entity_ids):
+    """Write sync tombstones for deleted rows as (UserId, EntityId) pairs so /api/sync can report them"""
+    if not user_entity_ids:
+        return
+    execute_values(
+        cur,
+        "INSERT INTO DeletedItems (UserId, EntityType, EntityId) VALUES %s",
+        [(user_id, entity_type, entity_id) for user_id, entity_id in user_entity_ids],
+        page_size=BULK_PAGE_SIZE
+    )
+
+def _resolve_users(cur, user_ids=(), emails=(), google_ids=()):
+    """
+    Look up users by any mix of ids, emails and Google IDs in one query.
+    Emails match case-insensitively (through the LOWER(UserEmail) index); if several
+    accounts differ only in case, the one spelled exactly as given wins.
+    Returns (profiles by UserId, found, missing): found maps 'userIds', 'emails' and
+    'googleIds' to {value as given (ids as strings): UserId}, missing to the values that
+    matched nobody.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    emails = list(dict.fromkeys(email for email in emails if email))
+    google_ids = list(dict.fromkeys(google_id for google_id in google_ids if google_id))
+
+    int_ids = []
+    for user_id in user_ids:
+        try:
+            int_ids.append(int(user_id))
+        except (ValueError, TypeError):
+            pass
+
+    rows = []
+    if int_ids or emails or google_ids:
+        cur.execute(
+            """
+            SELECT UserId, UserName, UserEmail, UserDOB, UserBio, UserProfilePicture, GoogleId
+            FROM Users
+            WHERE UserId = ANY(%s) OR LOWER(UserEmail) = ANY(%s) OR GoogleId = ANY(%s)
+            """,
+            (int_ids, [email.lower() for email in emails], google_ids)
+        )
+        rows = cur.fetchall()
+
+    profiles = {}
+    by_email = {}
+    by_google_id = {}
+    for row in rows:
+        profile = _user_profile_from_row(row)
+        user_profile_cache.set(row[0], profile)
+        profiles[row[0]] = dict(profile)
+        if row[2]:
+            by_email.setdefault(row[2].lower(), []).append(row)
+        if row[6]:
+            by_google_id[row[6]] = row[0]
+
+    found = {'userIds': {}, 'emails': {}, 'googleIds': {}}
+    missing = {'userIds': [], 'emails': [], 'googleIds': []}
+    for user_id in user_ids:
+        try:
+            matched = int(user_id) in profiles
+        except (ValueError, TypeError):
+            matched = False
+        if matched:
+            found['userIds'][str(user_id)] = int(user_id)
+        else:
+            missing['userIds'].append(user_id)
+    for email in emails:
+        candidates = by_email.get(email.lower())
+        if candidates:
+            exact = [row for row in candidates if row[2] == email]
+            found['emails'][email] = (exact or candidates)[0][0]
+        else:
+            missing['emails'].append(email)
+    for google_id in google_ids:
+        if google_id in by_google_id:
+            found['googleIds'][google_id] = by_google_id[google_id]
+        else:
+            missing['googleIds'].append(google_id)
+    return profiles, found, missing
+
+def _resolve_user_ids_by_email(cur, emails):
+    """Map each registered email, as given, to its UserId with one query; unknown emails are left out"""
+    return _resolve_users(cur, emails=emails)[1]['emails']
+
+def _add_team_members(cur, team_id, user_ids):
+    """Add users to a team in one statement, skipping those who are already members"""
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return
+    execute_values(
+        cur,
+        """
+        INSERT INTO TeamMembers (TeamId, UserId)
+        SELECT v.TeamId, v.UserId FROM (VALUES %s) AS v(TeamId, UserId)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM TeamMembers tm WHERE tm.TeamId = v.TeamId AND tm.UserId = v.UserId
+        )
+        """,
+        [(team_id, user_id) for user_id in user_ids],
+        page_size=BULK_PAGE_SIZE
+    )
+
+def _add_meeting_invitations(cur, meeting_id, user_ids, invitation_type):
+    """Invite users to a meeting in one statement; mandatory invitations start out accepted"""
+    if not user_ids:
+        return
+    status = 'accepted' if invitation_type == 'mandatory' else 'pending'
+    execute_values(
+        cur,
+        "INSERT INTO MeetingInvitations (MeetingId, UserId, InvitationType, Status) VALUES %s",
+        [(meeting_id, user_id, invitation_type, status) for user_id in dict.fromkeys(user_ids)],
+        page_size=BULK_PAGE_SIZE
+    )
 
 def format_time_to_hhmm(time_obj):
     """Convert time object to HH:MM format string"""
@@ -76,6 +461,17 @@ def parse_time_from_hhmm(time_str):
     except ValueError:
         return None
 
+def _encode_cursor(values):
+    """Encode keyset pagination values into an opaque URL-safe cursor string"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def _decode_cursor(cursor):
+    """Decode a cursor produced by _encode_cursor back into its list of values"""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+
 @app.route('/api/register', methods=['POST'])
 def register():
     data = request.get_json()
@@ -134,6 +530,7 @@ def register():
         
         user_id = cur.fetchone()[0]
         conn.commit()
+        _invalidate_user_cache(user_id, google_id)
         
         return jsonify({'success': True, 'message': 'User registered successfully', 'userId': user_id}), 201
         
@@ -141,8 +538,6 @@ def register():
         if conn: conn.rollback()
         print(f"Error during registration: {str(e)}")
         return jsonify({'success': False, 'message': 'Registration failed', 'error': str(e)}), 500
-    finally:
-        if conn: conn.close()
 
 @app.route('/api/login', methods=['POST'])
 def login():
@@ -173,6 +568,8 @@ def login():
             if user_record and image_url and image_url != user_record[3]:
                 cur.execute("UPDATE Users SET UserProfilePicture = %s WHERE UserId = %s AND UserProfilePicture IS NULL", (image_url, user_record[0]))
                 conn.commit()
+                _invalidate_user_cache(user_record[0])
+                _invalidate_response_cache(f'profile:{user_record[0]}')
         else:
             cur.execute("SELECT UserId, UserName, UserEmail, UserPassword, UserProfilePicture FROM Users WHERE UserEmail = %s", (email,))
             user_record = cur.fetchone()
@@ -218,9 +615,190 @@ def login():
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Login failed', 'error': str(e)}), 500
-    
-    finally:
-        if conn: conn.close()
+
+def _times_overlap(start_a, end_a, start_b, end_b):
+    """Compare two daily time windows; a missing window means the whole day"""
+    if not (start_a and end_a and start_b and end_b):
+        return True
+    return start_a < end_b and start_b < end_a
+
+def _series_from_request(data, prefix, current=(None, None)):
+    """
+    Read the start date and recurrence of an activity or meeting from a request body:
+    `<prefix>Date`, `<prefix>Recurrence` (RRULE text) and `<prefix>ExceptionDates`.
+    Keys missing from the request keep their `current` stored values.
+    Returns (start date, (rule, exceptions, end)); raises ValueError with a message for the client.
+    """
+    try:
+        start_date = datetime.strptime(str(data.get(f'{prefix}Date')), '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'{prefix}Date must use YYYY-MM-DD format')
+    rule = data.get(f'{prefix}Recurrence', current[0])
+    exception_dates = data.get(f'{prefix}ExceptionDates', current[1])
+    return start_date, parse_series(rule, exception_dates, start_date)
+
+def _find_conflicts(cur, user_ids, start_date, end_date, start_time=None, end_time=None, exclude=None, series=None):
+    """
+    Find the activities, goal timelines and meetings of the given users that overlap a
+    candidate spanning start_date..end_date, daily between start_time and end_time
+    (all day when either is missing). Candidates are narrowed with the GiST-indexed
+    range columns, then timeline time windows are checked per day. Recurring activities
+    and meetings are read by their series window and expanded inside the candidate's dates.
+    exclude maps 'activity', 'goal' or 'meeting' to an ID to ignore, e.g. the item being edited.
+    series is the candidate's own (rule, exceptions, end) from _series_from_request; a
+    recurring candidate is checked on its occurrences over the next RECURRENCE_CONFLICT_DAYS.
+    Returns {user_id: [conflict, ...]} ordered by start.
+    """
+    exclude = exclude or {}
+    candidate_days = None
+    if series and series[0]:
+        rule, exceptions, last = series
+        end_date = start_date + timedelta(days=RECURRENCE_CONFLICT_DAYS - 1)
+        if last and last < end_date:
+            end_date = last
+        candidate_days = set(occurrences(rule, start_date, start_date, end_date, exceptions, last))
+        if not candidate_days:
+            return {user_id: [] for user_id in user_ids}
+    if start_date == end_date and start_time and end_time and start_time < end_time:
+        span = (datetime.combine(start_date, start_time), datetime.combine(end_date, end_time))
+    else:
+        span = (datetime.combine(start_date, datetime.min.time()),
+                datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+
+    cur.execute(
+        """
+        WITH candidate AS (SELECT tsrange(%(span_start)s, %(span_end)s) AS span)
+        SELECT a.UserId, 'activity', a.ActivityId, NULL::integer, a.ActivityTitle,
+               a.ActivityDate, a.ActivityDate, a.ActivityStartTime, a.ActivityEndTime,
+               NULL::text, NULL::date[], NULL::date
+        FROM Activity a, candidate c
+        WHERE a.UserId = ANY(%(user_ids)s) AND a.ActivityRange && c.span AND a.RecurrenceRule IS NULL
+          AND a.ActivityId IS DISTINCT FROM %(activity_id)s
+        UNION ALL
+        SELECT a.UserId, 'activity', a.ActivityId, NULL, a.ActivityTitle,
+               a.ActivityDate, a.ActivityDate, a.ActivityStartTime, a.ActivityEndTime,
+               a.RecurrenceRule, a.RecurrenceExceptions, a.RecurrenceEnd
+        FROM Activity a
+        WHERE a.UserId = ANY(%(user_ids)s) AND a.RecurrenceRule IS NOT NULL
+          AND a.ActivityEndTime > a.ActivityStartTime
+          AND a.ActivityDate <= %(end_date)s AND (a.RecurrenceEnd IS NULL OR a.RecurrenceEnd >= %(start_date)s)
+          AND a.ActivityId IS DISTINCT FROM %(activity_id)s
+        UNION ALL
+        SELECT g.UserId, 'goal', g.GoalId, t.TimelineId, g.GoalTitle || ' - ' || t.TimelineTitle,
+               t.TimelineStartDate, t.TimelineEndDate, t.TimelineStartTime, t.TimelineEndTime,
+               NULL, NULL, NULL
+        FROM Goal g
+        JOIN Timeline t ON t.GoalId = g.GoalId, candidate c
+        WHERE g.UserId = ANY(%(user_ids)s) AND t.TimelineSpan && c.span
+          AND g.GoalId IS DISTINCT FROM %(goal_id)s
+        UNION ALL
+        SELECT tmem.UserId, 'meeting', tm.TeamMeetingId, NULL, tm.MeetingTitle,
+               tm.MeetingDate, tm.MeetingDate, tm.MeetingStartTime, tm.MeetingEndTime,
+               tm.RecurrenceRule, tm.RecurrenceExceptions, tm.RecurrenceEnd
+        FROM TeamMembers tmem
+        JOIN Team t ON t.TeamId = tmem.TeamId
+        JOIN TeamMeeting tm ON tm.TeamId = tmem.TeamId, candidate c
+        WHERE tmem.UserId = ANY(%(user_ids)s)
+          AND (tm.MeetingRange && c.span AND tm.RecurrenceRule IS NULL
+               OR tm.RecurrenceRule IS NOT NULL AND tm.MeetingEndTime > tm.MeetingStartTime
+                  AND tm.MeetingDate <= %(end_date)s AND (tm.RecurrenceEnd IS NULL OR tm.RecurrenceEnd >= %(start_date)s))
+          AND tm.TeamMeetingId IS DISTINCT FROM %(meeting_id)s
+          AND (t.CreatedByUserId = tmem.UserId OR EXISTS (
+              SELECT 1 FROM MeetingInvitations mi
+              WHERE mi.MeetingId = tm.TeamMeetingId AND mi.UserId = tmem.UserId AND mi.Status = 'accepted'
+          ))
+        """,
+        {
+            'span_start': span[0],
+            'span_end': span[1],
+            'start_date': start_date,
+            'end_date': end_date,
+            'user_ids': list(user_ids),
+            'activity_id': exclude.get('activity'),
+            'goal_id': exclude.get('goal'),
+            'meeting_id': exclude.get('meeting')
+        }
+    )
+
+    rows = list(expand_rows(cur.fetchall(), (5, 6), 9, start_date, end_date))
+    rows.sort(key=lambda row: (row[5], row[7] is None, row[7] or datetime.min.time()))
+
+    conflicts = {user_id: [] for user_id in user_ids}
+    for user_id, item_type, item_id, timeline_id, title, item_start_date, item_end_date, item_start, item_end, *_ in rows:
+        if not _times_overlap(start_time, end_time, item_start, item_end):
+            continue
+        if candidate_days is not None and not (
+            item_start_date in candidate_days if item_start_date == item_end_date
+            else any(item_start_date <= day <= item_end_date for day in candidate_days)
+        ):
+            continue
+        conflicts[user_id].append({
+            'type': item_type,
+            'id': item_id,
+            'timelineId': timeline_id,
+            'title': title,
+            'startDate': item_start_date.isoformat(),
+            'endDate': item_end_date.isoformat(),
+            'startTime': format_time_to_hhmm(item_start),
+            'endTime': format_time_to_hhmm(item_end),
+            'time': f'{format_time_to_hhmm(item_start)} - {format_time_to_hhmm(item_end)}' if item_start and item_end else 'All day'
+        })
+    return conflicts
+
+@app.route('/api/conflicts', methods=['POST'])
+def find_conflicts():
+    """
+    Check candidate items against a user's calendar.
+    Each item has either `date` (activity or meeting) or `startDate`/`endDate` (timeline),
+    plus optional `startTime`/`endTime`. As in the calendar, activities and meetings without
+    times never conflict, while a timeline without times blocks whole days.
+    Returns one list of conflicts per item.
+    """
+    data = request.get_json()
+    user_id_param = data.get('userId')
+    items = data.get('items', [])
+    exclude = {
+        'activity': data.get('excludeActivityId'),
+        'goal': data.get('excludeGoalId'),
+        'meeting': data.get('excludeMeetingId')
+    }
+
+    if not user_id_param:
+        return jsonify({'success': False, 'message': 'User ID is required'}), 400
+
+    try:
+        candidates = []
+        for item in items:
+            start_date = datetime.strptime(item.get('startDate') or item['date'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(item.get('endDate') or item.get('startDate') or item['date'], '%Y-%m-%d').date()
+            start_time = parse_time_from_hhmm(item['startTime']) if item.get('startTime') else None
+            end_time = parse_time_from_hhmm(item['endTime']) if item.get('endTime') else None
+            candidates.append((start_date, end_date, start_time, end_time, 'date' not in item))
+    except (KeyError, ValueError, TypeError):
+        return jsonify({'success': False, 'message': 'Each item needs a valid date or startDate/endDate'}), 400
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        internal_user_id = _get_internal_user_id(cur, user_id_param)
+        if internal_user_id is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
+
+        results = []
+        for start_date, end_date, start_time, end_time, is_timeline in candidates:
+            if not is_timeline and not (start_time and end_time):
+                results.append([])
+                continue
+            conflicts = _find_conflicts(cur, [internal_user_id], start_date, end_date, start_time, end_time, exclude)
+            results.append(conflicts[internal_user_id])
+
+        return jsonify({'success': True, 'conflicts': results}), 200
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({'success': False, 'message': 'Failed to check conflicts', 'error': str(e)}), 500
 
 @app.route('/api/activities', methods=['POST'])
 def create_activity():
@@ -240,6 +818,11 @@ def create_activity():
     parsed_start_time = parse_time_from_hhmm(start_time) if start_time else None
     parsed_end_time = parse_time_from_hhmm(end_time) if end_time else None
 
+    try:
+        activity_date, series = _series_from_request(data, 'activity')
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
     conn = None
     try:
         conn = get_db_connection()
@@ -249,19 +832,28 @@ def create_activity():
         if internal_user_id is None:
             return jsonify({'success': False, 'message': 'User not found'}), 404
 
+        if data.get('checkConflicts') and parsed_start_time and parsed_end_time:
+            conflicts = _find_conflicts(cur, [internal_user_id], activity_date, activity_date, parsed_start_time, parsed_end_time,
+                                        series=series)
+            if conflicts[internal_user_id]:
+                return jsonify({'success': False, 'message': 'Activity conflicts with existing items', 'conflicts': conflicts[internal_user_id]}), 409
+
         cur.execute(
             """
             INSERT INTO Activity (ActivityTitle, ActivityDescription, ActivityCategory, 
                                  ActivityUrgency, ActivityDate, ActivityStartTime, 
-                                 ActivityEndTime, UserId)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                                 ActivityEndTime, UserId, RecurrenceRule, RecurrenceExceptions,
+                                 RecurrenceEnd)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::date[], %s)
             RETURNING ActivityId
             """,
-            (title, description, category, urgency, date, parsed_start_time, parsed_end_time, internal_user_id)
+            (title, description, category, urgency, activity_date, parsed_start_time, parsed_end_time, internal_user_id)
+            + series
         )
         
         activity_id = cur.fetchone()[0]
         conn.commit()
+        _invalidate_response_cache(f'user:{internal_user_id}')
         
         return jsonify({
             'success': True,
@@ -273,61 +865,295 @@ def create_activity():
         if conn: conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to create activity', 'error': str(e)}), 500
-    
-    finally:
-        if conn: conn.close()
 
+ACTIVITY_COPY_SQL = """
+    COPY Activity (ActivityTitle, ActivityDescription, ActivityCategory, ActivityUrgency,
+                   ActivityDate, ActivityStartTime, ActivityEndTime, UserId)
+    FROM STDIN
+"""
 
-@app.route('/api/activities', methods=['GET'])
-def get_activities():
+def _load_activity_chunk(cur, chunk):
+    """
+    COPY a chunk of (row number, activity values) into Activity.
+    If the database rejects the chunk, its rows are inserted one at a time instead so that
+    only the offending rows are skipped. Returns (rows loaded, [(row number, error)]).
+    """
+    cur.execute("SAVEPOINT activity_chunk")
+    try:
+        cur.copy_expert(ACTIVITY_COPY_SQL, copy_buffer(values for _, values in chunk))
+        cur.execute("RELEASE SAVEPOINT activity_chunk")
+        return len(chunk), []
+    except Exception:
+        cur.execute("ROLLBACK TO SAVEPOINT activity_chunk")
+
+    loaded = 0
+    errors = []
+    for number, values in chunk:
+        cur.execute("SAVEPOINT activity_row")
+        try:
+            cur.execute(
+                """
+                INSERT INTO Activity (ActivityTitle, ActivityDescription, ActivityCategory,
+                                      ActivityUrgency, ActivityDate, ActivityStartTime,
+                                      ActivityEndTime, UserId)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                values
+            )
+            cur.execute("RELEASE SAVEPOINT activity_row")
+            loaded += 1
+        except Exception as e:
+            cur.execute("ROLLBACK TO SAVEPOINT activity_row")
+            errors.append((number, str(e).strip()))
+    return loaded, errors
+
+@app.route('/api/activities/bulk', methods=['POST'])
+def bulk_import_activities():
+    """
+    Import activities from an NDJSON, CSV or iCalendar request body.
+    The format comes from the format query parameter or the Content-Type. The body is parsed
+    as it streams in and valid rows are loaded with COPY in chunks of BULK_PAGE_SIZE.
+    Rows that fail validation or are rejected by the database are skipped and reported by
+    row number (line for NDJSON and CSV, event for iCalendar).
+    """
     user_id_param = request.args.get('userId')
     if not user_id_param:
         return jsonify({'success': False, 'message': 'User ID is required'}), 400
-    
+
+    import_format = request.args.get('format') or {
+        content_type: name for name, content_type in CONTENT_TYPES.items()
+    }.get(request.mimetype)
+    if import_format not in PARSERS:
+        return jsonify({'success': False, 'message': 'Format must be one of: ndjson, csv, ics'}), 400
+
     conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor()
-        
+
         internal_user_id = _get_internal_user_id(cur, user_id_param)
         if internal_user_id is None:
             return jsonify({'success': False, 'message': 'User not found'}), 404
 
-        cur.execute(
-            """
-            SELECT ActivityId, ActivityTitle, ActivityDescription, ActivityCategory,
-                   ActivityUrgency, ActivityDate, ActivityStartTime, ActivityEndTime
-            FROM Activity 
-            WHERE UserId = %s
-            ORDER BY ActivityDate, ActivityStartTime
-            """,
-            (internal_user_id,)
-        )
-        
-        activities = []
-        for row in cur.fetchall():
-            activities.append({
-                'activityid': row[0],
-                'activitytitle': row[1],
-                'activitydescription': row[2],
-                'activitycategory': row[3],
-                'activityurgency': row[4],
-                'activitydate': row[5].isoformat() if row[5] else None,
-                'activitystarttime': format_time_to_hhmm(row[6]),
-                'activityendtime': format_time_to_hhmm(row[7])
-            })
-        
+        imported = 0
+        failed = 0
+        errors = []
+        chunk = []
+
+        def report(number, message):
+            nonlocal failed
+            failed += 1
+            if len(errors) < BULK_MAX_REPORTED_ERRORS:
+                errors.append({'row': number, 'error': message})
+
+        def load(chunk):
+            nonlocal imported
+            loaded, chunk_errors = _load_activity_chunk(cur, chunk)
+            imported += loaded
+            for number, message in chunk_errors:
+                report(number, message)
+
+        lines = io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline='')
+        for number, record in PARSERS[import_format](lines):
+            if isinstance(record, str):
+                report(number, record)
+                continue
+            try:
+                chunk.append((number, validate_activity(record) + (internal_user_id,)))
+            except ValueError as e:
+                report(number, str(e))
+                continue
+            if len(chunk) >= BULK_PAGE_SIZE:
+                load(chunk)
+                chunk = []
+        if chunk:
+            load(chunk)
+
+        conn.commit()
+        if imported:
+            _invalidate_response_cache(f'user:{internal_user_id}')
+
         return jsonify({
             'success': True,
-            'activities': activities
+            'imported': imported,
+            'failed': failed,
+            'errors': errors
         }), 200
-        
+
+    except UnicodeDecodeError:
+        if conn: conn.rollback()
+        return jsonify({'success': False, 'message': 'Request body must be UTF-8 text'}), 400
+    except Exception as e:
+        if conn: conn.rollback()
+        print(f"Error: {str(e)}")
+        return jsonify({'success': False, 'message': 'Failed to import activities', 'error': str(e)}), 500
+
+
+ACTIVITY_FIELDS = {
+    'activityid': ('ActivityId', None),
+    'activitytitle': ('ActivityTitle', None),
+    'activitydescription': ('ActivityDescription', None),
+    'activitycategory': ('ActivityCategory', None),
+    'activityurgency': ('ActivityUrgency', None),
+    'activitydate': ('ActivityDate', None),
+    'activitystarttime': ('ActivityStartTime', hhmm),
+    'activityendtime': ('ActivityEndTime', hhmm),
+    'activityrecurrence': ('RecurrenceRule', None),
+    'activityexceptiondates': ('RecurrenceExceptions', None)
+}
+ACTIVITY_ENCODER = RowEncoder([(field, converter) for field, (_, converter) in ACTIVITY_FIELDS.items()])
+# get_activities selects its three keyset columns ahead of the requested fields
+ACTIVITY_PAGE_ENCODER = RowEncoder([(field, converter) for field, (_, converter) in ACTIVITY_FIELDS.items()], offset=3)
+
+def _activity_sort_key(row):
+    """(date, start time, id) keyset order of get_activities, with untimed activities last"""
+    return (row[0], row[1] is None, row[1] or datetime.min.time(), row[2])
+
+@app.route('/api/activities', methods=['GET'])
+@conditional_get
+@cached_response
+def get_activities():
+    """
+    List a user's activities ordered by date and start time.
+    Optional query parameters:
+      from / to   - inclusive YYYY-MM-DD bounds on ActivityDate; with both, recurring
+                    activities are listed once per occurrence inside the window
+      limit       - page size; when given, the response carries a nextCursor
+      cursor      - nextCursor from the previous page
+      fields      - comma-separated subset of activity fields to return
+    """
+    user_id_param = request.args.get('userId')
+    if not user_id_param:
+        return jsonify({'success': False, 'message': 'User ID is required'}), 400
+
+    date_from = request.args.get('from')
+    date_to = request.args.get('to')
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    fields = request.args.get('fields')
+
+    try:
+        parsed_from = datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else None
+        parsed_to = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else None
+        limit = min(int(limit), MAX_PAGE_SIZE) if limit else None
+        cursor_values = _decode_cursor(cursor) if cursor else None
+        if cursor_values:
+            cursor_date = datetime.strptime(cursor_values[0], '%Y-%m-%d').date()
+            # Full ISO time, so activities starting in the same minute are not skipped; HH:MM still parses
+            cursor_time = time.fromisoformat(cursor_values[1]) if cursor_values[1] else None
+            cursor_id = int(cursor_values[2])
+    except (ValueError, TypeError, IndexError):
+        return jsonify({'success': False, 'message': 'Invalid date range, limit or cursor'}), 400
+
+    if limit is not None and limit < 1:
+        return jsonify({'success': False, 'message': 'Limit must be positive'}), 400
+
+    selected_fields = [field.strip().lower() for field in fields.split(',') if field.strip()] if fields else list(ACTIVITY_FIELDS)
+    unknown_fields = [field for field in selected_fields if field not in ACTIVITY_FIELDS]
+    if unknown_fields:
+        return jsonify({'success': False, 'message': f'Unknown fields: {", ".join(unknown_fields)}'}), 400
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        internal_user_id = _get_internal_user_id(cur, user_id_param)
+        if internal_user_id is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
+        _tag_response(f'user:{internal_user_id}')
+
+        expand = parsed_from is not None and parsed_to is not None
+        conditions = ["UserId = %s"]
+        params = [internal_user_id]
+        if expand:
+            conditions.append("RecurrenceRule IS NULL")
+        if parsed_from:
+            conditions.append("ActivityDate >= %s")
+            params.append(parsed_from)
+        if parsed_to:
+            conditions.append("ActivityDate <= %s")
+            params.append(parsed_to)
+        if cursor_values:
+            # ActivityStartTime sorts NULLS LAST, so the keyset predicate spells out
+            # the null cases instead of using a plain row comparison.
+            if cursor_time is not None:
+                conditions.append(
+                    """(ActivityDate > %s
+                        OR (ActivityDate = %s AND (ActivityStartTime > %s OR ActivityStartTime IS NULL))
+                        OR (ActivityDate = %s AND ActivityStartTime = %s AND ActivityId > %s))"""
+                )
+                params.extend([cursor_date, cursor_date, cursor_time, cursor_date, cursor_time, cursor_id])
+            else:
+                conditions.append(
+                    "(ActivityDate > %s OR (ActivityDate = %s AND ActivityStartTime IS NULL AND ActivityId > %s))"
+                )
+                params.extend([cursor_date, cursor_date, cursor_id])
+
+        columns = ['ActivityDate', 'ActivityStartTime', 'ActivityId'] + [ACTIVITY_FIELDS[field][0] for field in selected_fields]
+        query = f"""
+            SELECT {', '.join(columns)}
+            FROM Activity
+            WHERE {' AND '.join(conditions)}
+            ORDER BY ActivityDate, ActivityStartTime, ActivityId
+        """
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit + 1)
+
+        if fields:
+            encoder = RowEncoder([(field, ACTIVITY_FIELDS[field][1]) for field in selected_fields], offset=3)
+        else:
+            encoder = ACTIVITY_PAGE_ENCODER
+
+        # Series are few, so their occurrences in the window are built up front and merged
+        # into the date-ordered rows; the page cursor applies to them like to any row.
+        occurrence_rows = []
+        if expand:
+            cur.execute(
+                f"""
+                SELECT {', '.join(columns)}, RecurrenceRule, RecurrenceExceptions, RecurrenceEnd
+                FROM Activity
+                WHERE UserId = %s AND RecurrenceRule IS NOT NULL AND ActivityDate <= %s
+                  AND (RecurrenceEnd IS NULL OR RecurrenceEnd >= %s)
+                """,
+                (internal_user_id, parsed_to, parsed_from)
+            )
+            date_indexes = [0] + [3 + i for i, field in enumerate(selected_fields) if field == 'activitydate']
+            occurrence_rows = sorted(
+                expand_rows(cur.fetchall(), date_indexes, len(columns), parsed_from, parsed_to),
+                key=_activity_sort_key
+            )
+            if cursor_values:
+                cursor_key = _activity_sort_key((cursor_date, cursor_time, cursor_id))
+                occurrence_rows = [row for row in occurrence_rows if _activity_sort_key(row) > cursor_key]
+
+        if STREAM_RESPONSES and limit is None:
+            rows = heapq.merge(_iter_query(query, params), occurrence_rows, key=_activity_sort_key)
+            return _stream_response(stream_json_object(
+                {'success': True, 'nextCursor': None}, 'activities', map(encoder, rows)
+            ))
+
+        cur.execute(query, params)
+        rows = cur.fetchall()
+        if occurrence_rows:
+            rows = list(heapq.merge(rows, occurrence_rows, key=_activity_sort_key))
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_cursor([last[0].isoformat(), last[1].isoformat() if last[1] else None, last[2]])
+
+        return json_response({
+            'success': True,
+            'activities': encoder.many(rows),
+            'nextCursor': next_cursor
+        })
+
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to fetch activities', 'error': str(e)}), 500
-    
-    finally:
-        if conn: conn.close()
 
 @app.route('/api/activities/<int:activity_id>', methods=['PUT'])
 def update_activity(activity_id):
@@ -353,21 +1179,43 @@ def update_activity(activity_id):
         conn = get_db_connection()
         cur = conn.cursor()
         
+        cur.execute("SELECT UserId, RecurrenceRule, RecurrenceExceptions FROM Activity WHERE ActivityId = %s", (activity_id,))
+        owner = cur.fetchone()
+        if not owner:
+            return jsonify({'success': False, 'message': 'Activity not found'}), 404
+
+        # A changed date moves the series, so its end is recomputed even when the rule is not sent
+        try:
+            activity_date, series = _series_from_request(data, 'activity', current=owner[1:])
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+
+        if data.get('checkConflicts') and parsed_start_time and parsed_end_time:
+            conflicts = _find_conflicts(cur, [owner[0]], activity_date, activity_date, parsed_start_time, parsed_end_time,
+                                        exclude={'activity': activity_id}, series=series)
+            if conflicts[owner[0]]:
+                return jsonify({'success': False, 'message': 'Activity conflicts with existing items', 'conflicts': conflicts[owner[0]]}), 409
+        
         cur.execute(
             """
             UPDATE Activity 
             SET ActivityTitle = %s, ActivityDescription = %s, ActivityCategory = %s,
                 ActivityUrgency = %s, ActivityDate = %s, ActivityStartTime = %s,
-                ActivityEndTime = %s
+                ActivityEndTime = %s, RecurrenceRule = %s, RecurrenceExceptions = %s::date[],
+                RecurrenceEnd = %s, UpdatedAt = CURRENT_TIMESTAMP
             WHERE ActivityId = %s
+            RETURNING UserId
             """,
-            (title, description, category, urgency, date, parsed_start_time, parsed_end_time, activity_id)
+            (title, description, category, urgency, activity_date, parsed_start_time, parsed_end_time)
+            + series + (activity_id,)
         )
+        updated = cur.fetchone()
         
-        if cur.rowcount == 0:
+        if not updated:
             return jsonify({'success': False, 'message': 'Activity not found'}), 404
         
         conn.commit()
+        _invalidate_response_cache(f'user:{updated[0]}')
         
         return jsonify({
             'success': True,
@@ -379,10 +1227,6 @@ def update_activity(activity_id):
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to update activity', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/activities/<int:activity_id>', methods=['DELETE'])
 def delete_activity(activity_id):
@@ -392,12 +1236,16 @@ def delete_activity(activity_id):
         conn = get_db_connection()
         cur = conn.cursor()
         
-        cur.execute("DELETE FROM Activity WHERE ActivityId = %s", (activity_id,))
+        cur.execute("DELETE FROM Activity WHERE ActivityId = %s RETURNING UserId", (activity_id,))
+        deleted = cur.fetchone()
         
-        if cur.rowcount == 0:
+        if not deleted:
             return jsonify({'success': False, 'message': 'Activity not found'}), 404
         
+        _record_deletions(cur, 'activity', [(deleted[0], activity_id)])
+        
         conn.commit()
+        _invalidate_response_cache(f'user:{deleted[0]}')
         
         return jsonify({
             'success': True,
@@ -409,10 +1257,91 @@ def delete_activity(activity_id):
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to delete activity', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
+
+def _save_timelines(cur, goal_id, timelines):
+    """
+    Make a goal's timelines match the given list in one statement: timelines whose timelineId
+    belongs to the goal are updated in place (only if something changed), the rest are inserted,
+    and existing timelines missing from the list are deleted.
+    Returns (timeline IDs in input order, deleted timeline IDs).
+    """
+    rows = []
+    seen_ids = set()
+    for index, timeline in enumerate(timelines):
+        timeline_id = timeline.get('timelineId')
+        if timeline_id in seen_ids:
+            timeline_id = None
+        seen_ids.add(timeline_id)
+        rows.append((
+            index,
+            timeline_id,
+            timeline.get('timelineTitle'),
+            timeline.get('timelineStartDate'),
+            timeline.get('timelineEndDate'),
+            parse_time_from_hhmm(timeline.get('timelineStartTime')) if timeline.get('timelineStartTime') else None,
+            parse_time_from_hhmm(timeline.get('timelineEndTime')) if timeline.get('timelineEndTime') else None,
+            goal_id
+        ))
+
+    # New rows get their IDs from the sequence up front, so each one stays paired with its Ord
+    results = execute_values(
+        cur,
+        """
+        WITH input (Ord, TimelineId, TimelineTitle, TimelineStartDate, TimelineEndDate,
+                    TimelineStartTime, TimelineEndTime, GoalId) AS (VALUES %s),
+        kept AS (
+            SELECT i.* FROM input i
+            JOIN Timeline t ON t.TimelineId = i.TimelineId AND t.GoalId = i.GoalId
+        ),
+        deleted AS (
+            DELETE FROM Timeline t
+            WHERE t.GoalId = (SELECT MIN(GoalId) FROM input)
+              AND t.TimelineId NOT IN (SELECT TimelineId FROM kept)
+            RETURNING t.TimelineId
+        ),
+        updated AS (
+            UPDATE Timeline t
+            SET TimelineTitle = k.TimelineTitle, TimelineStartDate = k.TimelineStartDate,
+                TimelineEndDate = k.TimelineEndDate, TimelineStartTime = k.TimelineStartTime,
+                TimelineEndTime = k.TimelineEndTime, UpdatedAt = CURRENT_TIMESTAMP
+            FROM kept k
+            WHERE t.TimelineId = k.TimelineId
+              AND (t.TimelineTitle, t.TimelineStartDate, t.TimelineEndDate, t.TimelineStartTime, t.TimelineEndTime)
+                  IS DISTINCT FROM
+                  (k.TimelineTitle, k.TimelineStartDate, k.TimelineEndDate, k.TimelineStartTime, k.TimelineEndTime)
+        ),
+        fresh AS (
+            SELECT i.Ord, nextval(pg_get_serial_sequence('Timeline', 'timelineid')) AS TimelineId
+            FROM input i
+            WHERE NOT EXISTS (SELECT 1 FROM kept k WHERE k.Ord = i.Ord)
+        ),
+        inserted AS (
+            INSERT INTO Timeline (TimelineId, TimelineTitle, TimelineStartDate, TimelineEndDate,
+                                  TimelineStartTime, TimelineEndTime, GoalId)
+            OVERRIDING SYSTEM VALUE
+            SELECT f.TimelineId, i.TimelineTitle, i.TimelineStartDate, i.TimelineEndDate,
+                   i.TimelineStartTime, i.TimelineEndTime, i.GoalId
+            FROM fresh f
+            JOIN input i ON i.Ord = f.Ord
+        )
+        SELECT 'saved', Ord, TimelineId FROM kept
+        UNION ALL SELECT 'saved', Ord, TimelineId FROM fresh
+        UNION ALL SELECT 'deleted', NULL, TimelineId FROM deleted
+        """,
+        rows,
+        template="(%s, %s::integer, %s, %s::date, %s::date, %s::time, %s::time, %s::integer)",
+        page_size=len(rows),
+        fetch=True
+    )
+
+    timeline_ids = [None] * len(rows)
+    deleted_ids = []
+    for kind, index, timeline_id in results:
+        if kind == 'saved':
+            timeline_ids[index] = timeline_id
+        else:
+            deleted_ids.append(timeline_id)
+    return timeline_ids, deleted_ids
 
 @app.route('/api/goals', methods=['POST'])
 def create_goal():
@@ -431,12 +1360,34 @@ def create_goal():
     
     if not timelines:
         return jsonify({'success': False, 'message': 'At least one timeline is required'}), 400
+
+    if data.get('checkConflicts'):
+        try:
+            goal_user_id = int(user_id)
+            candidates = [
+                (
+                    datetime.strptime(timeline.get('timelineStartDate'), '%Y-%m-%d').date(),
+                    datetime.strptime(timeline.get('timelineEndDate'), '%Y-%m-%d').date(),
+                    parse_time_from_hhmm(timeline.get('timelineStartTime')) if timeline.get('timelineStartTime') else None,
+                    parse_time_from_hhmm(timeline.get('timelineEndTime')) if timeline.get('timelineEndTime') else None
+                )
+                for timeline in timelines
+            ]
+        except (AttributeError, ValueError, TypeError):
+            return jsonify({'success': False, 'message': 'Conflict checks need a numeric user ID and valid timeline dates'}), 400
     
     conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor()
         
+        if data.get('checkConflicts'):
+            timeline_conflicts = [
+                _find_conflicts(cur, [goal_user_id], *candidate)[goal_user_id] for candidate in candidates
+            ]
+            if any(timeline_conflicts):
+                return jsonify({'success': False, 'message': 'Goal timelines conflict with existing items', 'conflicts': timeline_conflicts}), 409
+        
         cur.execute(
             """
             INSERT INTO Goal (GoalTitle, GoalDescription, GoalCategory, GoalProgress, UserId)
@@ -448,30 +1399,32 @@ def create_goal():
         
         goal_id = cur.fetchone()[0]
         
-        timeline_ids = []
-        for timeline in timelines:
-            start_time = parse_time_from_hhmm(timeline.get('timelineStartTime')) if timeline.get('timelineStartTime') else None
-            end_time = parse_time_from_hhmm(timeline.get('timelineEndTime')) if timeline.get('timelineEndTime') else None
-            
-            cur.execute(
-                """
-                INSERT INTO Timeline (TimelineTitle, TimelineStartDate, TimelineEndDate, 
-                                     TimelineStartTime, TimelineEndTime, GoalId)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                RETURNING TimelineId
-                """,
+        timeline_ids = execute_values(
+            cur,
+            """
+            INSERT INTO Timeline (TimelineTitle, TimelineStartDate, TimelineEndDate,
+                                 TimelineStartTime, TimelineEndTime, GoalId)
+            VALUES %s
+            RETURNING TimelineId
+            """,
+            [
                 (
                     timeline.get('timelineTitle'),
                     timeline.get('timelineStartDate'),
                     timeline.get('timelineEndDate'),
-                    start_time,
-                    end_time,
+                    parse_time_from_hhmm(timeline.get('timelineStartTime')) if timeline.get('timelineStartTime') else None,
+                    parse_time_from_hhmm(timeline.get('timelineEndTime')) if timeline.get('timelineEndTime') else None,
                     goal_id
                 )
-            )
-            timeline_ids.append(cur.fetchone()[0])
+                for timeline in timelines
+            ],
+            page_size=len(timelines),
+            fetch=True
+        )
+        timeline_ids = [row[0] for row in timeline_ids]
         
         conn.commit()
+        _invalidate_response_cache(f'user:{user_id}')
         
         return jsonify({
             'success': True,
@@ -485,12 +1438,64 @@ def create_goal():
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to create goal', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
+
+GOAL_ENCODER = RowEncoder([
+    ('goalid', None), ('goaltitle', None), ('goaldescription', None), ('goalcategory', None), ('goalprogress', None)
+])
+TIMELINE_ENCODER = RowEncoder([
+    ('timelineid', None), ('timelinetitle', None), ('timelinestartdate', None), ('timelineenddate', None),
+    ('timelinestarttime', hhmm), ('timelineendtime', hhmm)
+], offset=5)
+
+GOAL_DOCUMENTS_SQL = """
+    SELECT json_build_object(
+        'goalid', g.GoalId,
+        'goaltitle', g.GoalTitle,
+        'goaldescription', g.GoalDescription,
+        'goalcategory', g.GoalCategory,
+        'goalprogress', g.GoalProgress,
+        'timelines', COALESCE((
+            SELECT json_agg(json_build_object(
+                'timelineid', t.TimelineId,
+                'timelinetitle', t.TimelineTitle,
+                'timelinestartdate', t.TimelineStartDate,
+                'timelineenddate', t.TimelineEndDate,
+                'timelinestarttime', to_char(t.TimelineStartTime, 'HH24:MI'),
+                'timelineendtime', to_char(t.TimelineEndTime, 'HH24:MI')
+            ) ORDER BY t.TimelineStartDate)
+            FROM Timeline t
+            WHERE t.GoalId = g.GoalId
+        ), '[]'::json)
+    )::text
+    FROM Goal g
+    WHERE g.UserId = %s
+    ORDER BY g.GoalId
+"""
+
+def _iter_goal_rows(rows):
+    """
+    Group Goal LEFT JOIN Timeline rows into goal dicts with nested timelines, yielding each
+    goal once its rows are consumed. Rows must be ordered by GoalId and select the goal
+    columns followed by the timeline columns.
+    """
+    goal = None
+    for row in rows:
+        if goal is None or goal['goalid'] != row[0]:
+            if goal is not None:
+                yield goal
+            goal = GOAL_ENCODER(row)
+            goal['timelines'] = []
+        if row[5]:
+            goal['timelines'].append(TIMELINE_ENCODER(row))
+    if goal is not None:
+        yield goal
+
+def _group_goal_rows(rows):
+    return list(_iter_goal_rows(rows))
 
 @app.route('/api/goals', methods=['GET'])
+@conditional_get
+@cached_response
 def get_goals():
     user_id_param = request.args.get('userId')
     if not user_id_param:
@@ -504,9 +1509,12 @@ def get_goals():
         internal_user_id = _get_internal_user_id(cur, user_id_param)
         if internal_user_id is None:
             return jsonify({'success': False, 'message': 'User not found'}), 404
+        _tag_response(f'user:{internal_user_id}')
 
-        cur.execute(
-            """
+        if DB_JSON_DOCUMENTS:
+            return _stream_json_documents(GOAL_DOCUMENTS_SQL, (internal_user_id,), '{"success": true, "goals": [', ']}')
+
+        query = """
             SELECT g.GoalId, g.GoalTitle, g.GoalDescription, g.GoalCategory, g.GoalProgress,
                    t.TimelineId, t.TimelineTitle, t.TimelineStartDate, t.TimelineEndDate,
                    t.TimelineStartTime, t.TimelineEndTime
@@ -514,41 +1522,18 @@ def get_goals():
             LEFT JOIN Timeline t ON g.GoalId = t.GoalId
             WHERE g.UserId = %s
             ORDER BY g.GoalId, t.TimelineStartDate
-            """,
-            (internal_user_id,)
-        )
-        
-        goals_dict = {}
-        for row in cur.fetchall():
-            goal_id = row[0]
-            if goal_id not in goals_dict:
-                goals_dict[goal_id] = {
-                    'goalid': row[0],
-                    'goaltitle': row[1],
-                    'goaldescription': row[2],
-                    'goalcategory': row[3],
-                    'goalprogress': row[4],
-                    'timelines': []
-                }
-            
-            if row[5]:
-                goals_dict[goal_id]['timelines'].append({
-                    'timelineid': row[5],
-                    'timelinetitle': row[6],
-                    'timelinestartdate': row[7].isoformat() if row[7] else None,
-                    'timelineenddate': row[8].isoformat() if row[8] else None,
-                    'timelinestarttime': format_time_to_hhmm(row[9]),
-                    'timelineendtime': format_time_to_hhmm(row[10])
-                })
+        """
+        if STREAM_RESPONSES:
+            rows = _iter_query(query, (internal_user_id,))
+            return _stream_response(stream_json_object({'success': True}, 'goals', _iter_goal_rows(rows)))
+
+        cur.execute(query, (internal_user_id,))
         
-        return jsonify({'success': True, 'goals': list(goals_dict.values())}), 200
+        return json_response({'success': True, 'goals': _group_goal_rows(cur.fetchall())})
         
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to fetch goals', 'error': str(e)}), 500
-    
-    finally:
-        if conn: conn.close()
 
 @app.route('/api/goals/<int:goal_id>', methods=['PUT'])
 def update_goal(goal_id):
@@ -567,6 +1552,16 @@ def update_goal(goal_id):
     if not timelines:
         return jsonify({'success': False, 'message': 'At least one timeline is required'}), 400
     
+    # Existing timelines are matched by ID, new ones have none
+    try:
+        for timeline in timelines:
+            timeline_id = timeline.get('timelineId')
+            if isinstance(timeline_id, bool) or (timeline_id is not None and not str(timeline_id).isdigit()):
+                raise ValueError(timeline_id)
+            timeline['timelineId'] = int(timeline_id) if timeline_id is not None else None
+    except (AttributeError, ValueError):
+        return jsonify({'success': False, 'message': 'Timeline IDs must be integers'}), 400
+    
     conn = None
     try:
         conn = get_db_connection()
@@ -575,41 +1570,23 @@ def update_goal(goal_id):
         cur.execute(
             """
             UPDATE Goal 
-            SET GoalTitle = %s, GoalDescription = %s, GoalCategory = %s, GoalProgress = %s
+            SET GoalTitle = %s, GoalDescription = %s, GoalCategory = %s, GoalProgress = %s,
+                UpdatedAt = CURRENT_TIMESTAMP
             WHERE GoalId = %s
+            RETURNING UserId
             """,
             (title, description, category, progress, goal_id)
         )
+        goal_owner = cur.fetchone()
         
-        if cur.rowcount == 0:
+        if not goal_owner:
             return jsonify({'success': False, 'message': 'Goal not found'}), 404
         
-        cur.execute("DELETE FROM Timeline WHERE GoalId = %s", (goal_id,))
-        
-        timeline_ids = []
-        for timeline in timelines:
-            start_time = parse_time_from_hhmm(timeline.get('timelineStartTime')) if timeline.get('timelineStartTime') else None
-            end_time = parse_time_from_hhmm(timeline.get('timelineEndTime')) if timeline.get('timelineEndTime') else None
-            
-            cur.execute(
-                """
-                INSERT INTO Timeline (TimelineTitle, TimelineStartDate, TimelineEndDate, 
-                                     TimelineStartTime, TimelineEndTime, GoalId)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                RETURNING TimelineId
-                """,
-                (
-                    timeline.get('timelineTitle'),
-                    timeline.get('timelineStartDate'),
-                    timeline.get('timelineEndDate'),
-                    start_time,
-                    end_time,
-                    goal_id
-                )
-            )
-            timeline_ids.append(cur.fetchone()[0])
+        timeline_ids, deleted_ids = _save_timelines(cur, goal_id, timelines)
+        _record_deletions(cur, 'timeline', [(goal_owner[0], timeline_id) for timeline_id in deleted_ids])
         
         conn.commit()
+        _invalidate_response_cache(f'user:{goal_owner[0]}')
         
         return jsonify({
             'success': True,
@@ -622,10 +1599,6 @@ def update_goal(goal_id):
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to update goal', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/goals/<int:goal_id>', methods=['DELETE'])
 def delete_goal(goal_id):
@@ -637,12 +1610,16 @@ def delete_goal(goal_id):
         
         cur.execute("DELETE FROM Timeline WHERE GoalId = %s", (goal_id,))
         
-        cur.execute("DELETE FROM Goal WHERE GoalId = %s", (goal_id,))
+        cur.execute("DELETE FROM Goal WHERE GoalId = %s RETURNING UserId", (goal_id,))
+        deleted = cur.fetchone()
         
-        if cur.rowcount == 0:
+        if not deleted:
             return jsonify({'success': False, 'message': 'Goal not found'}), 404
         
+        _record_deletions(cur, 'goal', [(deleted[0], goal_id)])
+        
         conn.commit()
+        _invalidate_response_cache(f'user:{deleted[0]}')
         
         return jsonify({
             'success': True,
@@ -654,10 +1631,6 @@ def delete_goal(goal_id):
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to delete goal', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/timelines/<int:timeline_id>', methods=['DELETE'])
 def delete_timeline(timeline_id):
@@ -681,12 +1654,24 @@ def delete_timeline(timeline_id):
         if result and result[1] <= 1:
             return jsonify({'success': False, 'message': 'Cannot delete the last timeline. A goal must have at least one timeline.'}), 400
         
-        cur.execute("DELETE FROM Timeline WHERE TimelineId = %s", (timeline_id,))
+        cur.execute(
+            """
+            DELETE FROM Timeline t
+            USING Goal g
+            WHERE t.TimelineId = %s AND g.GoalId = t.GoalId
+            RETURNING g.UserId
+            """,
+            (timeline_id,)
+        )
+        deleted = cur.fetchone()
         
-        if cur.rowcount == 0:
+        if not deleted:
             return jsonify({'success': False, 'message': 'Timeline not found'}), 404
         
+        _record_deletions(cur, 'timeline', [(deleted[0], timeline_id)])
+        
         conn.commit()
+        _invalidate_response_cache(f'user:{deleted[0]}')
         
         return jsonify({
             'success': True,
@@ -698,10 +1683,6 @@ def delete_timeline(timeline_id):
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to delete timeline', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/teams', methods=['POST'])
 def create_team():
@@ -749,6 +1730,11 @@ def create_team():
             (team_id, created_by_user_id)
         )
         
+        user_ids_by_email = _resolve_user_ids_by_email(
+            cur, [email.strip() for meeting in meetings for email in meeting.get('invitedEmails', [])]
+        )
+        _add_team_members(cur, team_id, list(user_ids_by_email.values()))
+        
         meeting_ids = []
         for meeting in meetings:
             meeting_start_time = parse_time_from_hhmm(meeting.get('meetingStartTime')) if meeting.get('meetingStartTime') else None
@@ -775,59 +1761,29 @@ def create_team():
             meeting_id = cur.fetchone()[0]
             meeting_ids.append(meeting_id)
             
-            invited_emails = meeting.get('invitedEmails', [])
-            for email in invited_emails:
-                if email.strip():
-                    cur.execute("SELECT UserId FROM Users WHERE UserEmail = %s", (email.strip(),))
-                    user_result = cur.fetchone()
-                    
-                    if user_result:
-                        user_id = user_result[0]
-                        cur.execute(
-                            """
-                            INSERT INTO TeamMembers (TeamId, UserId)
-                            SELECT %s, %s
-                            WHERE NOT EXISTS (
-                                SELECT 1 FROM TeamMembers WHERE TeamId = %s AND UserId = %s
-                            )
-                            """,
-                            (team_id, user_id, team_id, user_id)
-                        )
-                        
-                        cur.execute(
-                            """
-                            INSERT INTO MeetingInvitations (MeetingId, UserId, InvitationType, Status)
-                            VALUES (%s, %s, %s, %s)
-                            """,
-                            (meeting_id, user_id, invitation_type, 'accepted' if invitation_type == 'mandatory' else 'pending')
-                        )
-                        
-                        if invitation_type == 'request':
-                            meeting_time_info = ""
-                            if meeting.get('meetingStartTime') and meeting.get('meetingEndTime'):
-                                meeting_time_info = f" on {meeting.get('meetingDate')} from {meeting.get('meetingStartTime')} to {meeting.get('meetingEndTime')}"
-                            elif meeting.get('meetingDate'):
-                                meeting_time_info = f" on {meeting.get('meetingDate')}"
-                            
-                            notification_message = f'You have been invited to join the meeting "{meeting.get("meetingTitle")}"{meeting_time_info} in team "{team_name}"'
-                            if meeting.get('meetingDescription'):
-                                notification_message += f'. Description: {meeting.get("meetingDescription")}'
-                            
-                            cur.execute(
-                                """
-                                INSERT INTO Notifications (UserId, Type, Title, Message, RelatedId)
-                                VALUES (%s, %s, %s, %s, %s)
-                                """,
-                                (
-                                    user_id,
-                                    'meeting_invitation',
-                                    f'Meeting Invitation: {meeting.get("meetingTitle")}',
-                                    notification_message,
-                                    meeting_id
-                                )
-                            )
+            invited_user_ids = [
+                user_ids_by_email[email.strip()] for email in meeting.get('invitedEmails', [])
+                if email.strip() in user_ids_by_email
+            ]
+            _add_meeting_invitations(cur, meeting_id, invited_user_ids, invitation_type)
+            
+            if invitation_type == 'request' and invited_user_ids:
+                enqueue_event(cur, 'meeting_invitation', {
+                    'userIds': list(dict.fromkeys(invited_user_ids)),
+                    'meetingId': meeting_id,
+                    'meetingTitle': meeting.get('meetingTitle'),
+                    'meetingDescription': meeting.get('meetingDescription'),
+                    'meetingDate': meeting.get('meetingDate'),
+                    'meetingStartTime': meeting.get('meetingStartTime'),
+                    'meetingEndTime': meeting.get('meetingEndTime'),
+                    'teamName': team_name
+                }, idempotency_key=f'meeting_invitation:{meeting_id}')
         
         conn.commit()
+        _invalidate_response_cache(
+            f'team:{team_id}', f'user:{created_by_user_id}',
+            *(f'user:{user_id}' for user_id in user_ids_by_email.values())
+        )
         
         return jsonify({
             'success': True,
@@ -841,12 +1797,77 @@ def create_team():
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to create team', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
+
+TEAM_ENCODER = RowEncoder([
+    ('teamid', None), ('teamname', None), ('teamdescription', None),
+    ('teamstartworkinghour', hhmm), ('teamendworkinghour', hhmm), ('createdbyuserid', None)
+])
+MEETING_FIELDS = [
+    ('teammeetingid', None), ('meetingtitle', None), ('meetingdescription', None), ('meetingdate', None),
+    ('meetingstarttime', hhmm), ('meetingendtime', hhmm), ('invitationtype', None),
+    ('meetingrecurrence', None), ('meetingexceptiondates', None)
+]
+MEETING_ENCODER = RowEncoder(MEETING_FIELDS)
+# Meeting rows selected alongside their TeamId, which is either skipped or kept
+TEAM_MEETING_ENCODER = RowEncoder(MEETING_FIELDS, offset=1)
+SYNC_MEETING_ENCODER = RowEncoder([('teamid', None)] + MEETING_FIELDS)
+
+# Team document built by Postgres; {meeting_filter} narrows the meetings of team t aliased tm
+TEAM_DOCUMENT_SQL = """
+    json_build_object(
+        'teamid', t.TeamId,
+        'teamname', t.TeamName,
+        'teamdescription', t.TeamDescription,
+        'teamstartworkinghour', to_char(t.TeamStartWorkingHour, 'HH24:MI'),
+        'teamendworkinghour', to_char(t.TeamEndWorkingHour, 'HH24:MI'),
+        'createdbyuserid', t.CreatedByUserId,
+        'meetings', COALESCE((
+            SELECT json_agg(json_build_object(
+                'teammeetingid', tm.TeamMeetingId,
+                'meetingtitle', tm.MeetingTitle,
+                'meetingdescription', tm.MeetingDescription,
+                'meetingdate', tm.MeetingDate,
+                'meetingstarttime', to_char(tm.MeetingStartTime, 'HH24:MI'),
+                'meetingendtime', to_char(tm.MeetingEndTime, 'HH24:MI'),
+                'invitationtype', tm.InvitationType,
+                'meetingrecurrence', tm.RecurrenceRule,
+                'meetingexceptiondates', tm.RecurrenceExceptions,
+                'members', COALESCE((
+                    SELECT json_agg(json_build_object(
+                        'userid', u.UserId,
+                        'username', u.UserName,
+                        'useremail', u.UserEmail,
+                        'userprofilepicture', u.UserProfilePicture,
+                        'status', mi.Status,
+                        'invitationtype', mi.InvitationType
+                    ) ORDER BY u.UserName NULLS FIRST)
+                    FROM MeetingInvitations mi
+                    JOIN Users u ON u.UserId = mi.UserId
+                    WHERE mi.MeetingId = tm.TeamMeetingId
+                ), '[]'::json)
+            ) ORDER BY tm.MeetingDate, tm.MeetingStartTime)
+            FROM TeamMeeting tm
+            WHERE tm.TeamId = t.TeamId {meeting_filter}
+        ), '[]'::json)
+    )::text,
+    t.TeamId,
+    ARRAY(SELECT tm.TeamMeetingId FROM TeamMeeting tm WHERE tm.TeamId = t.TeamId),
+    ARRAY(
+        SELECT DISTINCT mi.UserId
+        FROM TeamMeeting tm
+        JOIN MeetingInvitations mi ON mi.MeetingId = tm.TeamMeetingId
+        WHERE tm.TeamId = t.TeamId
+    )
+"""
+
+def _tag_team_document(row):
+    """Tag a TEAM_DOCUMENT_SQL row with its team, meetings and invited users' profiles"""
+    _tag_response(f'team:{row[1]}', *(f'meeting:{meeting_id}' for meeting_id in row[2]),
+                  *(f'profile:{user_id}' for user_id in row[3]))
 
 @app.route('/api/teams', methods=['GET'])
+@conditional_get
+@cached_response
 def get_teams():
     user_id_param = request.args.get('userId')
     if not user_id_param:
@@ -860,6 +1881,24 @@ def get_teams():
         internal_user_id = _get_internal_user_id(cur, user_id_param)
         if internal_user_id is None:
             return jsonify({'success': False, 'message': 'User not found'}), 404
+        _tag_response(f'user:{internal_user_id}')
+
+        if DB_JSON_DOCUMENTS:
+            meeting_filter = """AND (t.CreatedByUserId = %s OR EXISTS (
+                SELECT 1 FROM MeetingInvitations x
+                WHERE x.MeetingId = tm.TeamMeetingId AND x.UserId = %s AND x.Status = 'accepted'
+            ))"""
+            return _stream_json_documents(
+                f"""
+                SELECT {TEAM_DOCUMENT_SQL.format(meeting_filter=meeting_filter)}
+                FROM Team t
+                INNER JOIN TeamMembers tmem ON t.TeamId = tmem.TeamId
+                WHERE tmem.UserId = %s
+                """,
+                (internal_user_id, internal_user_id, internal_user_id),
+                '{"success": true, "teams": [', ']}',
+                on_row=_tag_team_document
+            )
 
         cur.execute(
             """
@@ -873,97 +1912,92 @@ def get_teams():
         )
         teams_dict = {}
         for row in cur.fetchall():
-            team_id = row[0]
-            teams_dict[team_id] = {
-                'teamid': row[0],
-                'teamname': row[1],
-                'teamdescription': row[2],
-                'teamstartworkinghour': format_time_to_hhmm(row[3]),
-                'teamendworkinghour': format_time_to_hhmm(row[4]),
-                'createdbyuserid': row[5],
-                'meetings': []
-            }
+            team = teams_dict[row[0]] = TEAM_ENCODER(row)
+            team['meetings'] = []
 
-        for team_id, team_data in teams_dict.items():
-            if team_data['createdbyuserid'] == internal_user_id:
-                cur.execute(
-                    """
-                    SELECT tm.MeetingTitle, tm.MeetingDescription, tm.MeetingDate,
-                           tm.MeetingStartTime, tm.MeetingEndTime, tm.TeamMeetingId, tm.InvitationType
-                    FROM TeamMeeting tm
-                    WHERE tm.TeamId = %s
-                    ORDER BY tm.MeetingDate, tm.MeetingStartTime
-                    """,
-                    (team_id,)
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT tm.MeetingTitle, tm.MeetingDescription, tm.MeetingDate,
-                           tm.MeetingStartTime, tm.MeetingEndTime, tm.TeamMeetingId, tm.InvitationType
-                    FROM TeamMeeting tm
-                    INNER JOIN MeetingInvitations mi ON tm.TeamMeetingId = mi.MeetingId
-                    WHERE tm.TeamId = %s AND mi.UserId = %s AND mi.Status = 'accepted'
-                    ORDER BY tm.MeetingDate, tm.MeetingStartTime
-                    """,
-                    (team_id, internal_user_id)
-                )
+        _tag_response(*(f'team:{team_id}' for team_id in teams_dict))
+        meetings_by_id = {}
+        if teams_dict:
+            cur.execute(
+                """
+                SELECT tm.TeamId, tm.TeamMeetingId, tm.MeetingTitle, tm.MeetingDescription,
+                       tm.MeetingDate, tm.MeetingStartTime, tm.MeetingEndTime, tm.InvitationType,
+                       tm.RecurrenceRule, tm.RecurrenceExceptions
+                FROM TeamMeeting tm
+                JOIN Team t ON tm.TeamId = t.TeamId
+                WHERE tm.TeamId = ANY(%s)
+                  AND (t.CreatedByUserId = %s OR EXISTS (
+                      SELECT 1 FROM MeetingInvitations mi
+                      WHERE mi.MeetingId = tm.TeamMeetingId AND mi.UserId = %s AND mi.Status = 'accepted'
+                  ))
+                ORDER BY tm.MeetingDate, tm.MeetingStartTime
+                """,
+                (list(teams_dict.keys()), internal_user_id, internal_user_id)
+            )
 
             for meeting_row in cur.fetchall():
-                meeting_id = meeting_row[5]
-                meeting_data = {
-                    'teammeetingid': meeting_id,
-                    'meetingtitle': meeting_row[0],
-                    'meetingdescription': meeting_row[1],
-                    'meetingdate': meeting_row[2].isoformat() if meeting_row[2] else None,
-                    'meetingstarttime': format_time_to_hhmm(meeting_row[3]),
-                    'meetingendtime': format_time_to_hhmm(meeting_row[4]),
-                    'invitationtype': meeting_row[6],
-                    'members': []
-                }
-                
-                cur.execute(
-                    """
-                    SELECT u.UserId, u.UserName, u.UserEmail, 
-                           u.UserProfilePicture,
-                           mi.Status, mi.InvitationType
-                    FROM MeetingInvitations mi
-                    JOIN Users u ON mi.UserId = u.UserId
-                    WHERE mi.MeetingId = %s
-                    ORDER BY u.UserName
-                    """,
-                    (meeting_id,)
-                )
+                meeting_data = TEAM_MEETING_ENCODER(meeting_row)
+                meeting_data['members'] = []
+                meetings_by_id[meeting_row[1]] = meeting_data
+                teams_dict[meeting_row[0]]['meetings'].append(meeting_data)
 
-                for member_row in cur.fetchall():
-                    meeting_data['members'].append({
-                        'userid': member_row[0],
-                        'username': member_row[1],
-                        'useremail': member_row[2],
-                        'userprofilepicture': member_row[3],
-                        'status': member_row[4],
-                        'invitationtype': member_row[5]
-                    })
-                
-                team_data['meetings'].append(meeting_data)
+        for meeting_id, members in _get_meeting_members(cur, list(meetings_by_id.keys())).items():
+            meetings_by_id[meeting_id]['members'] = members
 
-        return jsonify({'success': True, 'teams': list(teams_dict.values())}), 200
+        return json_response({'success': True, 'teams': list(teams_dict.values())})
 
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to fetch teams', 'error': str(e)}), 500
-    finally:
-        if conn: conn.close()
 
 @app.route('/api/teams/<int:team_id>', methods=['GET'])
+@cached_response
 def get_team_details(team_id):
     """Get detailed team information including meetings and members, filtered for the requesting user."""
     user_id = request.args.get('userId')
+    meetings_from = request.args.get('meetingsFrom')
+    meetings_to = request.args.get('meetingsTo')
+
+    try:
+        parsed_meetings_from = datetime.strptime(meetings_from, '%Y-%m-%d').date() if meetings_from else None
+        parsed_meetings_to = datetime.strptime(meetings_to, '%Y-%m-%d').date() if meetings_to else None
+    except ValueError:
+        return jsonify({'success': False, 'message': 'meetingsFrom and meetingsTo must use YYYY-MM-DD format'}), 400
+
+    # A recurring meeting is listed once, as its series, if any occurrence can fall in the window
+    window_sql = ""
+    window_params = ()
+    if parsed_meetings_from:
+        window_sql += " AND (tm.MeetingDate >= %s OR tm.RecurrenceRule IS NOT NULL AND (tm.RecurrenceEnd IS NULL OR tm.RecurrenceEnd >= %s))"
+        window_params += (parsed_meetings_from, parsed_meetings_from)
+    if parsed_meetings_to:
+        window_sql += " AND tm.MeetingDate <= %s"
+        window_params += (parsed_meetings_to,)
+
     conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor()
 
+        if DB_JSON_DOCUMENTS:
+            meeting_filter = window_sql
+            params = window_params
+            if user_id:
+                # Non-creators only see meetings they are invited to
+                meeting_filter += """ AND (t.CreatedByUserId = %s OR EXISTS (
+                    SELECT 1 FROM MeetingInvitations x WHERE x.MeetingId = tm.TeamMeetingId AND x.UserId = %s
+                ))"""
+                params += (int(user_id), int(user_id))
+            cur.execute(
+                f"SELECT {TEAM_DOCUMENT_SQL.format(meeting_filter=meeting_filter)} FROM Team t WHERE t.TeamId = %s",
+                params + (team_id,)
+            )
+            row = cur.fetchone()
+            if not row:
+                return jsonify({'success': False, 'message': 'Team not found'}), 404
+            _tag_team_document(row)
+            return Response('{"success": true, "team": ' + row[0] + '}', mimetype='application/json')
+
         cur.execute(
             """
             SELECT TeamId, TeamName, TeamDescription, TeamStartWorkingHour,
@@ -976,104 +2010,54 @@ def get_team_details(team_id):
         team_row = cur.fetchone()
         if not team_row:
             return jsonify({'success': False, 'message': 'Team not found'}), 404
+        _tag_response(f'team:{team_id}')
 
-        team_data = {
-            'teamid': team_row[0],
-            'teamname': team_row[1],
-            'teamdescription': team_row[2],
-            'teamstartworkinghour': format_time_to_hhmm(team_row[3]),
-            'teamendworkinghour': format_time_to_hhmm(team_row[4]),
-            'createdbyuserid': team_row[5]
-        }
+        team_data = TEAM_ENCODER(team_row)
 
         is_creator = team_data['createdbyuserid'] == int(user_id) if user_id else False
 
-        if is_creator:
+        if is_creator or not user_id:
             cur.execute(
-                """
-                SELECT TeamMeetingId, MeetingTitle, MeetingDescription, MeetingDate,
-                       MeetingStartTime, MeetingEndTime, InvitationType
-                FROM TeamMeeting
-                WHERE TeamId = %s
-                ORDER BY MeetingDate, MeetingStartTime
+                f"""
+                SELECT tm.TeamMeetingId, tm.MeetingTitle, tm.MeetingDescription, tm.MeetingDate,
+                       tm.MeetingStartTime, tm.MeetingEndTime, tm.InvitationType,
+                       tm.RecurrenceRule, tm.RecurrenceExceptions
+                FROM TeamMeeting tm
+                WHERE tm.TeamId = %s{window_sql}
+                ORDER BY tm.MeetingDate, tm.MeetingStartTime
                 """,
-                (team_id,)
+                (team_id,) + window_params
             )
-        elif user_id:
+        else:
             cur.execute(
-                """
+                f"""
                 SELECT DISTINCT tm.TeamMeetingId, tm.MeetingTitle, tm.MeetingDescription, tm.MeetingDate,
-                                tm.MeetingStartTime, tm.MeetingEndTime, tm.InvitationType
+                                tm.MeetingStartTime, tm.MeetingEndTime, tm.InvitationType,
+                                tm.RecurrenceRule, tm.RecurrenceExceptions
                 FROM TeamMeeting tm
                 JOIN MeetingInvitations mi ON tm.TeamMeetingId = mi.MeetingId
-                WHERE tm.TeamId = %s AND mi.UserId = %s
+                WHERE tm.TeamId = %s AND mi.UserId = %s{window_sql}
                 ORDER BY tm.MeetingDate, tm.MeetingStartTime
                 """,
-                (team_id, user_id)
-            )
-        else:
-            cur.execute(
-                """
-                SELECT TeamMeetingId, MeetingTitle, MeetingDescription, MeetingDate,
-                       MeetingStartTime, MeetingEndTime, InvitationType
-                FROM TeamMeeting
-                WHERE TeamId = %s
-                ORDER BY MeetingDate, MeetingStartTime
-                """,
-                (team_id,)
-            )
-
-        meetings = []
-        for meeting_row in cur.fetchall():
-            meeting_data = {
-                'teammeetingid': meeting_row[0],
-                'meetingtitle': meeting_row[1],
-                'meetingdescription': meeting_row[2],
-                'meetingdate': meeting_row[3].isoformat() if meeting_row[3] else None,
-                'meetingstarttime': format_time_to_hhmm(meeting_row[4]),
-                'meetingendtime': format_time_to_hhmm(meeting_row[5]),
-                'invitationtype': meeting_row[6],
-                'members': []
-            }
-
-            cur.execute(
-                """
-                SELECT u.UserId, u.UserName, u.UserEmail, u.UserProfilePicture,
-                       mi.Status, mi.InvitationType
-                FROM MeetingInvitations mi
-                JOIN Users u ON mi.UserId = u.UserId
-                WHERE mi.MeetingId = %s
-                ORDER BY u.UserName
-                """,
-                (meeting_row[0],)
+                (team_id, user_id) + window_params
             )
 
-            for member_row in cur.fetchall():
-                meeting_data['members'].append({
-                    'userid': member_row[0],
-                    'username': member_row[1],
-                    'useremail': member_row[2],
-                    'userprofilepicture': member_row[3],
-                    'status': member_row[4],
-                    'invitationtype': member_row[5]
-                })
-
-            meetings.append(meeting_data)
+        meetings = MEETING_ENCODER.many(cur.fetchall())
+        members_by_meeting = _get_meeting_members(cur, [meeting['teammeetingid'] for meeting in meetings])
+        for meeting in meetings:
+            meeting['members'] = members_by_meeting[meeting['teammeetingid']]
 
         team_data['meetings'] = meetings
 
-        return jsonify({
+        return json_response({
             'success': True,
             'team': team_data
-        }), 200
+        })
 
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to fetch team details', 'error': str(e)}), 500
 
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/teams/<int:team_id>', methods=['PUT'])
 def update_team(team_id):
@@ -1109,6 +2093,7 @@ def update_team(team_id):
             return jsonify({'success': False, 'message': 'Team not found'}), 404
         
         conn.commit()
+        _invalidate_response_cache(f'team:{team_id}')
         
         return jsonify({
             'success': True,
@@ -1120,10 +2105,176 @@ def update_team(team_id):
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to update team', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
+
+@app.route('/api/teams/<int:team_id>/availability', methods=['POST'])
+def get_team_availability(team_id):
+    """Compute merged busy intervals and ranked free meeting slots for team members"""
+    data = request.get_json()
+
+    member_ids = data.get('memberIds', [])
+    member_emails = [email.strip() for email in data.get('memberEmails', []) if email and email.strip()]
+    start_date = data.get('startDate')
+    end_date = data.get('endDate')
+    duration_minutes = data.get('durationMinutes', 60)
+    step_minutes = data.get('slotStepMinutes', 30)
+    limit = data.get('limit', 10)
+
+    if not start_date or not end_date:
+        return jsonify({'success': False, 'message': 'Start date and end date are required'}), 400
+
+    try:
+        parsed_start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+        parsed_end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+        member_ids = [int(member_id) for member_id in member_ids]
+        duration = timedelta(minutes=int(duration_minutes))
+        step = timedelta(minutes=int(step_minutes))
+        limit = int(limit)
+    except (ValueError, TypeError):
+        return jsonify({'success': False, 'message': 'Invalid date, member ID or duration'}), 400
+
+    if parsed_start_date > parsed_end_date:
+        return jsonify({'success': False, 'message': 'End date must be after start date'}), 400
+    if (parsed_end_date - parsed_start_date).days >= AVAILABILITY_MAX_DAYS:
+        return jsonify({'success': False, 'message': f'The range must cover at most {AVAILABILITY_MAX_DAYS} days'}), 400
+    if duration <= timedelta(0) or step <= timedelta(0):
+        return jsonify({'success': False, 'message': 'Duration and slot step must be positive'}), 400
+    if limit < 1:
+        return jsonify({'success': False, 'message': 'Limit must be at least 1'}), 400
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        cur.execute("SELECT TeamStartWorkingHour, TeamEndWorkingHour FROM Team WHERE TeamId = %s", (team_id,))
+        team_result = cur.fetchone()
+        if not team_result:
+            return jsonify({'success': False, 'message': 'Team not found'}), 404
+
+        work_start = parse_time_from_hhmm(data.get('workingStart')) or team_result[0] or parse_time_from_hhmm('09:00')
+        work_end = parse_time_from_hhmm(data.get('workingEnd')) or team_result[1] or parse_time_from_hhmm('17:00')
+
+        missing_emails = []
+        if member_ids or member_emails:
+            profiles, found, missing = _resolve_users(cur, member_ids, member_emails)
+            missing_emails = missing['emails']
+            members = [
+                {'userid': user_id, 'username': profiles[user_id]['username'], 'useremail': profiles[user_id]['useremail']}
+                for user_id in dict.fromkeys([*found['userIds'].values(), *found['emails'].values()])
+            ]
+        else:
+            cur.execute(
+                """
+                SELECT u.UserId, u.UserName, u.UserEmail
+                FROM TeamMembers tm
+                JOIN Users u ON tm.UserId = u.UserId
+                WHERE tm.TeamId = %s
+                """,
+                (team_id,)
+            )
+            members = [{'userid': row[0], 'username': row[1], 'useremail': row[2]} for row in cur.fetchall()]
+        user_ids = [member['userid'] for member in members]
+
+        intervals_by_user = {user_id: [] for user_id in user_ids}
+
+        window = {'user_ids': user_ids, 'start_date': parsed_start_date, 'end_date': parsed_end_date}
+        cur.execute(
+            """
+            SELECT UserId, ActivityDate, ActivityStartTime, ActivityEndTime,
+                   RecurrenceRule, RecurrenceExceptions, RecurrenceEnd
+            FROM Activity
+            WHERE UserId = ANY(%(user_ids)s)
+              AND (ActivityDate BETWEEN %(start_date)s AND %(end_date)s
+                   OR RecurrenceRule IS NOT NULL AND ActivityDate <= %(end_date)s
+                      AND (RecurrenceEnd IS NULL OR RecurrenceEnd >= %(start_date)s))
+              AND ActivityStartTime IS NOT NULL AND ActivityEndTime IS NOT NULL
+            """,
+            window
+        )
+        for user_id, day, start, end, *_ in expand_rows(cur.fetchall(), (1,), 4, parsed_start_date, parsed_end_date):
+            intervals_by_user[user_id].append((datetime.combine(day, start), datetime.combine(day, end)))
+
+        cur.execute(
+            """
+            SELECT g.UserId, t.TimelineStartDate, t.TimelineEndDate, t.TimelineStartTime, t.TimelineEndTime
+            FROM Timeline t
+            JOIN Goal g ON t.GoalId = g.GoalId
+            WHERE g.UserId = ANY(%s) AND t.TimelineStartDate <= %s AND t.TimelineEndDate >= %s
+            """,
+            (user_ids, parsed_end_date, parsed_start_date)
+        )
+        for user_id, timeline_start, timeline_end, start, end in cur.fetchall():
+            day = max(timeline_start, parsed_start_date)
+            last_day = min(timeline_end, parsed_end_date)
+            while day <= last_day:
+                if start and end:
+                    intervals_by_user[user_id].append((datetime.combine(day, start), datetime.combine(day, end)))
+                else:
+                    day_start = datetime.combine(day, datetime.min.time())
+                    intervals_by_user[user_id].append((day_start, day_start + timedelta(days=1)))
+                day += timedelta(days=1)
+
+        cur.execute(
+            """
+            SELECT mi.UserId, tm.MeetingDate, tm.MeetingStartTime, tm.MeetingEndTime,
+                   tm.RecurrenceRule, tm.RecurrenceExceptions, tm.RecurrenceEnd
+            FROM MeetingInvitations mi
+            JOIN TeamMeeting tm ON mi.MeetingId = tm.TeamMeetingId
+            WHERE mi.UserId = ANY(%(user_ids)s) AND mi.Status = 'accepted'
+              AND (tm.MeetingDate BETWEEN %(start_date)s AND %(end_date)s
+                   OR tm.RecurrenceRule IS NOT NULL AND tm.MeetingDate <= %(end_date)s
+                      AND (tm.RecurrenceEnd IS NULL OR tm.RecurrenceEnd >= %(start_date)s))
+              AND tm.MeetingStartTime IS NOT NULL AND tm.MeetingEndTime IS NOT NULL
+            UNION
+            SELECT t.CreatedByUserId, tm.MeetingDate, tm.MeetingStartTime, tm.MeetingEndTime,
+                   tm.RecurrenceRule, tm.RecurrenceExceptions, tm.RecurrenceEnd
+            FROM TeamMeeting tm
+            JOIN Team t ON tm.TeamId = t.TeamId
+            WHERE t.CreatedByUserId = ANY(%(user_ids)s)
+              AND (tm.MeetingDate BETWEEN %(start_date)s AND %(end_date)s
+                   OR tm.RecurrenceRule IS NOT NULL AND tm.MeetingDate <= %(end_date)s
+                      AND (tm.RecurrenceEnd IS NULL OR tm.RecurrenceEnd >= %(start_date)s))
+              AND tm.MeetingStartTime IS NOT NULL AND tm.MeetingEndTime IS NOT NULL
+            """,
+            window
+        )
+        for user_id, day, start, end, *_ in expand_rows(cur.fetchall(), (1,), 4, parsed_start_date, parsed_end_date):
+            intervals_by_user[user_id].append((datetime.combine(day, start), datetime.combine(day, end)))
+
+        member_busy = {user_id: merge_intervals(intervals) for user_id, intervals in intervals_by_user.items()}
+        all_busy = merge_intervals(interval for merged in member_busy.values() for interval in merged)
+        windows = list(working_windows(parsed_start_date, parsed_end_date, work_start, work_end))
+
+        def format_interval(start, end):
+            return {'start': start.isoformat(timespec='minutes'), 'end': end.isoformat(timespec='minutes')}
+
+        suggested_slots = []
+        for unavailable_count, slot_start, slot_end, unavailable in rank_slots(member_busy, windows, duration, step, limit):
+            suggested_slots.append({
+                'date': slot_start.date().isoformat(),
+                'startTime': format_time_to_hhmm(slot_start.time()),
+                'endTime': format_time_to_hhmm(slot_end.time()),
+                'availableCount': len(user_ids) - unavailable_count,
+                'unavailableUserIds': unavailable
+            })
+
+        return jsonify({
+            'success': True,
+            'workingHours': {'start': format_time_to_hhmm(work_start), 'end': format_time_to_hhmm(work_end)},
+            'members': members,
+            'missingEmails': missing_emails,
+            'busy': [format_interval(start, end) for start, end in all_busy],
+            'memberBusy': {
+                str(user_id): [format_interval(start, end) for start, end in merged]
+                for user_id, merged in member_busy.items()
+            },
+            'freeIntervals': [format_interval(start, end) for start, end in free_intervals(all_busy, windows)],
+            'suggestedSlots': suggested_slots
+        }), 200
+
+    except Exception as e:
+        print(f"Error computing availability: {e}")
+        return jsonify({'success': False, 'message': 'Failed to compute availability', 'error': str(e)}), 500
 
 @app.route('/api/teams/<int:team_id>/meetings', methods=['POST'])
 def add_team_meeting(team_id):
@@ -1143,84 +2294,68 @@ def add_team_meeting(team_id):
     
     parsed_start_time = parse_time_from_hhmm(meeting_start_time) if meeting_start_time else None
     parsed_end_time = parse_time_from_hhmm(meeting_end_time) if meeting_end_time else None
+
+    try:
+        meeting_day, series = _series_from_request(data, 'meeting')
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     
     conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor()
         
-        cur.execute("SELECT TeamName FROM Team WHERE TeamId = %s", (team_id,))
+        cur.execute("SELECT TeamName, CreatedByUserId FROM Team WHERE TeamId = %s", (team_id,))
         team_result = cur.fetchone()
         if not team_result:
             return jsonify({'success': False, 'message': 'Team not found'}), 404
         
-        team_name = team_result[0]
+        team_name, creator_id = team_result
+        
+        user_ids_by_email = _resolve_user_ids_by_email(cur, [email.strip() for email in invited_emails])
+        invited_user_ids = [
+            user_ids_by_email[email.strip()] for email in invited_emails if email.strip() in user_ids_by_email
+        ]
+        
+        if data.get('checkConflicts') and parsed_start_time and parsed_end_time:
+            conflicts = _find_conflicts(cur, set(invited_user_ids) | {creator_id}, meeting_day, meeting_day, parsed_start_time, parsed_end_time,
+                                        series=series)
+            member_conflicts = {str(user_id): items for user_id, items in conflicts.items() if items}
+            if member_conflicts:
+                return jsonify({'success': False, 'message': 'Meeting conflicts with members\' schedules', 'memberConflicts': member_conflicts}), 409
         
         cur.execute(
             """
             INSERT INTO TeamMeeting (MeetingTitle, MeetingDescription, MeetingDate,
-                                    MeetingStartTime, MeetingEndTime, TeamId, InvitationType)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+                                    MeetingStartTime, MeetingEndTime, TeamId, InvitationType,
+                                    RecurrenceRule, RecurrenceExceptions, RecurrenceEnd)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s::date[], %s)
             RETURNING TeamMeetingId
             """,
-            (meeting_title, meeting_description, meeting_date, parsed_start_time, parsed_end_time, team_id, invitation_type)
+            (meeting_title, meeting_description, meeting_day, parsed_start_time, parsed_end_time, team_id, invitation_type)
+            + series
         )
         
         meeting_id = cur.fetchone()[0]
         
-        for email in invited_emails:
-            if email.strip():
-                cur.execute("SELECT UserId FROM Users WHERE UserEmail = %s", (email.strip(),))
-                user_result = cur.fetchone()
-                
-                if user_result:
-                    user_id = user_result[0]
-                    
-                    cur.execute(
-                        """
-                        INSERT INTO TeamMembers (TeamId, UserId)
-                        SELECT %s, %s
-                        WHERE NOT EXISTS (
-                            SELECT 1 FROM TeamMembers WHERE TeamId = %s AND UserId = %s
-                        )
-                        """,
-                        (team_id, user_id, team_id, user_id)
-                    )
-                    
-                    cur.execute(
-                        """
-                        INSERT INTO MeetingInvitations (MeetingId, UserId, InvitationType, Status)
-                        VALUES (%s, %s, %s, %s)
-                        """,
-                        (meeting_id, user_id, invitation_type, 'accepted' if invitation_type == 'mandatory' else 'pending')
-                    )
-                    
-                    if invitation_type == 'request':
-                        meeting_time_info = ""
-                        if meeting_start_time and meeting_end_time:
-                            meeting_time_info = f" on {meeting_date} from {meeting_start_time} to {meeting_end_time}"
-                        elif meeting_date:
-                            meeting_time_info = f" on {meeting_date}"
-                        
-                        notification_message = f'You have been invited to join the meeting "{meeting_title}"{meeting_time_info} in team "{team_name}"'
-                        if meeting_description:
-                            notification_message += f'. Description: {meeting_description}'
-                        
-                        cur.execute(
-                            """
-                            INSERT INTO Notifications (UserId, Type, Title, Message, RelatedId)
-                            VALUES (%s, %s, %s, %s, %s)
-                            """,
-                            (
-                                user_id,
-                                'meeting_invitation',
-                                f'Meeting Invitation: {meeting_title}',
-                                notification_message,
-                                meeting_id
-                            )
-                        )
+        _add_team_members(cur, team_id, invited_user_ids)
+        _add_meeting_invitations(cur, meeting_id, invited_user_ids, invitation_type)
+        
+        if invitation_type == 'request' and invited_user_ids:
+            enqueue_event(cur, 'meeting_invitation', {
+                'userIds': list(dict.fromkeys(invited_user_ids)),
+                'meetingId': meeting_id,
+                'meetingTitle': meeting_title,
+                'meetingDescription': meeting_description,
+                'meetingDate': meeting_date,
+                'meetingStartTime': meeting_start_time,
+                'meetingEndTime': meeting_end_time,
+                'meetingRecurrence': series[0],
+                'teamName': team_name
+            }, idempotency_key=f'meeting_invitation:{meeting_id}')
         
         conn.commit()
+        _invalidate_response_cache(f'team:{team_id}', *(f'user:{user_id}' for user_id in invited_user_ids))
         
         return jsonify({
             'success': True,
@@ -1233,10 +2368,6 @@ def add_team_meeting(team_id):
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to add meeting', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/meetings/<int:meeting_id>', methods=['PUT'])
 def update_meeting(meeting_id):
@@ -1265,7 +2396,7 @@ def update_meeting(meeting_id):
         
         cur.execute(
             """
-            SELECT t.TeamId, t.TeamName 
+            SELECT t.TeamId, t.TeamName, tm.RecurrenceRule, tm.RecurrenceExceptions
             FROM TeamMeeting tm JOIN Team t ON tm.TeamId = t.TeamId 
             WHERE tm.TeamMeetingId = %s
             """, 
@@ -1274,60 +2405,61 @@ def update_meeting(meeting_id):
         team_result = cur.fetchone()
         if not team_result:
             return jsonify({'success': False, 'message': 'Meeting not found'}), 404
-        team_id, team_name = team_result
+        team_id, team_name = team_result[:2]
+
+        try:
+            meeting_day, series = _series_from_request(data, 'meeting', current=team_result[2:])
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
 
         cur.execute(
             """
             UPDATE TeamMeeting 
             SET MeetingTitle = %s, MeetingDescription = %s, MeetingDate = %s,
-                MeetingStartTime = %s, MeetingEndTime = %s, InvitationType = %s
+                MeetingStartTime = %s, MeetingEndTime = %s, InvitationType = %s,
+                RecurrenceRule = %s, RecurrenceExceptions = %s::date[], RecurrenceEnd = %s,
+                UpdatedAt = CURRENT_TIMESTAMP
             WHERE TeamMeetingId = %s
             """,
-            (title, description, date, parsed_start_time, parsed_end_time, invitation_type, meeting_id)
+            (title, description, meeting_day, parsed_start_time, parsed_end_time, invitation_type)
+            + series + (meeting_id,)
         )
 
         if removed_member_ids:
-            for user_id in removed_member_ids:
-                notification_message = f'You have been removed from the meeting "{title}" in team "{team_name}".'
-                cur.execute("INSERT INTO Notifications (UserId, Type, Title, Message) VALUES (%s, 'meeting_removed', %s, %s)",
-                            (user_id, f'Removed from Meeting: {title}', notification_message))
-                
-                cur.execute("DELETE FROM MeetingInvitations WHERE MeetingId = %s AND UserId = %s", (meeting_id, user_id))
-                cur.execute("DELETE FROM Notifications WHERE RelatedId = %s AND UserId = %s AND Type = 'meeting_invitation'", (meeting_id, user_id))
+            removed_member_ids = list(dict.fromkeys(int(user_id) for user_id in removed_member_ids))
+            enqueue_event(cur, 'meeting_member_removed', {
+                'userIds': removed_member_ids, 'meetingTitle': title, 'teamName': team_name
+            })
+            
+            cur.execute("DELETE FROM MeetingInvitations WHERE MeetingId = %s AND UserId = ANY(%s)", (meeting_id, removed_member_ids))
+            cur.execute("DELETE FROM Notifications WHERE RelatedId = %s AND UserId = ANY(%s) AND Type = 'meeting_invitation' RETURNING UserId, NotificationId",
+                        (meeting_id, removed_member_ids))
+            _record_deletions(cur, 'notification', cur.fetchall())
+            _record_deletions(cur, 'meeting', [(user_id, meeting_id) for user_id in removed_member_ids])
         
+        new_member_ids = []
         if new_member_emails:
-            for email in new_member_emails:
-                cur.execute("SELECT UserId FROM Users WHERE UserEmail = %s", (email,))
-                user_result = cur.fetchone()
-                if user_result:
-                    user_id = user_result[0]
-                    
-                    cur.execute("SELECT 1 FROM TeamMembers WHERE TeamId = %s AND UserId = %s", (team_id, user_id))
-                    is_member = cur.fetchone()
-                    
-                    if not is_member:
-                        cur.execute("INSERT INTO TeamMembers (TeamId, UserId) VALUES (%s, %s)", (team_id, user_id))
-
-                    cur.execute("INSERT INTO MeetingInvitations (MeetingId, UserId, InvitationType, Status) VALUES (%s, %s, %s, %s)",
-                                (meeting_id, user_id, invitation_type, 'accepted' if invitation_type == 'mandatory' else 'pending'))
-                    
-                    if invitation_type == 'mandatory':
-                        notification_message = f'You have been invited to join the mandatory meeting "{title}" in team "{team_name}".'
-                    else: # 'request'
-                        notification_message = f'You have been invited to join the meeting "{title}" in team "{team_name}". Please respond.'
-                    cur.execute("INSERT INTO Notifications (UserId, Type, Title, Message, RelatedId) VALUES (%s, 'meeting_invitation', %s, %s, %s)",
-                                (user_id, f'New Meeting Invitation: {title}', notification_message, meeting_id))
+            user_ids_by_email = _resolve_user_ids_by_email(cur, new_member_emails)
+            new_member_ids = list(dict.fromkeys(
+                user_ids_by_email[email] for email in new_member_emails if email in user_ids_by_email
+            ))
+            _add_team_members(cur, team_id, new_member_ids)
+            _add_meeting_invitations(cur, meeting_id, new_member_ids, invitation_type)
+            
+            if new_member_ids:
+                enqueue_event(cur, 'meeting_member_added', {
+                    'userIds': new_member_ids, 'meetingId': meeting_id, 'meetingTitle': title,
+                    'teamName': team_name, 'invitationType': invitation_type
+                })
 
         conn.commit()
+        _invalidate_response_cache(f'meeting:{meeting_id}', f'team:{team_id}', *(f'user:{user_id}' for user_id in new_member_ids))
         return jsonify({'success': True, 'message': 'Meeting updated successfully'}), 200
         
     except Exception as e:
         if conn: conn.rollback()
         print(f"Error updating meeting: {e}")
         return jsonify({'success': False, 'message': 'Failed to update meeting', 'error': str(e)}), 500
-    
-    finally:
-        if conn: conn.close()
 
 @app.route('/api/teams/<int:team_id>', methods=['DELETE'])
 def delete_team(team_id):
@@ -1346,27 +2478,25 @@ def delete_team(team_id):
         cur.execute("SELECT UserId FROM TeamMembers WHERE TeamId = %s", (team_id,))
         member_ids = [row[0] for row in cur.fetchall()]
 
-        notification_message = f'The team "{team_name}" has been deleted by the creator.'
-        for user_id in member_ids:
-            if user_id != creator_id:
-                cur.execute("INSERT INTO Notifications (UserId, Type, Title, Message) VALUES (%s, 'team_deleted', %s, %s)",
-                            (user_id, f'Team Deleted: {team_name}', notification_message))
+        enqueue_event(cur, 'team_deleted', {
+            'userIds': [user_id for user_id in member_ids if user_id != creator_id], 'teamName': team_name
+        }, idempotency_key=f'team_deleted:{team_id}')
 
         cur.execute("DELETE FROM MeetingInvitations WHERE MeetingId IN (SELECT TeamMeetingId FROM TeamMeeting WHERE TeamId = %s)", (team_id,))
-        cur.execute("DELETE FROM TeamMeeting WHERE TeamId = %s", (team_id,))
+        cur.execute("DELETE FROM TeamMeeting WHERE TeamId = %s RETURNING TeamMeetingId", (team_id,))
+        deleted_meeting_ids = [row[0] for row in cur.fetchall()]
+        _record_deletions(cur, 'meeting', [(user_id, meeting_id) for user_id in member_ids for meeting_id in deleted_meeting_ids])
         cur.execute("DELETE FROM TeamMembers WHERE TeamId = %s", (team_id,))
         cur.execute("DELETE FROM Team WHERE TeamId = %s", (team_id,))
 
         conn.commit()
+        _invalidate_response_cache(f'team:{team_id}')
         return jsonify({'success': True, 'message': 'Team deleted successfully'}), 200
         
     except Exception as e:
         if conn: conn.rollback()
         print(f"Error deleting team: {e}")
         return jsonify({'success': False, 'message': 'Failed to delete team', 'error': str(e)}), 500
-    
-    finally:
-        if conn: conn.close()
 
 @app.route('/api/meetings/<int:meeting_id>', methods=['DELETE'])
 def delete_meeting(meeting_id):
@@ -1387,41 +2517,89 @@ def delete_meeting(meeting_id):
         )
         results = cur.fetchall()
         if not results:
-            cur.execute("DELETE FROM TeamMeeting WHERE TeamMeetingId = %s", (meeting_id,))
-            if cur.rowcount == 0:
+            cur.execute(
+                """
+                DELETE FROM TeamMeeting tm
+                USING Team t
+                WHERE tm.TeamMeetingId = %s AND t.TeamId = tm.TeamId
+                RETURNING t.CreatedByUserId
+                """,
+                (meeting_id,)
+            )
+            deleted = cur.fetchone()
+            if not deleted:
                 return jsonify({'success': False, 'message': 'Meeting not found'}), 404
+            _record_deletions(cur, 'meeting', [(deleted[0], meeting_id)])
             conn.commit()
+            _invalidate_response_cache(f'meeting:{meeting_id}')
             return jsonify({'success': True, 'message': 'Meeting deleted successfully'}), 200
 
         meeting_title = results[0][0]
         team_name = results[0][1]
         member_ids = [row[2] for row in results]
 
-        notification_message = f'The meeting "{meeting_title}" in team "{team_name}" has been canceled.'
-        for user_id in member_ids:
-            cur.execute("INSERT INTO Notifications (UserId, Type, Title, Message) VALUES (%s, 'meeting_canceled', %s, %s)",
-                        (user_id, f'Meeting Canceled: {meeting_title}', notification_message))
+        enqueue_event(cur, 'meeting_canceled', {
+            'userIds': member_ids, 'meetingTitle': meeting_title, 'teamName': team_name
+        }, idempotency_key=f'meeting_canceled:{meeting_id}')
 
         cur.execute("DELETE FROM MeetingInvitations WHERE MeetingId = %s", (meeting_id,))
-        cur.execute("DELETE FROM Notifications WHERE RelatedId = %s AND Type = 'meeting_invitation'", (meeting_id,))
-        cur.execute("DELETE FROM TeamMeeting WHERE TeamMeetingId = %s", (meeting_id,))
+        cur.execute("DELETE FROM Notifications WHERE RelatedId = %s AND Type = 'meeting_invitation' RETURNING UserId, NotificationId", (meeting_id,))
+        _record_deletions(cur, 'notification', cur.fetchall())
+        cur.execute(
+            """
+            DELETE FROM TeamMeeting tm
+            USING Team t
+            WHERE tm.TeamMeetingId = %s AND t.TeamId = tm.TeamId
+            RETURNING t.CreatedByUserId
+            """,
+            (meeting_id,)
+        )
+        creator_id = cur.fetchone()[0]
+        _record_deletions(cur, 'meeting', [(user_id, meeting_id) for user_id in set(member_ids) | {creator_id}])
         
         conn.commit()
+        _invalidate_response_cache(f'meeting:{meeting_id}')
         return jsonify({'success': True, 'message': 'Meeting deleted successfully'}), 200
         
     except Exception as e:
         if conn: conn.rollback()
         print(f"Error deleting meeting: {e}")
         return jsonify({'success': False, 'message': 'Failed to delete meeting', 'error': str(e)}), 500
-    
-    finally:
-        if conn: conn.close()
+
+def _count_unread_notifications(cur, user_id):
+    """Count unread notifications; served from the partial index on unread rows"""
+    cur.execute("SELECT COUNT(*) FROM Notifications WHERE UserId = %s AND IsRead = FALSE", (user_id,))
+    return cur.fetchone()[0]
+
+NOTIFICATION_ENCODER = RowEncoder([
+    ('notificationid', None), ('type', None), ('title', None), ('message', None), ('relatedid', None),
+    ('isread', None), ('createdat', None), ('invitationstatus', None), ('invitationtype', None)
+])
 
 @app.route('/api/notifications', methods=['GET'])
+@conditional_get
 def get_notifications():
+    """
+    List a user's notifications, newest first.
+    Pass limit (and the returned nextCursor as cursor) to page through the history.
+    """
     user_id_param = request.args.get('userId')
     if not user_id_param:
         return jsonify({'success': False, 'message': 'User ID is required'}), 400
+
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    try:
+        limit = min(int(limit), MAX_PAGE_SIZE) if limit else None
+        cursor_values = _decode_cursor(cursor) if cursor else None
+        if cursor_values:
+            cursor_created_at = datetime.fromisoformat(cursor_values[0])
+            cursor_id = int(cursor_values[1])
+    except (ValueError, TypeError, IndexError):
+        return jsonify({'success': False, 'message': 'Invalid limit or cursor'}), 400
+
+    if limit is not None and limit < 1:
+        return jsonify({'success': False, 'message': 'Limit must be positive'}), 400
     
     conn = None
     try:
@@ -1432,8 +2610,7 @@ def get_notifications():
         if internal_user_id is None:
             return jsonify({'success': False, 'message': 'User not found'}), 404
         
-        cur.execute(
-            """
+        query = """
             SELECT n.NotificationId, n.Type, n.Title, n.Message, n.RelatedId, n.IsRead, n.CreatedAt,
                    mi.Status as InvitationStatus,
                    tm.InvitationType
@@ -1441,41 +2618,102 @@ def get_notifications():
             LEFT JOIN MeetingInvitations mi ON n.RelatedId = mi.MeetingId AND n.Type = 'meeting_invitation' AND mi.UserId = %s
             LEFT JOIN TeamMeeting tm ON mi.MeetingId = tm.TeamMeetingId
             WHERE n.UserId = %s
-            ORDER BY n.CreatedAt DESC
-            """,
-            (internal_user_id, internal_user_id)
-        )
-        
-        notifications = []
-        unread_count = 0
-        for row in cur.fetchall():
-            notification = {
-                'notificationid': row[0],
-                'type': row[1],
-                'title': row[2],
-                'message': row[3],
-                'relatedid': row[4],
-                'isread': row[5],
-                'createdat': row[6].isoformat() if row[6] else None,
-                'invitationstatus': row[7],
-                'invitationtype': row[8]
-            }
-            notifications.append(notification)
-            if not row[5]:
-                unread_count += 1
-        
-        return jsonify({
+        """
+        params = [internal_user_id, internal_user_id]
+        if cursor_values:
+            query += " AND (n.CreatedAt, n.NotificationId) < (%s, %s)"
+            params.extend([cursor_created_at, cursor_id])
+        query += " ORDER BY n.CreatedAt DESC, n.NotificationId DESC"
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit + 1)
+
+        if STREAM_RESPONSES and limit is None:
+            unread_count = _count_unread_notifications(cur, internal_user_id)
+            rows = _iter_query(query, params)
+            return _stream_response(stream_json_object(
+                {'success': True, 'unreadCount': unread_count, 'nextCursor': None},
+                'notifications', map(NOTIFICATION_ENCODER, rows)
+            ))
+
+        cur.execute(query, params)
+        rows = cur.fetchall()
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor([rows[-1][6].isoformat(), rows[-1][0]])
+        
+        return json_response({
             'success': True,
-            'notifications': notifications,
-            'unreadCount': unread_count
-        }), 200
+            'notifications': NOTIFICATION_ENCODER.many(rows),
+            'unreadCount': _count_unread_notifications(cur, internal_user_id),
+            'nextCursor': next_cursor
+        })
         
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to fetch notifications', 'error': str(e)}), 500
-    
-    finally:
-        if conn: conn.close()
+
+@app.route('/api/notifications/unread-count', methods=['GET'])
+@conditional_get
+def get_unread_notification_count():
+    """Return only the number of unread notifications, for the header badge"""
+    user_id_param = request.args.get('userId')
+    if not user_id_param:
+        return jsonify({'success': False, 'message': 'User ID is required'}), 400
+
+    try:
+        cur = get_db_connection().cursor()
+
+        internal_user_id = _get_internal_user_id(cur, user_id_param)
+        if internal_user_id is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
+
+        return jsonify({'success': True, 'unreadCount': _count_unread_notifications(cur, internal_user_id)}), 200
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({'success': False, 'message': 'Failed to fetch unread count', 'error': str(e)}), 500
+
+@app.route('/api/notifications/stream', methods=['GET'])
+def stream_notifications():
+    """Push new notifications to the client as Server-Sent Events"""
+    user_id_param = request.args.get('userId')
+    if not user_id_param:
+        return jsonify({'success': False, 'message': 'User ID is required'}), 400
+
+    try:
+        cur = get_db_connection().cursor()
+        internal_user_id = _get_internal_user_id(cur, user_id_param)
+        if internal_user_id is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
+    except Exception as e:
+        print(f"Error opening notification stream: {e}")
+        return jsonify({'success': False, 'message': 'Failed to open notification stream', 'error': str(e)}), 500
+
+    listener = get_listener()
+    subscriber = listener.subscribe(internal_user_id)
+
+    # The generator deliberately runs without the request context, so the pooled
+    # connection is released as soon as this view returns rather than held open.
+    def generate():
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            while True:
+                try:
+                    event = subscriber.get(timeout=SSE_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: notification\ndata: {json.dumps(event)}\n\n"
+        finally:
+            listener.unsubscribe(internal_user_id, subscriber)
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 @app.route('/api/notifications/mark-all-read', methods=['PUT'])
 def mark_all_notifications_read():
@@ -1493,15 +2731,13 @@ def mark_all_notifications_read():
         cur.execute(
             """
             UPDATE Notifications 
-            SET IsRead = TRUE 
+            SET IsRead = TRUE, UpdatedAt = CURRENT_TIMESTAMP
             WHERE UserId = %s AND IsRead = FALSE
             """, 
             (user_id,)
         )
         
         conn.commit()
-        cur.close()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1522,15 +2758,13 @@ def mark_notification_read(notification_id):
         cur.execute(
             """
             UPDATE Notifications 
-            SET IsRead = TRUE 
+            SET IsRead = TRUE, UpdatedAt = CURRENT_TIMESTAMP
             WHERE NotificationId = %s
             """, 
             (notification_id,)
         )
         
         conn.commit()
-        cur.close()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1552,16 +2786,18 @@ def delete_notification(notification_id):
             """
             DELETE FROM Notifications 
             WHERE NotificationId = %s
+            RETURNING UserId
             """, 
             (notification_id,)
         )
+        deleted = cur.fetchone()
         
-        if cur.rowcount == 0:
+        if not deleted:
             return jsonify({'success': False, 'message': 'Notification not found'}), 404
         
+        _record_deletions(cur, 'notification', [(deleted[0], notification_id)])
+        
         conn.commit()
-        cur.close()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1593,7 +2829,7 @@ def respond_to_invitation(meeting_id):
         cur.execute(
             """
             UPDATE MeetingInvitations 
-            SET Status = %s, RespondedAt = CURRENT_TIMESTAMP
+            SET Status = %s, RespondedAt = CURRENT_TIMESTAMP, UpdatedAt = CURRENT_TIMESTAMP
             WHERE MeetingId = %s AND UserId = %s
             """,
             (response, meeting_id, user_id)
@@ -1605,13 +2841,35 @@ def respond_to_invitation(meeting_id):
         cur.execute(
             """
             UPDATE Notifications 
-            SET IsRead = TRUE
+            SET IsRead = TRUE, UpdatedAt = CURRENT_TIMESTAMP
             WHERE RelatedId = %s AND Type = 'meeting_invitation' AND UserId = %s
             """,
             (meeting_id, user_id)
         )
         
+        if response == 'declined':
+            _record_deletions(cur, 'meeting', [(user_id, meeting_id)])
+        
+        cur.execute(
+            """
+            SELECT tm.MeetingTitle, t.CreatedByUserId, u.UserName
+            FROM TeamMeeting tm
+            JOIN Team t ON tm.TeamId = t.TeamId
+            JOIN Users u ON u.UserId = %s
+            WHERE tm.TeamMeetingId = %s
+            """,
+            (user_id, meeting_id)
+        )
+        meeting_result = cur.fetchone()
+        if meeting_result and meeting_result[1] != int(user_id):
+            meeting_title, creator_id, responder_name = meeting_result
+            enqueue_event(cur, 'invitation_responded', {
+                'userIds': [creator_id], 'meetingId': meeting_id, 'meetingTitle': meeting_title,
+                'responderName': responder_name, 'response': response
+            })
+        
         conn.commit()
+        _invalidate_response_cache(f'meeting:{meeting_id}', f'user:{user_id}')
         
         return jsonify({
             'success': True,
@@ -1623,56 +2881,590 @@ def respond_to_invitation(meeting_id):
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to respond to invitation', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
 
-@app.route('/api/users/<user_id>', methods=['GET'])
-def get_user(user_id):
+def _search_tsquery(query):
+    """Turn free text into a prefix-matching tsquery string, e.g. 'team sync' -> 'team:* & sync:*'"""
+    return ' & '.join(f'{token}:*' for token in re.findall(r'\w+', query))
+
+def _calendar_sort_key(item):
+    """Untimed items first, then by start time"""
+    return (item['startTime'] is not None, item['startTime'] or '', item['type'], item['id'])
+
+@app.route('/api/calendar', methods=['GET'])
+@conditional_get
+@cached_response
+def get_calendar():
+    """
+    Everything on a user's calendar from `from` to `to` (inclusive YYYY-MM-DD, at most
+    CALENDAR_MAX_DAYS days), bucketed by day, in three range queries.
+    Activities and meetings sit on their date, recurring ones on every occurrence in the
+    window (with their rule in `recurrence`); meetings carry their team and creator.
+    A goal timeline sits on its first day inside the window, clipped to the window, with
+    spanDays and isPartialStart / isPartialEnd marking the clipped ends.
+    """
+    user_id_param = request.args.get('userId')
+    if not user_id_param:
+        return jsonify({'success': False, 'message': 'User ID is required'}), 400
+
+    try:
+        date_from = datetime.strptime(request.args.get('from', ''), '%Y-%m-%d').date()
+        date_to = datetime.strptime(request.args.get('to', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({'success': False, 'message': 'from and to are required in YYYY-MM-DD format'}), 400
+    if date_to < date_from or (date_to - date_from).days >= CALENDAR_MAX_DAYS:
+        return jsonify({'success': False, 'message': f'The range must cover 1 to {CALENDAR_MAX_DAYS} days'}), 400
+
     conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor()
 
-        internal_user_id = _get_internal_user_id(cur, user_id)
+        internal_user_id = _get_internal_user_id(cur, user_id_param)
         if internal_user_id is None:
             return jsonify({'success': False, 'message': 'User not found'}), 404
+        _tag_response(f'user:{internal_user_id}')
+
+        days = {}
+        day = date_from
+        while day <= date_to:
+            days[day] = []
+            day += timedelta(days=1)
 
         cur.execute(
             """
-            SELECT UserId, UserName, UserEmail, UserDOB, UserBio, 
-                   UserProfilePicture, GoogleId
-            FROM Users
-            WHERE UserId = %s
+            SELECT ActivityId, ActivityTitle, ActivityDescription, ActivityCategory, ActivityUrgency,
+                   ActivityDate, ActivityStartTime, ActivityEndTime,
+                   RecurrenceRule, RecurrenceExceptions, RecurrenceEnd
+            FROM Activity
+            WHERE UserId = %(user_id)s
+              AND (ActivityDate BETWEEN %(from)s AND %(to)s
+                   OR RecurrenceRule IS NOT NULL AND ActivityDate <= %(to)s
+                      AND (RecurrenceEnd IS NULL OR RecurrenceEnd >= %(from)s))
             """,
-            (internal_user_id,)
+            {'user_id': internal_user_id, 'from': date_from, 'to': date_to}
         )
-        
-        user = cur.fetchone()
-        
-        if not user:
+        for (activity_id, title, description, category, urgency, activity_date, start_time, end_time,
+             recurrence, _, _) in expand_rows(cur.fetchall(), (5,), 8, date_from, date_to):
+            days[activity_date].append({
+                'type': 'activity',
+                'id': activity_id,
+                'title': title,
+                'description': description,
+                'category': category,
+                'urgency': urgency,
+                'recurrence': recurrence,
+                'startTime': hhmm(start_time),
+                'endTime': hhmm(end_time)
+            })
+
+        cur.execute(
+            """
+            SELECT g.GoalId, g.GoalTitle, g.GoalCategory, g.GoalProgress,
+                   t.TimelineId, t.TimelineTitle, t.TimelineStartDate, t.TimelineEndDate,
+                   t.TimelineStartTime, t.TimelineEndTime
+            FROM Goal g
+            JOIN Timeline t ON t.GoalId = g.GoalId
+            WHERE g.UserId = %s AND t.TimelineSpan && tsrange(%s::timestamp, %s::timestamp)
+            """,
+            (internal_user_id, date_from, date_to + timedelta(days=1))
+        )
+        for (goal_id, goal_title, category, progress, timeline_id, title,
+             start_date, end_date, start_time, end_time) in cur.fetchall():
+            first_day = max(start_date, date_from)
+            last_day = min(end_date, date_to)
+            days[first_day].append({
+                'type': 'goal',
+                'id': goal_id,
+                'timelineId': timeline_id,
+                'title': title,
+                'goalTitle': goal_title,
+                'category': category,
+                'progress': progress,
+                'startDate': start_date,
+                'endDate': end_date,
+                'spanDays': (last_day - first_day).days + 1,
+                'isPartialStart': start_date < date_from,
+                'isPartialEnd': end_date > date_to,
+                'startTime': hhmm(start_time),
+                'endTime': hhmm(end_time)
+            })
+
+        cur.execute(
+            """
+            SELECT tm.TeamMeetingId, tm.MeetingTitle, tm.MeetingDescription, tm.MeetingDate,
+                   tm.MeetingStartTime, tm.MeetingEndTime, tm.InvitationType,
+                   t.TeamId, t.TeamName, t.CreatedByUserId, creator.UserName, creator.UserProfilePicture,
+                   tm.RecurrenceRule, tm.RecurrenceExceptions, tm.RecurrenceEnd
+            FROM TeamMembers tmem
+            JOIN Team t ON t.TeamId = tmem.TeamId
+            JOIN TeamMeeting tm ON tm.TeamId = t.TeamId
+            LEFT JOIN Users creator ON creator.UserId = t.CreatedByUserId
+            WHERE tmem.UserId = %(user_id)s
+              AND (tm.MeetingDate BETWEEN %(from)s AND %(to)s
+                   OR tm.RecurrenceRule IS NOT NULL AND tm.MeetingDate <= %(to)s
+                      AND (tm.RecurrenceEnd IS NULL OR tm.RecurrenceEnd >= %(from)s))
+              AND (t.CreatedByUserId = tmem.UserId OR EXISTS (
+                  SELECT 1 FROM MeetingInvitations mi
+                  WHERE mi.MeetingId = tm.TeamMeetingId AND mi.UserId = tmem.UserId AND mi.Status = 'accepted'
+              ))
+            """,
+            {'user_id': internal_user_id, 'from': date_from, 'to': date_to}
+        )
+        for (meeting_id, title, description, meeting_date, start_time, end_time, invitation_type,
+             team_id, team_name, creator_id, creator_name, creator_picture,
+             recurrence, _, _) in expand_rows(cur.fetchall(), (3,), 12, date_from, date_to):
+            _tag_response(f'team:{team_id}', f'meeting:{meeting_id}', f'profile:{creator_id}')
+            days[meeting_date].append({
+                'type': 'meeting',
+                'id': meeting_id,
+                'title': title,
+                'description': description,
+                'invitationType': invitation_type,
+                'teamId': team_id,
+                'teamName': team_name,
+                'creatorId': creator_id,
+                'creatorName': creator_name,
+                'creatorProfilePicture': creator_picture,
+                'recurrence': recurrence,
+                'startTime': hhmm(start_time),
+                'endTime': hhmm(end_time)
+            })
+
+        return json_response({
+            'success': True,
+            'from': date_from,
+            'to': date_to,
+            'days': [{'date': day, 'items': sorted(items, key=_calendar_sort_key)} for day, items in days.items()]
+        })
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({'success': False, 'message': 'Failed to fetch calendar', 'error': str(e)}), 500
+
+# Rows follow calendar_io.EXPORT_COLUMNS
+EXPORT_SQL = """
+    SELECT 'activity', a.ActivityId, NULL::integer, NULL::text, a.ActivityTitle, a.ActivityDescription,
+           a.ActivityCategory, a.ActivityUrgency, NULL::text, a.ActivityDate, a.ActivityDate,
+           a.ActivityStartTime, a.ActivityEndTime, a.RecurrenceRule, a.RecurrenceExceptions
+    FROM Activity a
+    WHERE a.UserId = %(user_id)s
+    UNION ALL
+    SELECT 'goal', g.GoalId, NULL, NULL, g.GoalTitle, g.GoalDescription,
+           g.GoalCategory, NULL, g.GoalProgress, NULL, NULL, NULL, NULL, NULL, NULL
+    FROM Goal g
+    WHERE g.UserId = %(user_id)s
+    UNION ALL
+    SELECT 'timeline', t.TimelineId, g.GoalId, g.GoalTitle, t.TimelineTitle, NULL,
+           g.GoalCategory, NULL, NULL, t.TimelineStartDate, t.TimelineEndDate,
+           t.TimelineStartTime, t.TimelineEndTime, NULL, NULL
+    FROM Timeline t
+    JOIN Goal g ON g.GoalId = t.GoalId
+    WHERE g.UserId = %(user_id)s
+    UNION ALL
+    SELECT 'meeting', tm.TeamMeetingId, t.TeamId, t.TeamName, tm.MeetingTitle, tm.MeetingDescription,
+           NULL, NULL, NULL, tm.MeetingDate, tm.MeetingDate, tm.MeetingStartTime, tm.MeetingEndTime,
+           tm.RecurrenceRule, tm.RecurrenceExceptions
+    FROM TeamMeeting tm
+    JOIN Team t ON t.TeamId = tm.TeamId
+    WHERE t.CreatedByUserId = %(user_id)s OR EXISTS (
+        SELECT 1 FROM MeetingInvitations mi
+        WHERE mi.MeetingId = tm.TeamMeetingId AND mi.UserId = %(user_id)s AND mi.Status = 'accepted'
+    )
+"""
+
+@app.route('/api/export', methods=['GET'])
+def export_calendar():
+    """
+    Export a user's activities, goals, timelines and meetings as ics, ndjson or csv.
+    Rows are read through a named cursor and written as they arrive, so memory use does not
+    grow with the size of the account.
+    """
+    user_id_param = request.args.get('userId')
+    export_format = request.args.get('format', 'ics')
+    if not user_id_param:
+        return jsonify({'success': False, 'message': 'User ID is required'}), 400
+    if export_format not in WRITERS:
+        return jsonify({'success': False, 'message': 'Format must be one of: ics, ndjson, csv'}), 400
+
+    try:
+        conn = get_db_connection()
+        internal_user_id = _get_internal_user_id(conn.cursor(), user_id_param)
+        if internal_user_id is None:
             return jsonify({'success': False, 'message': 'User not found'}), 404
-        
-        user_data = {
-            'userid': user[0],
-            'username': user[1],
-            'useremail': user[2],
-            'userdob': user[3].isoformat() if user[3] else None,
-            'userbio': user[4],
-            'userprofilepicture': user[5],
-            'isgoogleuser': user[6] is not None
+
+        rows = _iter_query(EXPORT_SQL, {'user_id': internal_user_id}, name='export')
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({'success': False, 'message': 'Failed to export calendar', 'error': str(e)}), 500
+
+    return _stream_response(
+        WRITERS[export_format](rows),
+        mimetype=CONTENT_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="planit-export.{export_format}"'}
+    )
+
+@app.route('/api/search', methods=['GET'])
+def search():
+    """
+    Search a user's activities, goal timelines and visible team meetings.
+    Full-text matches (prefix-aware) and trigram matches on titles are ranked
+    together, exact title matches first, and only the top `limit` are returned.
+    """
+    user_id_param = request.args.get('userId')
+    query = (request.args.get('q') or '').strip()
+    if not user_id_param:
+        return jsonify({'success': False, 'message': 'User ID is required'}), 400
+
+    try:
+        limit = min(int(request.args.get('limit', SEARCH_DEFAULT_LIMIT)), SEARCH_MAX_LIMIT)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'limit must be an integer'}), 400
+    if limit < 1:
+        return jsonify({'success': False, 'message': 'limit must be positive'}), 400
+
+    tsquery = _search_tsquery(query)
+    if not tsquery:
+        return jsonify({'success': True, 'results': []}), 200
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        internal_user_id = _get_internal_user_id(cur, user_id_param)
+        if internal_user_id is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
+
+        params = {
+            'user_id': internal_user_id,
+            'text': query,
+            'tsquery': tsquery,
+            'pattern': '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%',
+            'limit': limit
         }
+        results = []
+
+        cur.execute(
+            """
+            SELECT a.ActivityId, a.ActivityTitle, a.ActivityDescription, a.ActivityCategory, a.ActivityUrgency,
+                   a.ActivityDate, a.ActivityStartTime, a.ActivityEndTime,
+                   ts_rank(a.SearchVector, q) + word_similarity(%(text)s, a.ActivityTitle)
+                       + CASE WHEN lower(a.ActivityTitle) = lower(%(text)s) THEN 1 ELSE 0 END AS rank
+            FROM Activity a, to_tsquery('simple', %(tsquery)s) q
+            WHERE a.UserId = %(user_id)s
+              AND (a.SearchVector @@ q OR a.ActivityTitle ILIKE %(pattern)s OR %(text)s <%% a.ActivityTitle)
+            ORDER BY rank DESC
+            LIMIT %(limit)s
+            """,
+            params
+        )
+        for row in cur.fetchall():
+            results.append({
+                'type': 'activity',
+                'id': row[0],
+                'timelineId': None,
+                'title': row[1],
+                'rank': float(row[8]),
+                'data': {
+                    'activityid': row[0],
+                    'activitytitle': row[1],
+                    'activitydescription': row[2],
+                    'activitycategory': row[3],
+                    'activityurgency': row[4],
+                    'activitydate': row[5].isoformat() if row[5] else None,
+                    'activitystarttime': format_time_to_hhmm(row[6]),
+                    'activityendtime': format_time_to_hhmm(row[7])
+                }
+            })
+
+        cur.execute(
+            """
+            SELECT g.GoalId, g.GoalTitle, g.GoalDescription, g.GoalCategory, g.GoalProgress,
+                   t.TimelineId, t.TimelineTitle, t.TimelineStartDate, t.TimelineEndDate,
+                   t.TimelineStartTime, t.TimelineEndTime,
+                   ts_rank(g.SearchVector || t.SearchVector, q)
+                       + GREATEST(word_similarity(%(text)s, g.GoalTitle), word_similarity(%(text)s, t.TimelineTitle))
+                       + CASE WHEN lower(g.GoalTitle) = lower(%(text)s) OR lower(t.TimelineTitle) = lower(%(text)s)
+                              THEN 1 ELSE 0 END AS rank
+            FROM Goal g
+            JOIN Timeline t ON t.GoalId = g.GoalId, to_tsquery('simple', %(tsquery)s) q
+            WHERE g.UserId = %(user_id)s
+              AND ((g.SearchVector || t.SearchVector) @@ q
+                   OR g.GoalTitle ILIKE %(pattern)s OR t.TimelineTitle ILIKE %(pattern)s
+                   OR %(text)s <%% g.GoalTitle OR %(text)s <%% t.TimelineTitle)
+            ORDER BY rank DESC
+            LIMIT %(limit)s
+            """,
+            params
+        )
+        for row in cur.fetchall():
+            results.append({
+                'type': 'goal',
+                'id': row[0],
+                'timelineId': row[5],
+                'title': f'{row[1]} - {row[6]}',
+                'rank': float(row[11]),
+                'data': {
+                    'goalid': row[0],
+                    'goaltitle': row[1],
+                    'goaldescription': row[2],
+                    'goalcategory': row[3],
+                    'goalprogress': row[4],
+                    'timelineid': row[5],
+                    'timelinetitle': row[6],
+                    'timelinestartdate': row[7].isoformat() if row[7] else None,
+                    'timelineenddate': row[8].isoformat() if row[8] else None,
+                    'timelinestarttime': format_time_to_hhmm(row[9]),
+                    'timelineendtime': format_time_to_hhmm(row[10])
+                }
+            })
+
+        # Same visibility rule as GET /api/teams: team creators see every meeting,
+        # other members only the ones they have accepted.
+        cur.execute(
+            """
+            SELECT tm.TeamMeetingId, tm.MeetingTitle, tm.MeetingDescription, tm.MeetingDate,
+                   tm.MeetingStartTime, tm.MeetingEndTime, tm.InvitationType, t.TeamId, t.TeamName,
+                   ts_rank(tm.SearchVector, q) + word_similarity(%(text)s, tm.MeetingTitle)
+                       + CASE WHEN lower(tm.MeetingTitle) = lower(%(text)s) THEN 1 ELSE 0 END AS rank
+            FROM TeamMeeting tm
+            JOIN Team t ON tm.TeamId = t.TeamId
+            JOIN TeamMembers tmem ON tmem.TeamId = t.TeamId AND tmem.UserId = %(user_id)s,
+                 to_tsquery('simple', %(tsquery)s) q
+            WHERE (t.CreatedByUserId = %(user_id)s OR EXISTS (
+                      SELECT 1 FROM MeetingInvitations mi
+                      WHERE mi.MeetingId = tm.TeamMeetingId AND mi.UserId = %(user_id)s AND mi.Status = 'accepted'
+                  ))
+              AND (tm.SearchVector @@ q OR tm.MeetingTitle ILIKE %(pattern)s OR %(text)s <%% tm.MeetingTitle)
+            ORDER BY rank DESC
+            LIMIT %(limit)s
+            """,
+            params
+        )
+        meeting_results = {}
+        for row in cur.fetchall():
+            meeting_results[row[0]] = {
+                'type': 'meeting',
+                'id': row[0],
+                'timelineId': None,
+                'title': row[1],
+                'rank': float(row[9]),
+                'data': {
+                    'teammeetingid': row[0],
+                    'meetingtitle': row[1],
+                    'meetingdescription': row[2],
+                    'meetingdate': row[3].isoformat() if row[3] else None,
+                    'meetingstarttime': format_time_to_hhmm(row[4]),
+                    'meetingendtime': format_time_to_hhmm(row[5]),
+                    'invitationtype': row[6],
+                    'teamid': row[7],
+                    'teamname': row[8],
+                    'members': []
+                }
+            }
+        for meeting_id, members in _get_meeting_members(cur, list(meeting_results.keys())).items():
+            meeting_results[meeting_id]['data']['members'] = members
+        results.extend(meeting_results.values())
+
+        results.sort(key=lambda result: (-result['rank'], result['title'] or ''))
+        return jsonify({'success': True, 'results': results[:limit]}), 200
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({'success': False, 'message': 'Failed to search', 'error': str(e)}), 500
+
+@app.route('/api/sync', methods=['GET'])
+def sync_changes():
+    """
+    Return the activities, goals, meetings and notifications that changed after the
+    given cursor, plus tombstones for deleted items and a cursor for the next call.
+    Without a cursor the user's full dataset is returned.
+    """
+    user_id_param = request.args.get('userId')
+    since_param = request.args.get('since')
+    if not user_id_param:
+        return jsonify({'success': False, 'message': 'User ID is required'}), 400
+
+    since = since_time = None
+    try:
+        if since_param:
+            cursor_values = _decode_cursor(since_param)
+            since_time = datetime.fromisoformat(cursor_values[0])
+            since = str(int(cursor_values[1]))
+    except (ValueError, TypeError, IndexError):
+        return jsonify({'success': False, 'message': 'Invalid sync cursor'}), 400
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        internal_user_id = _get_internal_user_id(cur, user_id_param)
+        if internal_user_id is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
+
+        # The next cursor is the oldest transaction still running as this sync reads
+        # (see migration 002): every row written by a transaction below it is already
+        # visible to the queries below, and every writer still in flight, however long
+        # it runs, stamps its rows with a ChangeXid at or above it.
+        cur.execute(
+            """
+            SELECT CURRENT_TIMESTAMP, pg_snapshot_xmin(pg_current_snapshot())::text,
+                   %s::timestamptz < CURRENT_TIMESTAMP - make_interval(days => %s)
+            """,
+            (since_time, SYNC_TOMBSTONE_RETENTION_DAYS)
+        )
+        cursor_time, cursor_xid, tombstones_pruned = cur.fetchone()
+        next_cursor = _encode_cursor([cursor_time.isoformat(), cursor_xid])
+        if tombstones_pruned:
+            # Deletions this old may already be pruned, so fall back to a full sync.
+            since = None
+
+        since_sql = "AND a.ChangeXid >= %s::xid8" if since else ""
+        cur.execute(
+            f"""
+            SELECT {', '.join('a.' + column for column, _ in ACTIVITY_FIELDS.values())}
+            FROM Activity a
+            WHERE a.UserId = %s {since_sql}
+            ORDER BY a.ActivityDate, a.ActivityStartTime, a.ActivityId
+            """,
+            (internal_user_id, since) if since else (internal_user_id,)
+        )
+        activities = ACTIVITY_ENCODER.many(cur.fetchall())
+
+        since_sql = """AND (g.ChangeXid >= %s::xid8 OR EXISTS (
+                SELECT 1 FROM Timeline x WHERE x.GoalId = g.GoalId AND x.ChangeXid >= %s::xid8
+            ))""" if since else ""
+        cur.execute(
+            f"""
+            SELECT g.GoalId, g.GoalTitle, g.GoalDescription, g.GoalCategory, g.GoalProgress,
+                   t.TimelineId, t.TimelineTitle, t.TimelineStartDate, t.TimelineEndDate,
+                   t.TimelineStartTime, t.TimelineEndTime
+            FROM Goal g
+            LEFT JOIN Timeline t ON g.GoalId = t.GoalId
+            WHERE g.UserId = %s {since_sql}
+            ORDER BY g.GoalId, t.TimelineStartDate
+            """,
+            (internal_user_id, since, since) if since else (internal_user_id,)
+        )
+        goals = _group_goal_rows(cur.fetchall())
+
+        since_sql = """AND (tm.ChangeXid >= %s::xid8 OR EXISTS (
+                SELECT 1 FROM MeetingInvitations x WHERE x.MeetingId = tm.TeamMeetingId AND x.ChangeXid >= %s::xid8
+            ))""" if since else ""
+        cur.execute(
+            f"""
+            SELECT tm.TeamId, tm.TeamMeetingId, tm.MeetingTitle, tm.MeetingDescription,
+                   tm.MeetingDate, tm.MeetingStartTime, tm.MeetingEndTime, tm.InvitationType,
+                   tm.RecurrenceRule, tm.RecurrenceExceptions
+            FROM TeamMeeting tm
+            JOIN Team t ON tm.TeamId = t.TeamId
+            WHERE (t.CreatedByUserId = %s OR EXISTS (
+                SELECT 1 FROM MeetingInvitations mi
+                WHERE mi.MeetingId = tm.TeamMeetingId AND mi.UserId = %s AND mi.Status = 'accepted'
+            )) {since_sql}
+            ORDER BY tm.MeetingDate, tm.MeetingStartTime
+            """,
+            (internal_user_id, internal_user_id, since, since) if since else (internal_user_id, internal_user_id)
+        )
+        meetings = SYNC_MEETING_ENCODER.many(cur.fetchall())
+        members_by_meeting = _get_meeting_members(cur, [meeting['teammeetingid'] for meeting in meetings])
+        for meeting in meetings:
+            meeting['members'] = members_by_meeting[meeting['teammeetingid']]
+
+        since_sql = "AND n.ChangeXid >= %s::xid8" if since else ""
+        cur.execute(
+            f"""
+            SELECT n.NotificationId, n.Type, n.Title, n.Message, n.RelatedId, n.IsRead, n.CreatedAt,
+                   mi.Status as InvitationStatus,
+                   tm.InvitationType
+            FROM Notifications n
+            LEFT JOIN MeetingInvitations mi ON n.RelatedId = mi.MeetingId AND n.Type = 'meeting_invitation' AND mi.UserId = %s
+            LEFT JOIN TeamMeeting tm ON mi.MeetingId = tm.TeamMeetingId
+            WHERE n.UserId = %s {since_sql}
+            ORDER BY n.CreatedAt DESC
+            """,
+            (internal_user_id, internal_user_id, since) if since else (internal_user_id, internal_user_id)
+        )
+        notifications = NOTIFICATION_ENCODER.many(cur.fetchall())
+
+        deleted = {'activities': [], 'goals': [], 'timelines': [], 'meetings': [], 'notifications': []}
+        if since:
+            cur.execute(
+                """
+                SELECT DISTINCT EntityType, EntityId
+                FROM DeletedItems
+                WHERE UserId = %s AND ChangeXid >= %s::xid8
+                """,
+                (internal_user_id, since)
+            )
+            # An item deleted for this user and then visible again (e.g. a declined
+            # meeting later accepted) is reported as changed, not deleted.
+            live_ids = {
+                'activities': {activity['activityid'] for activity in activities},
+                'goals': {goal['goalid'] for goal in goals},
+                'timelines': {timeline['timelineid'] for goal in goals for timeline in goal['timelines']},
+                'meetings': {meeting['teammeetingid'] for meeting in meetings},
+                'notifications': {notification['notificationid'] for notification in notifications}
+            }
+            for entity_type, entity_id in cur.fetchall():
+                key = entity_type + 's'
+                if entity_id not in live_ids[key]:
+                    deleted[key].append(entity_id)
+
+        return json_response({
+            'success': True,
+            'cursor': next_cursor,
+            'full': since is None,
+            'activities': activities,
+            'goals': goals,
+            'meetings': meetings,
+            'notifications': notifications,
+            'deleted': deleted
+        })
+
+    except Exception as e:
+        print(f"Error during sync: {e}")
+        return jsonify({'success': False, 'message': 'Failed to sync changes', 'error': str(e)}), 500
+
+@app.route('/api/avatars/<avatar_hash>', methods=['GET'])
+def get_avatar(avatar_hash):
+    """Serve a stored avatar thumbnail; the URL is content-addressed, so it can be cached forever"""
+    if request.if_none_match.contains(avatar_hash):
+        response = Response(status=304)
+    else:
+        try:
+            avatar = load_avatar(get_db_connection().cursor(), avatar_hash)
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            return jsonify({'success': False, 'message': 'Failed to fetch avatar', 'error': str(e)}), 500
+        if avatar is None:
+            return jsonify({'success': False, 'message': 'Avatar not found'}), 404
+        response = Response(avatar[1], mimetype=avatar[0])
+    response.set_etag(avatar_hash)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+@app.route('/api/users/<user_id>', methods=['GET'])
+def get_user(user_id):
+    conn = None
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        internal_user_id = _get_internal_user_id(cur, user_id)
+        if internal_user_id is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
+
+        user_data = _get_user_profiles(cur, [internal_user_id]).get(internal_user_id)
+        if not user_data:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
         
         return jsonify({'success': True, 'user': user_data}), 200
         
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to fetch user', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/users/<int:user_id>', methods=['PUT'])
 def update_user(user_id):
@@ -1708,6 +3500,13 @@ def update_user(user_id):
         conn = get_db_connection()
         cur = conn.cursor()
         
+        if is_data_url(picture_value):
+            # Uploads are stored as shared thumbnails; the user row keeps only their URL
+            try:
+                picture_value = store_avatar(cur, picture_value)
+            except ValueError as e:
+                return jsonify({'success': False, 'message': str(e)}), 400
+        
         if update_picture:
             cur.execute(
                 """
@@ -1741,20 +3540,11 @@ def update_user(user_id):
         )
         
         user = cur.fetchone()
-        
-        user_data = None
-        if user:
-            user_data = {
-                'userid': user[0],
-                'username': user[1],
-                'useremail': user[2],
-                'userdob': user[3].isoformat() if user[3] else None,
-                'userbio': user[4],
-                'userprofilepicture': user[5],
-                'isgoogleuser': user[6] is not None
-            }
+        user_data = _user_profile_from_row(user) if user else None
         
         conn.commit()
+        _invalidate_user_cache(user_id)
+        _invalidate_response_cache(f'profile:{user_id}')
         
         return jsonify({
             'success': True,
@@ -1766,9 +3556,6 @@ def update_user(user_id):
         if conn: conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to update profile', 'error': str(e)}), 500
-    
-    finally:
-        if conn: conn.close()
 
 @app.route('/api/users/<int:user_id>/password', methods=['PUT'])
 def change_password(user_id):
@@ -1820,10 +3607,6 @@ def change_password(user_id):
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to change password', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/api/users/<int:user_id>', methods=['DELETE'])
 def delete_user(user_id):
@@ -1833,12 +3616,12 @@ def delete_user(user_id):
         conn = get_db_connection()
         cur = conn.cursor()
         
-        cur.execute("SELECT UserName FROM Users WHERE UserId = %s", (user_id,))
+        cur.execute("SELECT UserName, GoogleId FROM Users WHERE UserId = %s", (user_id,))
         user_to_delete = cur.fetchone()
         
         if not user_to_delete:
             return jsonify({'success': False, 'message': 'User not found'}), 404
-        deleted_user_name = user_to_delete[0]
+        deleted_user_name, deleted_google_id = user_to_delete
 
         cur.execute(
             """
@@ -1850,15 +3633,19 @@ def delete_user(user_id):
         )
         creator_ids = [row[0] for row in cur.fetchall()]
 
-        notification_title = "Team Member Left"
-        notification_message = f"User '{deleted_user_name}' has deleted their account and has been removed from your team(s)."
+        enqueue_event(cur, 'member_left_team', {
+            'userIds': [creator_id for creator_id in creator_ids if creator_id != user_id], 'userName': deleted_user_name
+        }, idempotency_key=f'member_left_team:{user_id}')
         
-        for creator_id in creator_ids:
-            if creator_id != user_id:
-                cur.execute(
-                    "INSERT INTO Notifications (UserId, Type, Title, Message) VALUES (%s, 'member_left_team', %s, %s)",
-                    (creator_id, notification_title, notification_message)
-                )
+        cur.execute(
+            """
+            UPDATE TeamMeeting SET UpdatedAt = CURRENT_TIMESTAMP
+            WHERE TeamMeetingId IN (SELECT MeetingId FROM MeetingInvitations WHERE UserId = %s)
+            RETURNING TeamMeetingId
+            """,
+            (user_id,)
+        )
+        invited_meeting_ids = [row[0] for row in cur.fetchall()]
         
         cur.execute(
             """
@@ -1882,11 +3669,27 @@ def delete_user(user_id):
             """
             DELETE FROM TeamMeeting 
             WHERE TeamId IN (SELECT TeamId FROM Team WHERE CreatedByUserId = %s)
+            RETURNING TeamMeetingId, TeamId
             """,
             (user_id,)
         )
-        
-        cur.execute("DELETE FROM TeamMembers WHERE UserId = %s", (user_id,))
+        deleted_meetings = cur.fetchall()
+        if deleted_meetings:
+            cur.execute(
+                "SELECT TeamId, UserId FROM TeamMembers WHERE TeamId = ANY(%s) AND UserId <> %s",
+                (list({row[1] for row in deleted_meetings}), user_id)
+            )
+            members_by_team = {}
+            for team_id, member_id in cur.fetchall():
+                members_by_team.setdefault(team_id, []).append(member_id)
+            _record_deletions(cur, 'meeting', [
+                (member_id, meeting_id)
+                for meeting_id, team_id in deleted_meetings
+                for member_id in members_by_team.get(team_id, [])
+            ])
+        
+        cur.execute("DELETE FROM TeamMembers WHERE UserId = %s RETURNING TeamId", (user_id,))
+        member_team_ids = [row[0] for row in cur.fetchall()]
         
         cur.execute("DELETE FROM Team WHERE CreatedByUserId = %s", (user_id,))
         
@@ -1897,6 +3700,12 @@ def delete_user(user_id):
         cur.execute("DELETE FROM Users WHERE UserId = %s", (user_id,))
         
         conn.commit()
+        _invalidate_user_cache(user_id, deleted_google_id)
+        _invalidate_response_cache(
+            f'user:{user_id}', f'profile:{user_id}',
+            *(f'team:{team_id}' for team_id in member_team_ids),
+            *(f'meeting:{meeting_id}' for meeting_id in invited_meeting_ids)
+        )
         
         return jsonify({
             'success': True,
@@ -1908,10 +3717,40 @@ def delete_user(user_id):
             conn.rollback()
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to delete account', 'error': str(e)}), 500
-    
-    finally:
-        if conn:
-            conn.close()
+
+@app.route('/api/users/batch', methods=['POST'])
+def get_users_batch():
+    """
+    Resolve many users at once from {"userIds": [...], "emails": [...], "googleIds": [...]}
+    (up to USER_BATCH_MAX values in total). Returns their profiles plus, per kind of key,
+    which values were found (value -> UserId) and which are missing.
+    """
+    data = request.get_json(silent=True) or {}
+    user_ids = data.get('userIds') or []
+    emails = data.get('emails') or []
+    google_ids = data.get('googleIds') or []
+
+    if not all(isinstance(values, list) for values in (user_ids, emails, google_ids)):
+        return jsonify({'success': False, 'message': 'userIds, emails and googleIds must be lists'}), 400
+    if len(user_ids) + len(emails) + len(google_ids) > USER_BATCH_MAX:
+        return jsonify({'success': False, 'message': f'At most {USER_BATCH_MAX} lookups per request'}), 400
+
+    emails = [email.strip() for email in emails if isinstance(email, str)]
+    google_ids = [str(google_id) for google_id in google_ids if google_id]
+
+    try:
+        cur = get_db_connection().cursor()
+        profiles, found, missing = _resolve_users(cur, user_ids, emails, google_ids)
+        return jsonify({
+            'success': True,
+            'users': list(profiles.values()),
+            'found': found,
+            'missing': missing
+        }), 200
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({'success': False, 'message': 'Failed to fetch users', 'error': str(e)}), 500
 
 @app.route('/api/users/by-email/<email>', methods=['GET'])
 def get_user_by_email(email):
@@ -1935,15 +3774,8 @@ def get_user_by_email(email):
         if not user:
             return jsonify({'success': False, 'message': 'User not found'}), 404
         
-        user_data = {
-            'userid': user[0],
-            'username': user[1],
-            'useremail': user[2],
-            'userdob': user[3].isoformat() if user[3] else None,
-            'userbio': user[4],
-            'userprofilepicture': user[5],
-            'isgoogleuser': user[6] is not None
-        }
+        user_data = _user_profile_from_row(user)
+        user_profile_cache.set(user[0], dict(user_data))
         
         return jsonify({
             'success': True,
@@ -1953,10 +3785,121 @@ def get_user_by_email(email):
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({'success': False, 'message': 'Failed to fetch user', 'error': str(e)}), 500
-    
-    finally:
+
+def stats_endpoint(view):
+    """Answer 404 unless STATS_ENDPOINTS is enabled, so operational stats stay off the public API by default"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not STATS_ENDPOINTS:
+            return jsonify({'success': False, 'message': 'Not found'}), 404
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/api/db/pool-stats', methods=['GET'])
+@stats_endpoint
+def get_pool_stats():
+    """Expose connection pool statistics for the current worker process"""
+    return jsonify({'success': True, 'pool': get_pool().stats()}), 200
+
+@app.route('/api/cache/stats', methods=['GET'])
+@stats_endpoint
+def get_cache_stats():
+    """Expose hit/miss counters of this worker's caches"""
+    return jsonify({
+        'success': True,
+        'googleIds': google_id_cache.stats(),
+        'profiles': user_profile_cache.stats(),
+        'responses': response_cache.stats() if response_cache else None
+    }), 200
+
+@app.route('/api/outbox/stats', methods=['GET'])
+@stats_endpoint
+def get_outbox_stats():
+    """Expose notification outbox depth and processing lag"""
+    conn = None
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        return jsonify({'success': True, 'outbox': outbox_stats(cur)}), 200
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({'success': False, 'message': 'Failed to fetch outbox stats', 'error': str(e)}), 500
+
+def _dispatch_batch_item(item, headers):
+    """Run one GET sub-request through the app in a nested request context; returns (status, response)"""
+    path = item.get('path') if isinstance(item, dict) else None
+    if not isinstance(path, str) or not path.startswith('/api/'):
+        return 400, jsonify({'success': False, 'message': 'path must be an /api/ URL'})
+    if str(item.get('method', 'GET')).upper() != 'GET':
+        return 405, jsonify({'success': False, 'message': 'Only GET requests can be batched'})
+
+    with app.test_request_context(path, method='GET', base_url=request.host_url, headers=headers):
+        if request.url_rule is not None and request.url_rule.endpoint in BATCH_EXCLUDED_ENDPOINTS:
+            return 400, jsonify({'success': False, 'message': f'{request.path} cannot be batched'})
+        # The nested context shares g with the batch request; drop what the previous item left
+        g.pop('data_version', None)
+        g.pop('cache_tags', None)
+        response = app.full_dispatch_request()
+        try:
+            response.get_data()  # drains streamed bodies while the connection is still ours
+        finally:
+            response.close()
+        return response.status_code, response
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """
+    Run several GET requests against the API in one call. Every sub-request uses this
+    request's pooled connection inside one read-only REPEATABLE READ transaction, so all
+    results come from the same snapshot. Each item gets its own savepoint, so a failing
+    sub-request does not abort the ones after it.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('requests')
+    if not isinstance(items, list) or not items:
+        return jsonify({'success': False, 'message': 'requests must be a non-empty list'}), 400
+    if len(items) > BATCH_MAX_REQUESTS:
+        return jsonify({'success': False, 'message': f'At most {BATCH_MAX_REQUESTS} requests can be batched'}), 400
+
+    headers = {name: request.headers[name] for name in ('Cookie', 'Authorization') if name in request.headers}
+    conn = None
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        conn.rollback()
+        cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        g.batch_snapshot = True
+
+        parts = []
+        for index, item in enumerate(items):
+            cur.execute("SAVEPOINT batch_item")
+            try:
+                status, response = _dispatch_batch_item(item, headers)
+            except Exception as e:
+                print(f"Error in batch item {index}: {str(e)}")
+                status, response = 500, jsonify({'success': False, 'message': 'Request failed', 'error': str(e)})
+            cur.execute("ROLLBACK TO SAVEPOINT batch_item" if status >= 500 else "RELEASE SAVEPOINT batch_item")
+
+            item_id = item.get('id', index) if isinstance(item, dict) else index
+            body = response.get_data()
+            if not body:
+                body = b'null'
+            elif not response.is_json:
+                body = dumps(body.decode('utf-8', 'replace'))
+            parts.append(dumps({'id': item_id, 'status': status})[:-1] + b',"body":' + body + b'}')
+
+        conn.rollback()
+        return Response(b'{"success":true,"responses":[' + b','.join(parts) + b']}', mimetype='application/json')
+
+    except Exception as e:
         if conn:
-            conn.close()
+            conn.rollback()
+        print(f"Error: {str(e)}")
+        return jsonify({'success': False, 'message': 'Failed to run batch', 'error': str(e)}), 500
+    finally:
+        g.pop('batch_snapshot', None)
+        g.pop('data_version', None)
+        g.pop('cache_tags', None)
 
 if __name__ == '__main__':
     app.run(debug=False)
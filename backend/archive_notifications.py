@@ -0,0 +1,106 @@
+"""
+Retention job for the Notifications table.
+
+Moves read notifications older than NOTIFICATION_RETENTION_DAYS into
+NotificationsArchive in batches, prunes sync tombstones older than
+SYNC_TOMBSTONE_RETENTION_DAYS, drops processed outbox events older than
+OUTBOX_RETENTION_DAYS and deletes avatars no user refers to any more. Run it
+periodically, e.g. from a daily cron:
+
+    python archive_notifications.py
+"""
+import os
+
+from dotenv import load_dotenv
+
+from db import connection
+
+load_dotenv()
+
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "5000"))
+
+
+def archive_read_notifications(conn):
+    """Archive old read notifications one batch per transaction; returns the number moved"""
+    total = 0
+    while True:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            WITH moved AS (
+                DELETE FROM Notifications
+                WHERE NotificationId IN (
+                    SELECT NotificationId FROM Notifications
+                    WHERE IsRead = TRUE AND CreatedAt < CURRENT_TIMESTAMP - make_interval(days => %s)
+                    ORDER BY CreatedAt
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING NotificationId, UserId, Type, Title, Message, RelatedId, IsRead, CreatedAt
+            ), archived AS (
+                INSERT INTO NotificationsArchive (NotificationId, UserId, Type, Title, Message, RelatedId, IsRead, CreatedAt)
+                SELECT NotificationId, UserId, Type, Title, Message, RelatedId, IsRead, CreatedAt FROM moved
+                ON CONFLICT (NotificationId) DO NOTHING
+            )
+            INSERT INTO DeletedItems (UserId, EntityType, EntityId)
+            SELECT UserId, 'notification', NotificationId FROM moved
+            """,
+            (NOTIFICATION_RETENTION_DAYS, BATCH_SIZE)
+        )
+        moved = cur.rowcount
+        conn.commit()
+        total += moved
+        if moved < BATCH_SIZE:
+            return total
+
+
+def prune_sync_tombstones(conn):
+    cur = conn.cursor()
+    cur.execute(
+        "DELETE FROM DeletedItems WHERE DeletedAt < CURRENT_TIMESTAMP - make_interval(days => %s)",
+        (SYNC_TOMBSTONE_RETENTION_DAYS,)
+    )
+    pruned = cur.rowcount
+    conn.commit()
+    return pruned
+
+
+def prune_outbox(conn):
+    cur = conn.cursor()
+    cur.execute(
+        "DELETE FROM NotificationOutbox WHERE Status = 'done' AND ProcessedAt < CURRENT_TIMESTAMP - make_interval(days => %s)",
+        (OUTBOX_RETENTION_DAYS,)
+    )
+    pruned = cur.rowcount
+    conn.commit()
+    return pruned
+
+
+def prune_avatars(conn):
+    """Delete avatars no profile points to; recent ones are kept for uploads still in flight"""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        DELETE FROM Avatars a
+        WHERE a.CreatedAt < CURRENT_TIMESTAMP - INTERVAL '1 day'
+          AND NOT EXISTS (
+              SELECT 1 FROM Users u WHERE u.UserProfilePicture = '/api/avatars/' || a.Hash
+          )
+        """
+    )
+    pruned = cur.rowcount
+    conn.commit()
+    return pruned
+
+
+if __name__ == '__main__':
+    with connection() as conn:
+        archived = archive_read_notifications(conn)
+        pruned = prune_sync_tombstones(conn)
+        pruned_events = prune_outbox(conn)
+        pruned_avatars = prune_avatars(conn)
+    print(f"Archived {archived} notifications, pruned {pruned} sync tombstones, {pruned_events} outbox events "
+          f"and {pruned_avatars} unused avatars")
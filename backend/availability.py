@@ -0,0 +1,77 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+
+def merge_intervals(intervals):
+    """Merge (start, end) pairs into a sorted list of non-overlapping intervals"""
+    merged = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def working_windows(start_date, end_date, work_start, work_end):
+    """Yield the (start, end) working-hours window of each day in the inclusive date range"""
+    day = start_date
+    while day <= end_date:
+        window_start = datetime.combine(day, work_start)
+        window_end = datetime.combine(day, work_end)
+        if window_end > window_start:
+            yield window_start, window_end
+        day += timedelta(days=1)
+
+
+def free_intervals(merged_busy, windows):
+    """Subtract merged busy intervals from each window, sweeping both lists once"""
+    free = []
+    i = 0
+    for window_start, window_end in windows:
+        while i < len(merged_busy) and merged_busy[i][1] <= window_start:
+            i += 1
+        cursor = window_start
+        j = i
+        while j < len(merged_busy) and merged_busy[j][0] < window_end:
+            busy_start, busy_end = merged_busy[j]
+            if busy_start > cursor:
+                free.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            j += 1
+        if cursor < window_end:
+            free.append((cursor, window_end))
+    return free
+
+
+def _overlaps(merged, start, end):
+    """Check a slot against one member's merged intervals with a binary search"""
+    idx = bisect_right(merged, (start, datetime.max)) - 1
+    if idx >= 0 and merged[idx][1] > start:
+        return True
+    return idx + 1 < len(merged) and merged[idx + 1][0] < end
+
+
+def rank_slots(member_busy, windows, duration, step, limit):
+    """
+    Rank candidate slots of the given duration inside the working windows.
+    member_busy maps a member ID to that member's merged busy intervals.
+    Slots where everyone is free come first, then slots with the fewest
+    unavailable members; ties go to the earliest slot.
+    """
+    candidates = []
+    for window_start, window_end in windows:
+        slot_start = window_start
+        while slot_start + duration <= window_end:
+            slot_end = slot_start + duration
+            unavailable = [
+                member_id for member_id, merged in member_busy.items()
+                if _overlaps(merged, slot_start, slot_end)
+            ]
+            candidates.append((len(unavailable), slot_start, slot_end, unavailable))
+            slot_start += step
+    candidates.sort(key=lambda candidate: (candidate[0], candidate[1]))
+    return candidates[:limit]
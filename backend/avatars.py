@@ -0,0 +1,136 @@
+"""
+Content-addressed avatar store.
+
+Uploaded profile pictures arrive as data URLs. They are decoded, cropped to a
+square AVATAR_SIZE thumbnail and stored once per distinct thumbnail in the
+Avatars table, keyed by the SHA-256 of the encoded bytes. Users.UserProfilePicture
+then holds the immutable /api/avatars/<hash> URL instead of the image itself.
+
+Running this module converts pictures stored inline before the Avatars table
+existed (run it once after applying migration 009):
+
+    python avatars.py
+"""
+import base64
+import binascii
+import hashlib
+import io
+import os
+import re
+
+from dotenv import load_dotenv
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from db import connection
+
+load_dotenv()
+
+AVATAR_SIZE = int(os.getenv("AVATAR_SIZE", "256"))
+AVATAR_MAX_UPLOAD_BYTES = int(os.getenv("AVATAR_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+AVATAR_MAX_PIXELS = 40_000_000
+AVATAR_URL_PREFIX = "/api/avatars/"
+BACKFILL_BATCH_SIZE = int(os.getenv("AVATAR_BACKFILL_BATCH_SIZE", "100"))
+
+DATA_URL_PATTERN = re.compile(r'^data:(image/[\w.+-]+)?(;[^,]*)?,', re.IGNORECASE)
+HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def is_data_url(value):
+    return isinstance(value, str) and value[:5].lower() == 'data:'
+
+
+def decode_data_url(data_url):
+    """Return the bytes of a base64 image data URL; raises ValueError if it is not one"""
+    match = DATA_URL_PATTERN.match(data_url)
+    if not match or 'base64' not in (match.group(2) or '').lower():
+        raise ValueError("Profile picture must be a base64 image data URL")
+    encoded = data_url[match.end():]
+    if len(encoded) * 3 // 4 > AVATAR_MAX_UPLOAD_BYTES:
+        raise ValueError("Profile picture is too large")
+    try:
+        return base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError("Profile picture is not valid base64")
+
+
+def make_thumbnail(raw):
+    """Crop and scale an image to an AVATAR_SIZE square; returns (bytes, content type)"""
+    try:
+        image = Image.open(io.BytesIO(raw))
+        if image.width * image.height > AVATAR_MAX_PIXELS:
+            raise ValueError("Profile picture dimensions are too large")
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        image = ImageOps.fit(image, (AVATAR_SIZE, AVATAR_SIZE), Image.LANCZOS)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise ValueError("Profile picture is not a supported image")
+
+    output = io.BytesIO()
+    if has_alpha:
+        image.save(output, format='PNG', optimize=True)
+        return output.getvalue(), 'image/png'
+    image.save(output, format='JPEG', quality=85, optimize=True, progressive=True)
+    return output.getvalue(), 'image/jpeg'
+
+
+def store_avatar(cur, data_url):
+    """Store the thumbnail of an uploaded data URL and return its /api/avatars URL"""
+    data, content_type = make_thumbnail(decode_data_url(data_url))
+    avatar_hash = hashlib.sha256(data).hexdigest()
+    cur.execute(
+        """
+        INSERT INTO Avatars (Hash, ContentType, Data)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (Hash) DO NOTHING
+        """,
+        (avatar_hash, content_type, data)
+    )
+    return AVATAR_URL_PREFIX + avatar_hash
+
+
+def load_avatar(cur, avatar_hash):
+    """Return (content type, bytes) for a stored avatar, or None"""
+    if not HASH_PATTERN.match(avatar_hash):
+        return None
+    cur.execute("SELECT ContentType, Data FROM Avatars WHERE Hash = %s", (avatar_hash,))
+    row = cur.fetchone()
+    return (row[0], bytes(row[1])) if row else None
+
+
+def backfill(conn):
+    """Move inline data URL pictures into Avatars one batch per transaction; returns (converted, failed)"""
+    converted = failed = 0
+    last_user_id = 0
+    while True:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT UserId, UserProfilePicture FROM Users
+            WHERE UserId > %s AND UserProfilePicture LIKE 'data:%%'
+            ORDER BY UserId
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+            """,
+            (last_user_id, BACKFILL_BATCH_SIZE)
+        )
+        rows = cur.fetchall()
+        for user_id, picture in rows:
+            try:
+                url = store_avatar(cur, picture)
+            except ValueError as e:
+                print(f"User {user_id}: {e}; picture left as is")
+                failed += 1
+                continue
+            cur.execute("UPDATE Users SET UserProfilePicture = %s WHERE UserId = %s", (url, user_id))
+            converted += 1
+        conn.commit()
+        if len(rows) < BACKFILL_BATCH_SIZE:
+            return converted, failed
+        last_user_id = rows[-1][0]
+
+
+if __name__ == '__main__':
+    with connection() as conn:
+        converted, failed = backfill(conn)
+    print(f"Converted {converted} profile pictures, {failed} could not be read")
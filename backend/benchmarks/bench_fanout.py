@@ -0,0 +1,139 @@
+"""
+Invitation fan-out: the per-invitee statements add_team_meeting used to run against
+the bulk helpers it uses now, at 10, 100 and 1,000 invitees.
+
+Run from backend/ with DATABASE_URL pointing at any PostgreSQL database:
+
+    python benchmarks/bench_fanout.py
+
+The tables are created as TEMP tables in one transaction that is rolled back, so
+nothing is written to the database. Over a local socket each statement costs tens of
+microseconds; with a network hop to the database the gap grows with the round-trip time.
+"""
+import os
+import statistics
+import sys
+import time
+
+import psycopg2
+import psycopg2.extensions
+from dotenv import load_dotenv
+from psycopg2.extras import execute_values
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+INVITEE_COUNTS = (10, 100, 1000)
+REPEATS = 5
+TEAM_ID = 1
+MEETING_ID = 1
+
+SCHEMA = """
+    CREATE TEMP TABLE Users (
+        UserId SERIAL PRIMARY KEY, UserName TEXT, UserEmail TEXT UNIQUE, UserDOB DATE,
+        UserBio TEXT, UserProfilePicture TEXT, GoogleId TEXT
+    );
+    CREATE INDEX ON Users (LOWER(UserEmail));
+    CREATE TEMP TABLE TeamMembers (TeamId INTEGER, UserId INTEGER, PRIMARY KEY (TeamId, UserId));
+    CREATE TEMP TABLE MeetingInvitations (
+        MeetingId INTEGER, UserId INTEGER, InvitationType TEXT, Status TEXT, PRIMARY KEY (MeetingId, UserId)
+    );
+    CREATE TEMP TABLE Notifications (
+        NotificationId SERIAL PRIMARY KEY, UserId INTEGER, Type TEXT, Title TEXT, Message TEXT,
+        RelatedId INTEGER, IsRead BOOLEAN DEFAULT FALSE, CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+
+class CountingCursor(psycopg2.extensions.cursor):
+    statements = 0
+
+    def execute(self, query, params=None):
+        CountingCursor.statements += 1
+        return super().execute(query, params)
+
+
+def notification(user_id):
+    return (user_id, 'meeting_invitation', 'Meeting Invitation: Planning',
+            'You have been invited to join the meeting "Planning" in team "Benchmark"', MEETING_ID)
+
+
+def fan_out_per_row(cur, emails):
+    """The loop add_team_meeting ran before the bulk helpers"""
+    for email in emails:
+        cur.execute("SELECT UserId FROM Users WHERE UserEmail = %s", (email,))
+        user_result = cur.fetchone()
+        if user_result:
+            user_id = user_result[0]
+            cur.execute(
+                """
+                INSERT INTO TeamMembers (TeamId, UserId)
+                SELECT %s, %s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM TeamMembers WHERE TeamId = %s AND UserId = %s
+                )
+                """,
+                (TEAM_ID, user_id, TEAM_ID, user_id)
+            )
+            cur.execute(
+                "INSERT INTO MeetingInvitations (MeetingId, UserId, InvitationType, Status) VALUES (%s, %s, %s, %s)",
+                (MEETING_ID, user_id, 'request', 'pending')
+            )
+            cur.execute(
+                "INSERT INTO Notifications (UserId, Type, Title, Message, RelatedId) VALUES (%s, %s, %s, %s, %s)",
+                notification(user_id)
+            )
+
+
+def fan_out_bulk(cur, emails):
+    """The helpers add_team_meeting uses now, plus the outbox worker's one notification insert"""
+    user_ids_by_email = app._resolve_user_ids_by_email(cur, emails)
+    user_ids = [user_ids_by_email[email] for email in emails if email in user_ids_by_email]
+    app._add_team_members(cur, TEAM_ID, user_ids)
+    app._add_meeting_invitations(cur, MEETING_ID, user_ids, 'request')
+    execute_values(
+        cur,
+        "INSERT INTO Notifications (UserId, Type, Title, Message, RelatedId) VALUES %s",
+        [notification(user_id) for user_id in user_ids],
+        page_size=app.BULK_PAGE_SIZE
+    )
+
+
+def measure(cur, fan_out, emails):
+    """Median wall time in ms and the statement count of one fan-out, undone after each run"""
+    timings = []
+    for _ in range(REPEATS):
+        cur.execute("SAVEPOINT bench")
+        CountingCursor.statements = 0
+        started = time.perf_counter()
+        fan_out(cur, emails)
+        timings.append((time.perf_counter() - started) * 1000)
+        statements = CountingCursor.statements
+        cur.execute("ROLLBACK TO SAVEPOINT bench")
+    return statistics.median(timings), statements
+
+
+def main():
+    load_dotenv()
+    conn = psycopg2.connect(os.getenv("DATABASE_URL"))
+    try:
+        cur = conn.cursor(cursor_factory=CountingCursor)
+        cur.execute(SCHEMA)
+        emails = [f'invitee{i}@example.com' for i in range(max(INVITEE_COUNTS))]
+        execute_values(cur, "INSERT INTO Users (UserName, UserEmail) VALUES %s",
+                       [(email.split('@')[0], email) for email in emails])
+
+        print(f"{'invitees':>8}  {'per-row ms':>10}  {'stmts':>5}  {'bulk ms':>8}  {'stmts':>5}  {'speedup':>7}")
+        for count in INVITEE_COUNTS:
+            per_row_ms, per_row_statements = measure(cur, fan_out_per_row, emails[:count])
+            bulk_ms, bulk_statements = measure(cur, fan_out_bulk, emails[:count])
+            print(f"{count:>8}  {per_row_ms:>10.2f}  {per_row_statements:>5}  {bulk_ms:>8.2f}  {bulk_statements:>5}  "
+                  f"{per_row_ms / bulk_ms:>6.1f}x")
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
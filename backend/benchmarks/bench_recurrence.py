@@ -0,0 +1,200 @@
+"""
+Recurring activities stored as series (one row, expanded per request by
+expand_rows) against the alternative of materializing every occurrence as a row
+up to a fixed horizon.
+
+Run from backend/ with DATABASE_URL pointing at any PostgreSQL database:
+
+    python benchmarks/bench_recurrence.py
+
+Both layouts are built as TEMP tables in a transaction that is rolled back.
+Measured are the rows and disk each layout needs, the time to write all series,
+to edit one series (add an exception and move it an hour), and to read one
+user's 31-day window the way get_activities does with from/to.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, time as time_of_day, timedelta
+
+import psycopg2
+from dotenv import load_dotenv
+from psycopg2.extras import execute_values
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recurrence import expand_rows, occurrences, parse_series  # noqa: E402
+
+USERS = 200
+SERIES_PER_USER = 10
+HORIZON_DAYS = 730
+FIRST_DAY = date(2026, 1, 1)
+RULES = (
+    'FREQ=DAILY', 'FREQ=DAILY;INTERVAL=2', 'FREQ=WEEKLY;BYDAY=MO,WE,FR', 'FREQ=WEEKLY',
+    'FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH', 'FREQ=MONTHLY', 'FREQ=DAILY;COUNT=30', 'FREQ=YEARLY',
+)
+READS = 200
+
+SCHEMA = """
+    CREATE TEMP TABLE Activity (
+        ActivityId SERIAL PRIMARY KEY, UserId INTEGER, ActivityTitle TEXT, ActivityDate DATE,
+        ActivityStartTime TIME, ActivityEndTime TIME, RecurrenceRule TEXT,
+        RecurrenceExceptions DATE[] NOT NULL DEFAULT '{}', RecurrenceEnd DATE
+    );
+    CREATE INDEX ON Activity (UserId, ActivityDate) WHERE RecurrenceRule IS NOT NULL;
+    CREATE TEMP TABLE ActivityOccurrence (
+        OccurrenceId SERIAL PRIMARY KEY, SeriesId INTEGER, UserId INTEGER, ActivityTitle TEXT,
+        ActivityDate DATE, ActivityStartTime TIME, ActivityEndTime TIME
+    );
+    CREATE INDEX ON ActivityOccurrence (UserId, ActivityDate);
+    CREATE INDEX ON ActivityOccurrence (SeriesId);
+"""
+
+SERIES_WINDOW_SQL = """
+    SELECT ActivityDate, ActivityStartTime, ActivityId, ActivityTitle,
+           RecurrenceRule, RecurrenceExceptions, RecurrenceEnd
+    FROM Activity
+    WHERE UserId = %s AND RecurrenceRule IS NOT NULL AND ActivityDate <= %s
+      AND (RecurrenceEnd IS NULL OR RecurrenceEnd >= %s)
+"""
+MATERIALIZED_WINDOW_SQL = """
+    SELECT ActivityDate, ActivityStartTime, SeriesId, ActivityTitle
+    FROM ActivityOccurrence
+    WHERE UserId = %s AND ActivityDate BETWEEN %s AND %s
+    ORDER BY ActivityDate, ActivityStartTime, SeriesId
+"""
+
+
+def make_series(generator):
+    series = []
+    for user_id in range(1, USERS + 1):
+        for index in range(SERIES_PER_USER):
+            start = FIRST_DAY + timedelta(days=generator.randint(0, 60))
+            rule, exceptions, last = parse_series(generator.choice(RULES), [], start)
+            hour = generator.randint(8, 17)
+            series.append((user_id, f'Series {index}', start, time_of_day(hour), time_of_day(hour, 45),
+                           rule, exceptions, last))
+    return series
+
+
+def materialize(series_id, row, horizon_end):
+    user_id, title, start, start_time, end_time, rule, exceptions, last = row
+    return [(series_id, user_id, title, day, start_time, end_time)
+            for day in occurrences(rule, start, start, horizon_end, exceptions, last)]
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    load_dotenv()
+    generator = random.Random(7)
+    horizon_end = FIRST_DAY + timedelta(days=HORIZON_DAYS)
+    conn = psycopg2.connect(os.getenv("DATABASE_URL"))
+    try:
+        cur = conn.cursor()
+        cur.execute(SCHEMA)
+        series = make_series(generator)
+
+        def write_series():
+            return execute_values(
+                cur,
+                """
+                INSERT INTO Activity (UserId, ActivityTitle, ActivityDate, ActivityStartTime, ActivityEndTime,
+                                      RecurrenceRule, RecurrenceExceptions, RecurrenceEnd)
+                VALUES %s RETURNING ActivityId
+                """,
+                series, template="(%s, %s, %s, %s, %s, %s, %s::date[], %s)", page_size=1000, fetch=True
+            )
+
+        def write_materialized(series_ids):
+            rows = [occurrence for (series_id,), row in zip(series_ids, series)
+                    for occurrence in materialize(series_id, row, horizon_end)]
+            execute_values(
+                cur,
+                """
+                INSERT INTO ActivityOccurrence (SeriesId, UserId, ActivityTitle, ActivityDate,
+                                                ActivityStartTime, ActivityEndTime)
+                VALUES %s
+                """,
+                rows, page_size=1000
+            )
+            return len(rows)
+
+        series_write_ms, series_ids = timed(write_series)
+        materialized_write_ms, occurrence_count = timed(write_materialized, series_ids)
+        cur.execute("ANALYZE Activity; ANALYZE ActivityOccurrence")
+        cur.execute("SELECT pg_total_relation_size('Activity'), pg_total_relation_size('ActivityOccurrence')")
+        series_bytes, materialized_bytes = cur.fetchone()
+
+        # Edit one series: skip one date and move it an hour later
+        series_id, row = series_ids[0][0], series[0]
+        skipped = next(iter(occurrences(row[5], row[2], row[2] + timedelta(days=7), horizon_end, row[6], row[7])))
+        moved = (time_of_day(row[3].hour + 1), time_of_day(row[4].hour + 1))
+
+        def edit_series():
+            cur.execute(
+                """
+                UPDATE Activity
+                SET RecurrenceExceptions = array_append(RecurrenceExceptions, %s),
+                    ActivityStartTime = %s, ActivityEndTime = %s
+                WHERE ActivityId = %s
+                """,
+                (skipped, *moved, series_id)
+            )
+
+        def edit_materialized():
+            cur.execute("DELETE FROM ActivityOccurrence WHERE SeriesId = %s", (series_id,))
+            edited = row[:3] + moved + (row[5], row[6] + [skipped], row[7])
+            execute_values(
+                cur,
+                """
+                INSERT INTO ActivityOccurrence (SeriesId, UserId, ActivityTitle, ActivityDate,
+                                                ActivityStartTime, ActivityEndTime)
+                VALUES %s
+                """,
+                materialize(series_id, edited, horizon_end), page_size=1000
+            )
+
+        series_edit_ms, _ = timed(edit_series)
+        materialized_edit_ms, _ = timed(edit_materialized)
+
+        def read_series(user_id, window_start, window_end):
+            cur.execute(SERIES_WINDOW_SQL, (user_id, window_end, window_start))
+            return sorted(expand_rows(cur.fetchall(), (0,), 4, window_start, window_end),
+                          key=lambda row: (row[0], row[1], row[2]))
+
+        def read_materialized(user_id, window_start, window_end):
+            cur.execute(MATERIALIZED_WINDOW_SQL, (user_id, window_start, window_end))
+            return cur.fetchall()
+
+        reads = []
+        for _ in range(READS):
+            window_start = FIRST_DAY + timedelta(days=generator.randint(0, HORIZON_DAYS - 31))
+            reads.append((generator.randint(1, USERS), window_start, window_start + timedelta(days=30)))
+        series_read_ms = statistics.median(timed(read_series, *read)[0] for read in reads)
+        materialized_read_ms = statistics.median(timed(read_materialized, *read)[0] for read in reads)
+        # Same occurrences either way (the edited series aside)
+        for read in reads:
+            if read[0] != series[0][0]:
+                assert [r[:4] for r in read_series(*read)] == [r[:4] for r in read_materialized(*read)]
+
+        print(f"{len(series)} series ({USERS} users x {SERIES_PER_USER}), materialized {HORIZON_DAYS} days ahead")
+        print(f"{'':<24}  {'series':>10}  {'materialized':>12}")
+        print(f"{'rows':<24}  {len(series):>10}  {occurrence_count:>12}")
+        print(f"{'table + indexes MB':<24}  {series_bytes / 2 ** 20:>10.2f}  {materialized_bytes / 2 ** 20:>12.2f}")
+        print(f"{'write all ms':<24}  {series_write_ms:>10.1f}  {materialized_write_ms:>12.1f}")
+        print(f"{'edit one series ms':<24}  {series_edit_ms:>10.2f}  {materialized_edit_ms:>12.2f}")
+        print(f"{'31-day read ms (median)':<24}  {series_read_ms:>10.3f}  {materialized_read_ms:>12.3f}")
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Serializing 10,000 activity rows: the per-row dict building and jsonify that
+get_activities used before, against ACTIVITY_ENCODER and json_response.
+
+Run from backend/ (no database needed):
+
+    python benchmarks/bench_serialization.py
+
+Build is turning the rows into dicts, dump is producing the response body.
+Both paths are checked to produce the same JSON before timing.
+"""
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, time as time_of_day, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from flask import jsonify  # noqa: E402
+from serialization import json_response  # noqa: E402
+
+ROW_COUNT = 10000
+REPEATS = 7
+
+
+def make_rows(count):
+    """Rows shaped like SELECT ActivityId, ..., RecurrenceRule, RecurrenceExceptions FROM Activity"""
+    first_day = date(2026, 1, 1)
+    return [
+        (
+            activity_id, f'Activity {activity_id}', 'Prepare the weekly report' if activity_id % 3 else None,
+            'work', 'high' if activity_id % 5 == 0 else 'medium', first_day + timedelta(days=activity_id % 365),
+            time_of_day(9 + activity_id % 8, 30), time_of_day(10 + activity_id % 8, 15), None, []
+        )
+        for activity_id in range(1, count + 1)
+    ]
+
+
+def build_dicts(rows):
+    """The loop get_activities ran before RowEncoder"""
+    activities = []
+    for row in rows:
+        activities.append({
+            'activityid': row[0],
+            'activitytitle': row[1],
+            'activitydescription': row[2],
+            'activitycategory': row[3],
+            'activityurgency': row[4],
+            'activitydate': row[5].isoformat() if row[5] else None,
+            'activitystarttime': app.format_time_to_hhmm(row[6]),
+            'activityendtime': app.format_time_to_hhmm(row[7]),
+            'activityrecurrence': row[8],
+            'activityexceptiondates': [day.isoformat() for day in row[9]]
+        })
+    return activities
+
+
+def old_path(rows):
+    activities = build_dicts(rows)
+    built = time.perf_counter()
+    body = jsonify({'success': True, 'activities': activities}).get_data()
+    return built, body
+
+
+def new_path(rows):
+    activities = app.ACTIVITY_ENCODER.many(rows)
+    built = time.perf_counter()
+    body = json_response({'success': True, 'activities': activities}).get_data()
+    return built, body
+
+
+def measure(path, rows):
+    """Median build and dump times in ms"""
+    builds, dumps = [], []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        built, _ = path(rows)
+        finished = time.perf_counter()
+        builds.append((built - started) * 1000)
+        dumps.append((finished - built) * 1000)
+    return statistics.median(builds), statistics.median(dumps)
+
+
+def main():
+    rows = make_rows(ROW_COUNT)
+    with app.app.app_context():
+        assert json.loads(old_path(rows)[1]) == json.loads(new_path(rows)[1])
+        print(f"{ROW_COUNT} rows, median of {REPEATS}")
+        print(f"{'path':<28}  {'build ms':>8}  {'dump ms':>8}  {'total ms':>8}")
+        totals = {}
+        for name, path in (('dict loop + jsonify', old_path), ('RowEncoder + json_response', new_path)):
+            build_ms, dump_ms = measure(path, rows)
+            totals[name] = build_ms + dump_ms
+            print(f"{name:<28}  {build_ms:>8.2f}  {dump_ms:>8.2f}  {totals[name]:>8.2f}")
+        print(f"speedup: {totals['dict loop + jsonify'] / totals['RowEncoder + json_response']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Peak RSS of GET /api/activities as the number of rows grows, with the list built
+by fetchall(), with STREAM_RESPONSES, and with STREAM_RESPONSES behind the
+response cache (which must pass streamed responses through unread).
+
+Run from backend/ with DATABASE_URL pointing at any PostgreSQL database:
+
+    python benchmarks/bench_streaming_rss.py
+
+Every measurement runs in a fresh process against a TEMP Activity table, so
+nothing is written to the database. The response body is read chunk by chunk
+and discarded, the way a WSGI server sends it. Reported is the growth of peak
+RSS over the process's own baseline after setup; 0.0 means the request never
+went above the peak the process had already reached while starting up.
+"""
+import os
+import resource
+import subprocess
+import sys
+
+ROW_COUNTS = (25000, 100000, 400000)
+MODES = ('fetchall', 'stream', 'stream+cache')
+
+SCHEMA = """
+    CREATE TEMP TABLE UserDataVersion (UserId INTEGER PRIMARY KEY, Version BIGINT NOT NULL DEFAULT 0);
+    CREATE TEMP TABLE Activity (
+        ActivityId SERIAL PRIMARY KEY, UserId INTEGER, ActivityTitle TEXT, ActivityDescription TEXT,
+        ActivityCategory TEXT, ActivityUrgency TEXT, ActivityDate DATE, ActivityStartTime TIME,
+        ActivityEndTime TIME, RecurrenceRule TEXT, RecurrenceExceptions DATE[] NOT NULL DEFAULT '{}',
+        RecurrenceEnd DATE
+    );
+    INSERT INTO Activity (UserId, ActivityTitle, ActivityDescription, ActivityCategory, ActivityUrgency,
+                          ActivityDate, ActivityStartTime, ActivityEndTime)
+    SELECT 1, 'Activity ' || i, 'Prepare the weekly report for the planning meeting', 'work', 'medium',
+           DATE '2026-01-01' + i %% 365, TIME '09:00' + (i %% 480) * INTERVAL '1 minute',
+           TIME '10:00' + (i %% 480) * INTERVAL '1 minute'
+    FROM generate_series(1, %s) AS i;
+"""
+
+
+def peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(mode, row_count):
+    """Runs in the child process: prints the peak RSS growth in KB while serving row_count activities"""
+    import psycopg2
+    from dotenv import load_dotenv
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import app
+    from response_cache import MemoryBackend, ResponseCache
+
+    load_dotenv()
+    conn = psycopg2.connect(os.getenv("DATABASE_URL"))
+    conn.cursor().execute(SCHEMA, (row_count,))
+    conn.commit()
+
+    app.get_db_connection = lambda: conn
+    app.STREAM_RESPONSES = mode != 'fetchall'
+    app.response_cache = ResponseCache(MemoryBackend()) if mode == 'stream+cache' else None
+    client = app.app.test_client()
+
+    def fetch(user_id):
+        response = client.get(f'/api/activities?userId={user_id}', buffered=False)
+        size = sum(len(chunk) for chunk in response.iter_encoded())
+        response.close()
+        conn.rollback()
+        return size
+
+    # Warm up every code path on a user without activities, so the baseline excludes imports and caches
+    fetch(2)
+    baseline = peak_rss_kb()
+    size = fetch(1)
+    print(peak_rss_kb() - baseline, size)
+
+
+def main():
+    print(f"{'rows':>8}  " + "  ".join(f"{mode + ' MB':>15}" for mode in MODES) + f"  {'body MB':>8}")
+    for row_count in ROW_COUNTS:
+        cells = []
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, mode, str(row_count)], check=True, capture_output=True, text=True
+            ).stdout.split()
+            growth_kb, body_bytes = int(output[-2]), int(output[-1])
+            cells.append(f"{growth_kb / 1024:>15.1f}")
+        print(f"{row_count:>8}  " + "  ".join(cells) + f"  {body_bytes / 2 ** 20:>8.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], int(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,358 @@
+"""
+Parsers and writers for bulk activity import and calendar export.
+
+Parsers take an iterable of text lines and yield (row number, record) pairs,
+where a record maps the activity* field names used by POST /api/activities to
+raw values, or (row number, error message) for input that could not be read.
+validate_activity() turns a record into the column tuple that is loaded into
+Activity. Writers take export rows (EXPORT_COLUMNS order) and yield text
+chunks, so an export can be streamed without holding it in memory.
+"""
+import csv
+import io
+import json
+import re
+from datetime import date, datetime, timedelta
+
+from serialization import dumps
+
+ACTIVITY_KEYS = (
+    'activityTitle', 'activityDescription', 'activityCategory', 'activityUrgency',
+    'activityDate', 'activityStartTime', 'activityEndTime'
+)
+# CSV headers and NDJSON keys are matched case-insensitively; the export's own
+# column names are accepted so that exported activities can be imported again.
+FIELD_ALIASES = {key.lower(): key for key in ACTIVITY_KEYS}
+FIELD_ALIASES.update({
+    'title': 'activityTitle',
+    'description': 'activityDescription',
+    'category': 'activityCategory',
+    'urgency': 'activityUrgency',
+    'date': 'activityDate',
+    'startdate': 'activityDate',
+    'starttime': 'activityStartTime',
+    'endtime': 'activityEndTime',
+})
+
+URGENCIES = ('low', 'medium', 'high', 'urgent')
+# RFC 5545 PRIORITY: 1 is highest, 9 lowest, 0 undefined
+URGENCY_TO_PRIORITY = {'urgent': 1, 'high': 3, 'medium': 5, 'low': 9}
+
+EXPORT_COLUMNS = (
+    'type', 'id', 'parentid', 'parenttitle', 'title', 'description', 'category', 'urgency',
+    'progress', 'startdate', 'enddate', 'starttime', 'endtime', 'recurrence', 'exceptiondates'
+)
+
+
+def _normalize(record):
+    if not isinstance(record, dict):
+        raise ValueError("Expected an object")
+    if record.get('type') not in (None, '', 'activity'):
+        raise ValueError(f"Only activities can be imported, got type '{record['type']}'")
+    normalized = {}
+    for key, value in record.items():
+        field = FIELD_ALIASES.get(str(key).strip().lower())
+        if field:
+            normalized[field] = value.strip() if isinstance(value, str) else value
+    return normalized
+
+
+def parse_ndjson(lines):
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, _normalize(json.loads(line))
+        except ValueError as e:
+            yield number, str(e)
+
+
+def parse_csv(lines):
+    reader = csv.DictReader(lines)
+    for record in reader:
+        number = reader.line_num
+        if None in record:
+            yield number, "Row has more fields than the header"
+            continue
+        try:
+            yield number, _normalize(record)
+        except ValueError as e:
+            yield number, str(e)
+
+
+def _unfold(lines):
+    """Join RFC 5545 folded lines (continuations start with a space or tab)"""
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _unescape_text(value):
+    result = []
+    chars = iter(value)
+    for char in chars:
+        if char == '\\':
+            escaped = next(chars, '')
+            result.append('\n' if escaped in ('n', 'N') else escaped)
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def _parse_ics_datetime(value):
+    """Return (date, time or None); UTC and TZID times are taken as wall-clock times"""
+    value = value.strip().rstrip('Z')
+    if 'T' in value:
+        moment = datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+        return moment.date(), moment.time()
+    return datetime.strptime(value[:8], '%Y%m%d').date(), None
+
+
+def _priority_to_urgency(value):
+    priority = int(value)
+    if priority == 0:
+        return None
+    if priority <= 2:
+        return 'urgent'
+    if priority <= 4:
+        return 'high'
+    if priority == 5:
+        return 'medium'
+    return 'low'
+
+
+def parse_ics(lines):
+    """
+    Read the VEVENTs of an iCalendar file; rows are numbered by event.
+    Only the first occurrence of a recurring event is imported, and an end time
+    on a later day than the start is dropped, since activities span one day.
+    """
+    number = 0
+    event = None
+    for line in _unfold(lines):
+        name_params, _, value = line.partition(':')
+        name = name_params.split(';', 1)[0].upper()
+        if name == 'BEGIN' and value.upper() == 'VEVENT':
+            number += 1
+            event = {}
+        elif name == 'END' and value.upper() == 'VEVENT' and event is not None:
+            try:
+                record = {
+                    'activityTitle': event.get('SUMMARY'),
+                    'activityDescription': event.get('DESCRIPTION'),
+                    'activityCategory': event['CATEGORIES'].split(',')[0].strip().lower() if event.get('CATEGORIES') else None,
+                    'activityUrgency': _priority_to_urgency(event['PRIORITY']) if event.get('PRIORITY') else None,
+                }
+                if not event.get('DTSTART'):
+                    raise ValueError("DTSTART is required")
+                start_date, start_time = _parse_ics_datetime(event['DTSTART'])
+                record['activityDate'] = start_date.isoformat()
+                record['activityStartTime'] = start_time.strftime('%H:%M') if start_time else None
+                if start_time and event.get('DTEND'):
+                    end_date, end_time = _parse_ics_datetime(event['DTEND'])
+                    if end_date == start_date and end_time:
+                        record['activityEndTime'] = end_time.strftime('%H:%M')
+                yield number, record
+            except ValueError as e:
+                yield number, str(e)
+            event = None
+        elif event is not None and name not in event:
+            event[name] = value if name in ('DTSTART', 'DTEND', 'PRIORITY') else _unescape_text(value)
+
+
+PARSERS = {
+    'ndjson': parse_ndjson,
+    'csv': parse_csv,
+    'ics': parse_ics,
+}
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'ics': 'text/calendar',
+}
+
+
+def _parse_time(value):
+    for fmt in ('%H:%M', '%H:%M:%S'):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid time '{value}', expected HH:MM")
+
+
+def validate_activity(record):
+    """
+    Check an imported record; returns (title, description, category, urgency, date,
+    start time, end time) or raises ValueError describing the first problem found.
+    """
+    title = record.get('activityTitle')
+    if not title:
+        raise ValueError("activityTitle is required")
+    raw_date = record.get('activityDate')
+    if not raw_date:
+        raise ValueError("activityDate is required")
+    try:
+        activity_date = datetime.strptime(str(raw_date)[:10], '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"Invalid activityDate '{raw_date}', expected YYYY-MM-DD")
+
+    urgency = record.get('activityUrgency') or None
+    if urgency is not None:
+        urgency = str(urgency).lower()
+        if urgency not in URGENCIES:
+            raise ValueError(f"Invalid activityUrgency '{urgency}'")
+
+    start_time = _parse_time(str(record['activityStartTime'])) if record.get('activityStartTime') else None
+    end_time = _parse_time(str(record['activityEndTime'])) if record.get('activityEndTime') else None
+    if start_time and end_time and end_time <= start_time:
+        raise ValueError("activityEndTime must be after activityStartTime")
+
+    return (
+        str(title),
+        record.get('activityDescription') or None,
+        record.get('activityCategory') or None,
+        urgency,
+        activity_date,
+        start_time,
+        end_time,
+    )
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def copy_buffer(rows):
+    """Encode rows in COPY text format for cursor.copy_expert"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+
+def _export_record(row):
+    record = dict(zip(EXPORT_COLUMNS, row))
+    for key in ('starttime', 'endtime'):
+        if record[key] is not None:
+            record[key] = record[key].strftime('%H:%M')
+    record['exceptiondates'] = ','.join(day.isoformat() for day in record['exceptiondates'] or ()) or None
+    return record
+
+
+def write_ndjson(rows):
+    for row in rows:
+        yield dumps(_export_record(row)).decode() + '\n'
+
+
+def write_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        record = _export_record(row)
+        writer.writerow([record[column] for column in EXPORT_COLUMNS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _escape_text(value):
+    return (str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line):
+    """Fold a content line at 75 octets as RFC 5545 requires"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _ics_event(record, stamp):
+    start_date, end_date = record['startdate'], record['enddate'] or record['startdate']
+    if record['type'] == 'timeline':
+        summary = f"{record['parenttitle']}: {record['title']}"
+    elif record['type'] == 'meeting':
+        summary = f"{record['title']} ({record['parenttitle']})"
+    else:
+        summary = record['title']
+
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:{record['type']}-{record['id']}@planit",
+        f'DTSTAMP:{stamp}',
+    ]
+    timed = record['starttime'] and record['endtime'] and start_date == end_date
+    if timed:
+        day = start_date.strftime('%Y%m%d')
+        start_suffix = f"T{record['starttime'].replace(':', '')}00"
+        lines.append(f"DTSTART:{day}{start_suffix}")
+        lines.append(f"DTEND:{day}T{record['endtime'].replace(':', '')}00")
+    else:
+        # All-day events end on the following day (DTEND is exclusive)
+        lines.append(f"DTSTART;VALUE=DATE:{start_date.strftime('%Y%m%d')}")
+        lines.append(f"DTEND;VALUE=DATE:{(end_date + timedelta(days=1)).strftime('%Y%m%d')}")
+    if record['recurrence']:
+        rule = record['recurrence']
+        if timed:
+            # UNTIL must have the same value type as DTSTART
+            rule = re.sub(r'UNTIL=(\d{8})\b', r'UNTIL=\1T235959', rule)
+        lines.append(f'RRULE:{rule}')
+        if record['exceptiondates']:
+            exceptions = [day.replace('-', '') for day in record['exceptiondates'].split(',')]
+            if timed:
+                lines.append('EXDATE:' + ','.join(day + start_suffix for day in exceptions))
+            else:
+                lines.append('EXDATE;VALUE=DATE:' + ','.join(exceptions))
+    lines.append(f'SUMMARY:{_escape_text(summary or "")}')
+    if record['description']:
+        lines.append(f"DESCRIPTION:{_escape_text(record['description'])}")
+    if record['category']:
+        lines.append(f"CATEGORIES:{_escape_text(record['category'])}")
+    if record['urgency'] in URGENCY_TO_PRIORITY:
+        lines.append(f"PRIORITY:{URGENCY_TO_PRIORITY[record['urgency']]}")
+    lines.append('END:VEVENT')
+    return ''.join(_fold(line) for line in lines)
+
+
+def write_ics(rows):
+    """Write dated rows as VEVENTs; goals themselves have no dates and are left out"""
+    stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+    yield 'BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//PlanIt//Calendar Export//EN\r\nCALSCALE:GREGORIAN\r\n'
+    for row in rows:
+        record = _export_record(row)
+        if isinstance(record['startdate'], date):
+            yield _ics_event(record, stamp)
+    yield 'END:VCALENDAR\r\n'
+
+
+WRITERS = {
+    'ndjson': write_ndjson,
+    'csv': write_csv,
+    'ics': write_ics,
+}
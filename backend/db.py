@@ -0,0 +1,219 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.pool import PoolError
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+    Connections are health checked when checked out and recycled once they
+    are older than max_age seconds. A pool belongs to the process that created
+    it; see get_pool() for how forked gunicorn workers get their own.
+    """
+
+    def __init__(self, dsn, min_size=1, max_size=10, max_age=1800,
+                 timeout=10, health_check_interval=30):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Invalid pool size configuration")
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_age = max_age
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.pid = os.getpid()
+
+        self._lock = threading.Condition()
+        self._idle = []  # (conn, created_at, last_used_at)
+        self._created_at = {}  # id(conn) -> created_at
+        self._in_use = 0
+        self._closed = False
+        self._stats = {
+            'checkouts': 0,
+            'connectionsCreated': 0,
+            'connectionsRecycled': 0,
+            'failedHealthChecks': 0,
+            'waits': 0,
+            'timeouts': 0,
+        }
+
+        for _ in range(min_size):
+            conn = self._connect()
+            self._idle.append((conn, self._created_at[id(conn)], time.monotonic()))
+
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn)
+        with self._lock:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats['connectionsCreated'] += 1
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _health_problem(self, conn, created_at, last_used_at):
+        """
+        Return None for a usable connection, otherwise the stats counter to bump ('' for none).
+        Runs without the pool lock, since the SELECT 1 probe can block on a dead server.
+        """
+        if conn.closed:
+            return ''
+        now = time.monotonic()
+        if self.max_age and now - created_at > self.max_age:
+            return 'connectionsRecycled'
+        if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            return ''
+        if now - last_used_at >= self.health_check_interval:
+            try:
+                cur = conn.cursor()
+                cur.execute("SELECT 1")
+                cur.close()
+                conn.rollback()
+            except Exception:
+                return 'failedHealthChecks'
+        return None
+
+    def _reserve(self, deadline):
+        """
+        Take a slot, waiting until `deadline`; returns an idle (conn, created_at, last_used_at)
+        entry to reuse, or None when the caller should open a new connection.
+        """
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise PoolError("Connection pool is closed")
+                if self._idle:
+                    self._in_use += 1
+                    return self._idle.pop()
+                if self._in_use < self.max_size:
+                    self._in_use += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolError("Timed out waiting for a database connection")
+                self._stats['waits'] += 1
+                self._lock.wait(remaining)
+
+    def _release_slot(self):
+        with self._lock:
+            self._in_use -= 1
+            self._lock.notify()
+
+    def getconn(self):
+        """Check out a healthy connection, waiting up to `timeout` seconds for a free slot."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            entry = self._reserve(deadline)
+            if entry is None:
+                break
+            # The slot stays reserved while the idle connection is checked outside the lock
+            problem = self._health_problem(*entry)
+            if problem is None:
+                with self._lock:
+                    self._stats['checkouts'] += 1
+                return entry[0]
+            if problem:
+                with self._lock:
+                    self._stats[problem] += 1
+            self._discard(entry[0])
+            self._release_slot()
+
+        # Open the new connection outside the lock so a slow handshake
+        # does not block other threads returning connections.
+        try:
+            conn = self._connect()
+        except Exception:
+            self._release_slot()
+            raise
+        with self._lock:
+            self._stats['checkouts'] += 1
+        return conn
+
+    def putconn(self, conn):
+        """Return a connection to the pool, rolling back anything left uncommitted."""
+        keep = not conn.closed
+        if keep and conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except Exception:
+                keep = False
+        with self._lock:
+            self._in_use -= 1
+            created_at = self._created_at.get(id(conn))
+            if keep and not self._closed and created_at is not None:
+                self._idle.append((conn, created_at, time.monotonic()))
+            else:
+                self._discard(conn)
+            self._lock.notify()
+
+    def closeall(self):
+        with self._lock:
+            self._closed = True
+            for conn, _, _ in self._idle:
+                self._discard(conn)
+            self._idle = []
+            self._lock.notify_all()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pid': self.pid,
+                'minSize': self.min_size,
+                'maxSize': self.max_size,
+                'maxAge': self.max_age,
+                'idle': len(self._idle),
+                'inUse': self._in_use,
+                **self._stats,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Return the pool for the current process, creating it on first use.
+    A pool inherited through fork (e.g. gunicorn --preload) is dropped without
+    closing its sockets, since those still belong to the parent process.
+    """
+    global _pool
+    if _pool is not None and _pool.pid == os.getpid():
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = ConnectionPool(
+                os.getenv("DATABASE_URL"),
+                min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+                max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                max_age=float(os.getenv("DB_POOL_MAX_AGE", "1800")),
+                timeout=float(os.getenv("DB_POOL_TIMEOUT", "10")),
+                health_check_interval=float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30")),
+            )
+        return _pool
+
+
+@contextmanager
+def connection():
+    """Check out a pooled connection for the duration of a with block."""
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
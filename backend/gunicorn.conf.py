@@ -0,0 +1,15 @@
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+
+# Notification streams keep HTTP connections open, so run cooperative gevent
+# workers instead of sync workers that would be tied up by idle clients.
+worker_class = "gevent"
+worker_connections = int(os.getenv("WORKER_CONNECTIONS", "1000"))
+
+
+def post_fork(server, worker):
+    # Make psycopg2 yield to the gevent hub while waiting on the database.
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
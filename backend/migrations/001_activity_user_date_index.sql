@@ -0,0 +1,4 @@
+-- Backs the date-windowed, keyset-paginated GET /api/activities.
+-- CONCURRENTLY avoids locking Activity against writes; run outside a transaction.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activity_user_date_start
+    ON Activity (UserId, ActivityDate, ActivityStartTime);
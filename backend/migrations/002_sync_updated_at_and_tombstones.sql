@@ -0,0 +1,60 @@
+-- Change tracking for GET /api/sync.
+-- UpdatedAt is set on insert by default and by the API on every UPDATE;
+-- DeletedItems records per-user tombstones for rows the API deletes.
+ALTER TABLE Activity ADD COLUMN IF NOT EXISTS UpdatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE Goal ADD COLUMN IF NOT EXISTS UpdatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE Timeline ADD COLUMN IF NOT EXISTS UpdatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE TeamMeeting ADD COLUMN IF NOT EXISTS UpdatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE MeetingInvitations ADD COLUMN IF NOT EXISTS UpdatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE Notifications ADD COLUMN IF NOT EXISTS UpdatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+CREATE TABLE IF NOT EXISTS DeletedItems (
+    DeletedItemId BIGSERIAL PRIMARY KEY,
+    UserId INTEGER NOT NULL,
+    EntityType VARCHAR(20) NOT NULL,
+    EntityId INTEGER NOT NULL,
+    DeletedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Sync cursors are ordered by commit, not by clock: ChangeXid is the transaction that
+-- last wrote the row, and a cursor holds the oldest transaction still running when the
+-- sync read its data. A writer that commits later, however long it ran, has a ChangeXid
+-- at or above that cursor and is returned by the next sync. Needs PostgreSQL 13+ (xid8).
+ALTER TABLE Activity ADD COLUMN IF NOT EXISTS ChangeXid xid8 NOT NULL DEFAULT pg_current_xact_id();
+ALTER TABLE Goal ADD COLUMN IF NOT EXISTS ChangeXid xid8 NOT NULL DEFAULT pg_current_xact_id();
+ALTER TABLE Timeline ADD COLUMN IF NOT EXISTS ChangeXid xid8 NOT NULL DEFAULT pg_current_xact_id();
+ALTER TABLE TeamMeeting ADD COLUMN IF NOT EXISTS ChangeXid xid8 NOT NULL DEFAULT pg_current_xact_id();
+ALTER TABLE MeetingInvitations ADD COLUMN IF NOT EXISTS ChangeXid xid8 NOT NULL DEFAULT pg_current_xact_id();
+ALTER TABLE Notifications ADD COLUMN IF NOT EXISTS ChangeXid xid8 NOT NULL DEFAULT pg_current_xact_id();
+ALTER TABLE DeletedItems ADD COLUMN IF NOT EXISTS ChangeXid xid8 NOT NULL DEFAULT pg_current_xact_id();
+
+-- Inserts get ChangeXid from the default; updates from any writer restamp it here.
+CREATE OR REPLACE FUNCTION set_change_xid() RETURNS trigger AS $$
+BEGIN
+    NEW.ChangeXid := pg_current_xact_id();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    table_name TEXT;
+BEGIN
+    FOREACH table_name IN ARRAY ARRAY['activity', 'goal', 'timeline', 'teammeeting', 'meetinginvitations', 'notifications']
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', table_name || '_change_xid', table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I BEFORE UPDATE ON %I FOR EACH ROW EXECUTE FUNCTION set_change_xid()',
+            table_name || '_change_xid', table_name
+        );
+    END LOOP;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_deleteditems_user_deleted ON DeletedItems (UserId, DeletedAt);
+CREATE INDEX IF NOT EXISTS idx_deleteditems_user_change ON DeletedItems (UserId, ChangeXid);
+CREATE INDEX IF NOT EXISTS idx_activity_user_change ON Activity (UserId, ChangeXid);
+CREATE INDEX IF NOT EXISTS idx_goal_user_change ON Goal (UserId, ChangeXid);
+CREATE INDEX IF NOT EXISTS idx_timeline_goal_change ON Timeline (GoalId, ChangeXid);
+CREATE INDEX IF NOT EXISTS idx_meetinginvitations_meeting_change ON MeetingInvitations (MeetingId, ChangeXid);
+CREATE INDEX IF NOT EXISTS idx_notifications_user_change ON Notifications (UserId, ChangeXid);
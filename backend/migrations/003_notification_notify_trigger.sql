@@ -0,0 +1,22 @@
+-- Publish every new notification on the planit_notifications channel so the
+-- /api/notifications/stream endpoint can push it over Server-Sent Events.
+-- NOTIFY is transactional: listeners only hear about committed rows.
+CREATE OR REPLACE FUNCTION notify_new_notification() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        'planit_notifications',
+        json_build_object(
+            'userId', NEW.UserId,
+            'notificationId', NEW.NotificationId,
+            'type', NEW.Type,
+            'title', NEW.Title
+        )::text
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notifications_notify_insert ON Notifications;
+CREATE TRIGGER notifications_notify_insert
+    AFTER INSERT ON Notifications
+    FOR EACH ROW EXECUTE FUNCTION notify_new_notification();
@@ -0,0 +1,23 @@
+-- Serves GET /api/notifications/unread-count without touching read rows.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_user_unread
+    ON Notifications (UserId) WHERE IsRead = FALSE;
+
+-- Keyset pagination on (CreatedAt, NotificationId), newest first.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_user_created
+    ON Notifications (UserId, CreatedAt DESC, NotificationId DESC);
+
+-- Read notifications past the retention period are moved here by archive_notifications.py.
+CREATE TABLE IF NOT EXISTS NotificationsArchive (
+    NotificationId INTEGER PRIMARY KEY,
+    UserId INTEGER NOT NULL,
+    Type TEXT,
+    Title TEXT,
+    Message TEXT,
+    RelatedId INTEGER,
+    IsRead BOOLEAN,
+    CreatedAt TIMESTAMP,
+    ArchivedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_notifications_read_created
+    ON Notifications (CreatedAt) WHERE IsRead = TRUE;
@@ -0,0 +1,24 @@
+-- Transactional outbox: API handlers record one event per mutation and the
+-- outbox worker (backend/outbox.py) expands it into Notifications rows.
+CREATE TABLE IF NOT EXISTS NotificationOutbox (
+    OutboxId BIGSERIAL PRIMARY KEY,
+    IdempotencyKey VARCHAR(255) NOT NULL UNIQUE,
+    EventType VARCHAR(50) NOT NULL,
+    Payload JSONB NOT NULL,
+    Status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    Attempts INTEGER NOT NULL DEFAULT 0,
+    LastError TEXT,
+    AvailableAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CreatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ProcessedAt TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_notificationoutbox_pending
+    ON NotificationOutbox (AvailableAt, OutboxId) WHERE Status = 'pending';
+
+-- Each event writes at most one notification per recipient, so a retried
+-- batch cannot duplicate rows.
+ALTER TABLE Notifications ADD COLUMN IF NOT EXISTS OutboxId BIGINT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_notifications_outbox_user
+    ON Notifications (OutboxId, UserId) WHERE OutboxId IS NOT NULL;
@@ -0,0 +1,49 @@
+-- Full-text and trigram indexes behind GET /api/search.
+-- Adding the generated columns rewrites each table once; run during a quiet period.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+-- 'simple' keeps names and non-English words intact; titles outrank descriptions.
+ALTER TABLE Activity ADD COLUMN IF NOT EXISTS SearchVector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(ActivityTitle, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(ActivityDescription, '')), 'B')
+    ) STORED;
+
+ALTER TABLE Goal ADD COLUMN IF NOT EXISTS SearchVector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(GoalTitle, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(GoalDescription, '')), 'B')
+    ) STORED;
+
+ALTER TABLE Timeline ADD COLUMN IF NOT EXISTS SearchVector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(TimelineTitle, '')), 'A')
+    ) STORED;
+
+ALTER TABLE TeamMeeting ADD COLUMN IF NOT EXISTS SearchVector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(MeetingTitle, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(MeetingDescription, '')), 'B')
+    ) STORED;
+
+-- Leading UserId (via btree_gin) keeps a search inside one user's rows.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activity_search
+    ON Activity USING GIN (UserId, SearchVector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activity_title_trgm
+    ON Activity USING GIN (UserId, ActivityTitle gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_goal_search
+    ON Goal USING GIN (UserId, SearchVector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_goal_title_trgm
+    ON Goal USING GIN (UserId, GoalTitle gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_timeline_search
+    ON Timeline USING GIN (SearchVector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_timeline_title_trgm
+    ON Timeline USING GIN (TimelineTitle gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_teammeeting_search
+    ON TeamMeeting USING GIN (TeamId, SearchVector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_teammeeting_title_trgm
+    ON TeamMeeting USING GIN (TeamId, MeetingTitle gin_trgm_ops);
@@ -0,0 +1,32 @@
+-- Time ranges behind POST /api/conflicts and the checkConflicts write flag.
+-- Untimed activities and meetings get a NULL range and never conflict; a timeline's
+-- range covers its whole days, and its daily time window is checked in the API.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE Activity ADD COLUMN IF NOT EXISTS ActivityRange tsrange
+    GENERATED ALWAYS AS (
+        CASE WHEN ActivityEndTime > ActivityStartTime
+             THEN tsrange(ActivityDate + ActivityStartTime, ActivityDate + ActivityEndTime)
+        END
+    ) STORED;
+
+ALTER TABLE Timeline ADD COLUMN IF NOT EXISTS TimelineSpan tsrange
+    GENERATED ALWAYS AS (
+        CASE WHEN TimelineEndDate >= TimelineStartDate
+             THEN tsrange(TimelineStartDate::timestamp, (TimelineEndDate + 1)::timestamp)
+        END
+    ) STORED;
+
+ALTER TABLE TeamMeeting ADD COLUMN IF NOT EXISTS MeetingRange tsrange
+    GENERATED ALWAYS AS (
+        CASE WHEN MeetingEndTime > MeetingStartTime
+             THEN tsrange(MeetingDate + MeetingStartTime, MeetingDate + MeetingEndTime)
+        END
+    ) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activity_user_range
+    ON Activity USING GIST (UserId, ActivityRange);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_timeline_goal_span
+    ON Timeline USING GIST (GoalId, TimelineSpan);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_teammeeting_team_range
+    ON TeamMeeting USING GIST (TeamId, MeetingRange);
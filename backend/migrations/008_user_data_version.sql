@@ -0,0 +1,88 @@
+-- Per-user data version behind the ETags on GET /api/activities, /api/goals,
+-- /api/teams and /api/notifications. Statement-level triggers bump the version
+-- of every user whose view of the data a statement changes, inside the same
+-- transaction, so writes from the API, the outbox worker and the retention job
+-- are all covered.
+CREATE TABLE IF NOT EXISTS UserDataVersion (
+    UserId INTEGER PRIMARY KEY,
+    Version BIGINT NOT NULL DEFAULT 0
+);
+
+-- Rows are locked in UserId order so concurrent bumps cannot deadlock each other.
+CREATE OR REPLACE FUNCTION bump_user_data_versions(user_ids INTEGER[]) RETURNS void AS $$
+    INSERT INTO UserDataVersion (UserId, Version)
+    SELECT DISTINCT id, 1 FROM unnest(user_ids) AS id WHERE id IS NOT NULL ORDER BY id
+    ON CONFLICT (UserId) DO UPDATE SET Version = UserDataVersion.Version + 1;
+$$ LANGUAGE sql;
+
+-- One trigger function serves every table: its argument is a query returning the
+-- UserIds a statement affects, with %1$I standing for the transition table. An UPDATE
+-- bumps the users of the old and the new rows together.
+CREATE OR REPLACE FUNCTION bump_versions_for_rows() RETURNS trigger AS $$
+DECLARE
+    queries TEXT[] := '{}';
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        queries := queries || format(TG_ARGV[0], 'new_rows');
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        queries := queries || format(TG_ARGV[0], 'old_rows');
+    END IF;
+    EXECUTE format('SELECT bump_user_data_versions(ARRAY(%s))', array_to_string(queries, ' UNION '));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level triggers cannot combine events when they use transition tables,
+-- so each table gets an insert, an update and a delete trigger.
+DO $$
+DECLARE
+    target RECORD;
+BEGIN
+    FOR target IN SELECT * FROM (VALUES
+        ('activity', 'SELECT r.UserId FROM %1$I r', TRUE),
+        ('goal', 'SELECT r.UserId FROM %1$I r', TRUE),
+        ('timeline', 'SELECT g.UserId FROM %1$I r JOIN Goal g ON g.GoalId = r.GoalId', TRUE),
+        ('notifications', 'SELECT r.UserId FROM %1$I r', TRUE),
+        ('teammembers', 'SELECT r.UserId FROM %1$I r', TRUE),
+        -- Team and meeting changes reach every member of the team.
+        ('team', 'SELECT tmem.UserId FROM %1$I r JOIN TeamMembers tmem ON tmem.TeamId = r.TeamId', TRUE),
+        ('teammeeting', 'SELECT tmem.UserId FROM %1$I r JOIN TeamMembers tmem ON tmem.TeamId = r.TeamId', TRUE),
+        -- Invitation changes show up in the member lists every teammate sees.
+        ('meetinginvitations', 'SELECT r.UserId FROM %1$I r
+                                UNION
+                                SELECT tmem.UserId FROM %1$I r
+                                JOIN TeamMeeting tm ON tm.TeamMeetingId = r.MeetingId
+                                JOIN TeamMembers tmem ON tmem.TeamId = tm.TeamId', TRUE),
+        -- Names and pictures are embedded in teammates' meeting member lists; only updates matter.
+        ('users', 'SELECT r.UserId FROM %1$I r
+                   UNION
+                   SELECT other.UserId FROM %1$I r
+                   JOIN TeamMembers mine ON mine.UserId = r.UserId
+                   JOIN TeamMembers other ON other.TeamId = mine.TeamId', FALSE)
+    ) AS t (table_name, user_query, on_insert_delete)
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', target.table_name || '_version_insert', target.table_name);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', target.table_name || '_version_update', target.table_name);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', target.table_name || '_version_delete', target.table_name);
+
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION bump_versions_for_rows(%L)',
+            target.table_name || '_version_update', target.table_name, target.user_query
+        );
+        IF target.on_insert_delete THEN
+            EXECUTE format(
+                'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows
+                 FOR EACH STATEMENT EXECUTE FUNCTION bump_versions_for_rows(%L)',
+                target.table_name || '_version_insert', target.table_name, target.user_query
+            );
+            EXECUTE format(
+                'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows
+                 FOR EACH STATEMENT EXECUTE FUNCTION bump_versions_for_rows(%L)',
+                target.table_name || '_version_delete', target.table_name, target.user_query
+            );
+        END IF;
+    END LOOP;
+END;
+$$;
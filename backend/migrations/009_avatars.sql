@@ -0,0 +1,13 @@
+-- Content-addressed avatar thumbnails (see backend/avatars.py). Users keep the
+-- /api/avatars/<hash> URL in UserProfilePicture instead of an inline data URL.
+-- After applying this file, convert existing inline pictures with:
+--     python backend/avatars.py
+CREATE TABLE IF NOT EXISTS Avatars (
+    Hash CHAR(64) PRIMARY KEY,
+    ContentType VARCHAR(50) NOT NULL,
+    Data BYTEA NOT NULL,
+    CreatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Thumbnails are already compressed; keep them out of line without recompressing.
+ALTER TABLE Avatars ALTER COLUMN Data SET STORAGE EXTERNAL;
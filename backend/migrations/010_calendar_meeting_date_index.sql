@@ -0,0 +1,4 @@
+-- Backs the date-windowed meeting query of GET /api/calendar; MeetingRange is NULL
+-- for untimed meetings, so it cannot serve a plain date window.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_teammeeting_team_date
+    ON TeamMeeting (TeamId, MeetingDate);
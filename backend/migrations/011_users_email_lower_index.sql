@@ -0,0 +1,4 @@
+-- Case-insensitive email lookups (POST /api/users/batch and invitee resolution)
+-- match on LOWER(UserEmail).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_lower
+    ON Users (LOWER(UserEmail));
@@ -0,0 +1,17 @@
+-- Recurring activities and meetings (see recurrence.py). A series is a single row whose
+-- date is its first occurrence; RecurrenceEnd is derived by the API from UNTIL or COUNT
+-- and stays NULL for open-ended series, so date-window queries can skip finished ones.
+-- The ActivityRange and MeetingRange columns of a series only cover its first date,
+-- so conflict checks read series separately and expand them in the API.
+ALTER TABLE Activity ADD COLUMN IF NOT EXISTS RecurrenceRule TEXT;
+ALTER TABLE Activity ADD COLUMN IF NOT EXISTS RecurrenceExceptions DATE[] NOT NULL DEFAULT '{}';
+ALTER TABLE Activity ADD COLUMN IF NOT EXISTS RecurrenceEnd DATE;
+
+ALTER TABLE TeamMeeting ADD COLUMN IF NOT EXISTS RecurrenceRule TEXT;
+ALTER TABLE TeamMeeting ADD COLUMN IF NOT EXISTS RecurrenceExceptions DATE[] NOT NULL DEFAULT '{}';
+ALTER TABLE TeamMeeting ADD COLUMN IF NOT EXISTS RecurrenceEnd DATE;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activity_user_series
+    ON Activity (UserId, ActivityDate) WHERE RecurrenceRule IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_teammeeting_team_series
+    ON TeamMeeting (TeamId, MeetingDate) WHERE RecurrenceRule IS NOT NULL;
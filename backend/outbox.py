@@ -0,0 +1,255 @@
+"""
+Transactional outbox for notification fan-out.
+
+API handlers call enqueue_event() inside the same transaction as their
+mutation; that writes a single NotificationOutbox row. The worker started by
+running this module (`python outbox.py`) claims pending events in batches with
+FOR UPDATE SKIP LOCKED, renders the per-user notification text and writes the
+Notifications rows. Failed events are retried with exponential backoff.
+Notifications carry their OutboxId, and a unique index on (OutboxId, UserId)
+makes re-processing an event harmless. Recipients deleted in the meantime are
+skipped.
+"""
+import json
+import os
+import select
+import time
+import uuid
+
+import psycopg2
+import psycopg2.extensions
+from dotenv import load_dotenv
+from psycopg2.extras import Json, execute_values
+
+from db import connection
+
+load_dotenv()
+
+OUTBOX_CHANNEL = "planit_outbox"
+BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))
+MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+MAX_BACKOFF_SECONDS = 300
+RECONNECT_DELAY = float(os.getenv("OUTBOX_RECONNECT_DELAY", "1"))
+MAX_RECONNECT_DELAY = 60
+
+
+def enqueue_event(cur, event_type, payload, idempotency_key=None):
+    """
+    Record a notification event in the caller's transaction.
+    Events with an idempotency key that was already used are ignored.
+    """
+    cur.execute(
+        """
+        INSERT INTO NotificationOutbox (IdempotencyKey, EventType, Payload)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (IdempotencyKey) DO NOTHING
+        """,
+        (idempotency_key or uuid.uuid4().hex, event_type, Json(payload))
+    )
+    cur.execute("SELECT pg_notify(%s, '')", (OUTBOX_CHANNEL,))
+
+
+def outbox_stats(cur):
+    """Queue depth and lag figures for monitoring"""
+    cur.execute(
+        """
+        SELECT COUNT(*) FILTER (WHERE Status = 'pending'),
+               COUNT(*) FILTER (WHERE Status = 'failed'),
+               EXTRACT(EPOCH FROM CURRENT_TIMESTAMP - MIN(CreatedAt) FILTER (WHERE Status = 'pending')),
+               MAX(ProcessedAt)
+        FROM NotificationOutbox
+        """
+    )
+    pending, failed, lag_seconds, last_processed_at = cur.fetchone()
+    return {
+        'pending': pending,
+        'failed': failed,
+        'lagSeconds': float(lag_seconds) if lag_seconds is not None else 0.0,
+        'lastProcessedAt': last_processed_at.isoformat() if last_processed_at else None
+    }
+
+
+def _format_time_info(payload):
+    if payload.get('meetingStartTime') and payload.get('meetingEndTime'):
+        info = f" on {payload.get('meetingDate')} from {payload.get('meetingStartTime')} to {payload.get('meetingEndTime')}"
+    elif payload.get('meetingDate'):
+        info = f" on {payload.get('meetingDate')}"
+    else:
+        return ""
+    if payload.get('meetingRecurrence'):
+        info += f", repeating {payload['meetingRecurrence']},"
+    return info
+
+
+def _invited_user_ids(cur, payload):
+    """Drop recipients whose invitation was withdrawn before the event was processed"""
+    cur.execute(
+        "SELECT UserId FROM MeetingInvitations WHERE MeetingId = %s AND UserId = ANY(%s)",
+        (payload['meetingId'], payload['userIds'])
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def _render_meeting_invitation(cur, payload):
+    message = f'You have been invited to join the meeting "{payload["meetingTitle"]}"{_format_time_info(payload)} in team "{payload["teamName"]}"'
+    if payload.get('meetingDescription'):
+        message += f'. Description: {payload["meetingDescription"]}'
+    title = f'Meeting Invitation: {payload["meetingTitle"]}'
+    return [(user_id, 'meeting_invitation', title, message, payload['meetingId'])
+            for user_id in _invited_user_ids(cur, payload)]
+
+
+def _render_meeting_member_added(cur, payload):
+    if payload['invitationType'] == 'mandatory':
+        message = f'You have been invited to join the mandatory meeting "{payload["meetingTitle"]}" in team "{payload["teamName"]}".'
+    else:
+        message = f'You have been invited to join the meeting "{payload["meetingTitle"]}" in team "{payload["teamName"]}". Please respond.'
+    title = f'New Meeting Invitation: {payload["meetingTitle"]}'
+    return [(user_id, 'meeting_invitation', title, message, payload['meetingId'])
+            for user_id in _invited_user_ids(cur, payload)]
+
+
+def _render_meeting_member_removed(cur, payload):
+    message = f'You have been removed from the meeting "{payload["meetingTitle"]}" in team "{payload["teamName"]}".'
+    title = f'Removed from Meeting: {payload["meetingTitle"]}'
+    return [(user_id, 'meeting_removed', title, message, None) for user_id in payload['userIds']]
+
+
+def _render_meeting_canceled(cur, payload):
+    message = f'The meeting "{payload["meetingTitle"]}" in team "{payload["teamName"]}" has been canceled.'
+    title = f'Meeting Canceled: {payload["meetingTitle"]}'
+    return [(user_id, 'meeting_canceled', title, message, None) for user_id in payload['userIds']]
+
+
+def _render_team_deleted(cur, payload):
+    message = f'The team "{payload["teamName"]}" has been deleted by the creator.'
+    title = f'Team Deleted: {payload["teamName"]}'
+    return [(user_id, 'team_deleted', title, message, None) for user_id in payload['userIds']]
+
+
+def _render_member_left_team(cur, payload):
+    message = f"User '{payload['userName']}' has deleted their account and has been removed from your team(s)."
+    return [(user_id, 'member_left_team', "Team Member Left", message, None) for user_id in payload['userIds']]
+
+
+def _render_invitation_responded(cur, payload):
+    message = f'{payload["responderName"]} has {payload["response"]} the invitation to the meeting "{payload["meetingTitle"]}".'
+    title = f'Invitation {payload["response"].capitalize()}: {payload["meetingTitle"]}'
+    return [(user_id, 'invitation_response', title, message, payload['meetingId']) for user_id in payload['userIds']]
+
+
+RENDERERS = {
+    'meeting_invitation': _render_meeting_invitation,
+    'meeting_member_added': _render_meeting_member_added,
+    'meeting_member_removed': _render_meeting_member_removed,
+    'meeting_canceled': _render_meeting_canceled,
+    'team_deleted': _render_team_deleted,
+    'member_left_team': _render_member_left_team,
+    'invitation_responded': _render_invitation_responded,
+}
+
+
+def process_batch(conn):
+    """Expand one batch of pending events into notifications; returns the number of events handled"""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT OutboxId, EventType, Payload, Attempts
+        FROM NotificationOutbox
+        WHERE Status = 'pending' AND AvailableAt <= CURRENT_TIMESTAMP
+        ORDER BY OutboxId
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+        """,
+        (BATCH_SIZE,)
+    )
+    events = cur.fetchall()
+
+    for outbox_id, event_type, payload, attempts in events:
+        cur.execute("SAVEPOINT outbox_event")
+        try:
+            if isinstance(payload, str):
+                payload = json.loads(payload)
+            notifications = RENDERERS[event_type](cur, payload)
+            if notifications:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO Notifications (UserId, Type, Title, Message, RelatedId, OutboxId)
+                    SELECT v.UserId, v.Type, v.Title, v.Message, v.RelatedId, v.OutboxId
+                    FROM (VALUES %s) AS v (UserId, Type, Title, Message, RelatedId, OutboxId)
+                    JOIN Users u ON u.UserId = v.UserId
+                    ON CONFLICT (OutboxId, UserId) WHERE OutboxId IS NOT NULL DO NOTHING
+                    """,
+                    [notification + (outbox_id,) for notification in notifications],
+                    template="(%s::integer, %s, %s, %s, %s::integer, %s::bigint)",
+                    page_size=1000
+                )
+            cur.execute(
+                """
+                UPDATE NotificationOutbox
+                SET Status = 'done', Attempts = Attempts + 1, ProcessedAt = CURRENT_TIMESTAMP, LastError = NULL
+                WHERE OutboxId = %s
+                """,
+                (outbox_id,)
+            )
+            cur.execute("RELEASE SAVEPOINT outbox_event")
+        except Exception as e:
+            cur.execute("ROLLBACK TO SAVEPOINT outbox_event")
+            backoff = min(2 ** attempts, MAX_BACKOFF_SECONDS)
+            cur.execute(
+                """
+                UPDATE NotificationOutbox
+                SET Attempts = Attempts + 1, LastError = %s,
+                    Status = CASE WHEN Attempts + 1 >= %s THEN 'failed' ELSE 'pending' END,
+                    AvailableAt = CURRENT_TIMESTAMP + make_interval(secs => %s)
+                WHERE OutboxId = %s
+                """,
+                (str(e), MAX_ATTEMPTS, backoff, outbox_id)
+            )
+            print(f"Outbox event {outbox_id} ({event_type}) failed: {e}")
+
+    conn.commit()
+    return len(events)
+
+
+def run_worker():
+    """
+    Process events until interrupted, waking on NOTIFY or every POLL_INTERVAL seconds.
+    Database errors (a restart, a dropped connection) are logged, the transaction is
+    rolled back and both connections are reopened after a delay that doubles up to
+    MAX_RECONNECT_DELAY while the errors continue.
+    """
+    delay = RECONNECT_DELAY
+    while True:
+        listen_conn = None
+        try:
+            listen_conn = psycopg2.connect(os.getenv("DATABASE_URL"))
+            listen_conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            listen_conn.cursor().execute(f"LISTEN {OUTBOX_CHANNEL}")
+            # connection() rolls back on the way out of an error and the pool drops closed connections
+            with connection() as conn:
+                last_report = 0
+                while True:
+                    while process_batch(conn) == BATCH_SIZE:
+                        pass
+                    delay = RECONNECT_DELAY
+                    if time.monotonic() - last_report >= 60:
+                        stats = outbox_stats(conn.cursor())
+                        conn.rollback()
+                        print(f"Outbox: {stats['pending']} pending, {stats['failed']} failed, lag {stats['lagSeconds']:.1f}s")
+                        last_report = time.monotonic()
+                    if select.select([listen_conn], [], [], POLL_INTERVAL) != ([], [], []):
+                        listen_conn.poll()
+                        listen_conn.notifies.clear()
+        except Exception as e:
+            print(f"Outbox worker error: {e}; reconnecting in {delay:g}s")
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+        finally:
+            if listen_conn is not None and not listen_conn.closed:
+                listen_conn.close()
+
+if __name__ == '__main__':
+    run_worker()
@@ -0,0 +1,101 @@
+import json
+import os
+import queue
+import select
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+
+NOTIFICATION_CHANNEL = "planit_notifications"
+
+
+class NotificationListener:
+    """
+    Fans Postgres NOTIFY events out to in-process subscribers.
+    One listener per worker process holds a single dedicated LISTEN connection,
+    so open event streams cost a queue each rather than a database connection.
+    """
+
+    def __init__(self, dsn, channel=NOTIFICATION_CHANNEL, poll_timeout=5, reconnect_delay=2):
+        self.dsn = dsn
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._subscribers = {}  # user_id -> set of queues
+        self._thread = None
+
+    def subscribe(self, user_id):
+        subscriber = queue.Queue(maxsize=100)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscriber)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="notification-listener", daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def _dispatch(self, payload):
+        try:
+            event = json.loads(payload)
+            user_id = int(event['userId'])
+        except (ValueError, KeyError, TypeError):
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # A stalled client only loses individual events; it refetches on the next one.
+                pass
+
+    def _run(self):
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                cur = conn.cursor()
+                cur.execute(f"LISTEN {self.channel}")
+                while True:
+                    if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+            except Exception as e:
+                print(f"Notification listener error: {e}")
+                time.sleep(self.reconnect_delay)
+            finally:
+                if conn is not None and not conn.closed:
+                    conn.close()
+
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def get_listener():
+    """Return the notification listener for the current process, creating it on first use"""
+    global _listener
+    if _listener is not None and _listener.pid == os.getpid():
+        return _listener
+    with _listener_lock:
+        if _listener is None or _listener.pid != os.getpid():
+            _listener = NotificationListener(os.getenv("DATABASE_URL"))
+        return _listener
@@ -0,0 +1,214 @@
+"""
+Recurrence rules for repeating activities and meetings.
+
+A series is stored once: its date is the first occurrence, RecurrenceRule holds an
+RRULE in the RFC 5545 syntax (FREQ=DAILY|WEEKLY|MONTHLY|YEARLY with optional
+INTERVAL, BYDAY for weekly rules, and COUNT or UNTIL), RecurrenceExceptions lists
+skipped dates and RecurrenceEnd the last date the series can reach (NULL while it is
+open-ended). Occurrences are never stored; they are computed for one date window at a
+time, starting directly at the window, so the cost depends on the window and not on
+how long the series has been running.
+"""
+import calendar
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+MAX_COUNT = 1000
+MAX_INTERVAL = 1000
+MAX_EXCEPTIONS = 1000
+
+
+class Recurrence:
+    """A parsed recurrence rule; weekdays are 0 (Monday) to 6 and only used by weekly rules"""
+
+    def __init__(self, freq, interval=1, count=None, until=None, weekdays=()):
+        self.freq = freq
+        self.interval = interval
+        self.count = count
+        self.until = until
+        self.weekdays = tuple(sorted(set(weekdays)))
+
+    @classmethod
+    def parse(cls, text):
+        """Parse RRULE text such as 'FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10'; raises ValueError"""
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("Recurrence rule must be a non-empty string")
+        text = text.strip()
+        if text[:6].upper() == 'RRULE:':
+            text = text[6:]
+
+        parts = {}
+        for part in text.split(';'):
+            name, separator, value = part.partition('=')
+            name = name.strip().upper()
+            if not separator or not name or name in parts:
+                raise ValueError(f"Invalid recurrence rule part '{part}'")
+            parts[name] = value.strip().upper()
+
+        unsupported = set(parts) - {'FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'BYDAY', 'WKST'}
+        if unsupported:
+            raise ValueError(f"Unsupported recurrence rule parts: {', '.join(sorted(unsupported))}")
+        if parts.get('FREQ') not in FREQUENCIES:
+            raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+        if parts.get('WKST', 'MO') != 'MO':
+            raise ValueError("Only WKST=MO is supported")
+        if 'COUNT' in parts and 'UNTIL' in parts:
+            raise ValueError("COUNT and UNTIL cannot be combined")
+
+        try:
+            interval = int(parts.get('INTERVAL', '1'))
+            count = int(parts['COUNT']) if 'COUNT' in parts else None
+        except ValueError:
+            raise ValueError("INTERVAL and COUNT must be integers")
+        if not 1 <= interval <= MAX_INTERVAL:
+            raise ValueError(f"INTERVAL must be between 1 and {MAX_INTERVAL}")
+        if count is not None and not 1 <= count <= MAX_COUNT:
+            raise ValueError(f"COUNT must be between 1 and {MAX_COUNT}")
+
+        until = None
+        if 'UNTIL' in parts:
+            try:
+                until = datetime.strptime(parts['UNTIL'][:8], '%Y%m%d').date()
+            except ValueError:
+                raise ValueError("UNTIL must be a date in YYYYMMDD form")
+
+        weekdays = ()
+        if 'BYDAY' in parts:
+            if parts['FREQ'] != 'WEEKLY':
+                raise ValueError("BYDAY is only supported for weekly rules")
+            try:
+                weekdays = [WEEKDAYS.index(day.strip()) for day in parts['BYDAY'].split(',')]
+            except ValueError:
+                raise ValueError("BYDAY must list weekdays such as MO,WE,FR")
+
+        return cls(parts['FREQ'], interval, count, until, weekdays)
+
+    def __str__(self):
+        parts = [f'FREQ={self.freq}']
+        if self.interval != 1:
+            parts.append(f'INTERVAL={self.interval}')
+        if self.weekdays:
+            parts.append('BYDAY=' + ','.join(WEEKDAYS[day] for day in self.weekdays))
+        if self.count is not None:
+            parts.append(f'COUNT={self.count}')
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%d')}")
+        return ';'.join(parts)
+
+    def last_date(self, start):
+        """The last date the series can reach, or None when it never ends"""
+        if self.until is not None:
+            return self.until
+        if self.count is None:
+            return None
+        last = None
+        for last, _ in zip(self._dates(start, start, None), range(self.count)):
+            pass
+        return last
+
+    def between(self, start, window_start, window_end, exceptions=(), last=None):
+        """Yield the occurrence dates of a series starting on `start` inside the inclusive window"""
+        last = last or self.last_date(start)
+        if last is not None and last < window_end:
+            window_end = last
+        for day in self._dates(start, max(start, window_start), window_end):
+            if day not in exceptions:
+                yield day
+
+    def _dates(self, start, low, high):
+        """Occurrences from `low` (on or after start) through `high`, or forever when high is None"""
+        if high is not None and low > high:
+            return
+        step = self.interval
+        if self.freq == 'DAILY':
+            index = -(-(low - start).days // step) * step
+            day = start + timedelta(days=index)
+            while high is None or day <= high:
+                yield day
+                day += timedelta(days=step)
+
+        elif self.freq == 'WEEKLY':
+            week_start = start - timedelta(days=start.weekday())
+            weekdays = self.weekdays or (start.weekday(),)
+            week = -(-((low - week_start).days // 7) // step) * step
+            while True:
+                first_day = week_start + timedelta(weeks=week)
+                for weekday in weekdays:
+                    day = first_day + timedelta(days=weekday)
+                    if high is not None and day > high:
+                        return
+                    if day >= low:
+                        yield day
+                week += step
+
+        else:
+            months = 12 * step if self.freq == 'YEARLY' else step
+            offset = (low.year - start.year) * 12 + low.month - start.month
+            index = max(0, -(-offset // months) * months)
+            while True:
+                year, month = divmod(start.month - 1 + index, 12)
+                year += start.year
+                if high is not None and date(year, month + 1, 1) > high:
+                    return
+                # Months (or Februaries) without the start's day are skipped, as in RFC 5545
+                if start.day <= calendar.monthrange(year, month + 1)[1]:
+                    day = date(year, month + 1, start.day)
+                    if day >= low and (high is None or day <= high):
+                        yield day
+                index += months
+
+
+parse_rule = lru_cache(maxsize=1024)(Recurrence.parse)
+
+
+def occurrences(rule, start, window_start, window_end, exceptions=(), last=None):
+    """Occurrence dates of a stored series (rule text, start date, exception dates) inside the window"""
+    return parse_rule(rule).between(start, window_start, window_end, frozenset(exceptions or ()), last)
+
+
+def parse_series(rule, exception_dates, start):
+    """
+    Validate a series submitted to the API; returns the (RecurrenceRule, RecurrenceExceptions,
+    RecurrenceEnd) column values, all None/empty for a one-off item. Raises ValueError.
+    """
+    if not rule:
+        return None, [], None
+    recurrence = Recurrence.parse(rule)
+    if exception_dates is None:
+        exception_dates = []
+    if not isinstance(exception_dates, list) or len(exception_dates) > MAX_EXCEPTIONS:
+        raise ValueError(f"Exception dates must be a list of at most {MAX_EXCEPTIONS} dates")
+    try:
+        exceptions = sorted({
+            value if isinstance(value, date) else datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+            for value in exception_dates
+        })
+    except ValueError:
+        raise ValueError("Exception dates must use YYYY-MM-DD format")
+    last = recurrence.last_date(start)
+    if last is not None and last < start:
+        raise ValueError("The recurrence ends before its first date")
+    return str(recurrence), exceptions, last
+
+
+def expand_rows(rows, date_indexes, series_index, window_start, window_end):
+    """
+    Yield one copy of each series row per occurrence inside the window, with the columns
+    at date_indexes set to the occurrence date. The first date index holds the series
+    start; the row carries RecurrenceRule, RecurrenceExceptions and RecurrenceEnd from
+    series_index on. Rows without a rule are passed through as they are. Output is
+    ordered per row, not across rows.
+    """
+    for row in rows:
+        rule, exceptions, last = row[series_index:series_index + 3]
+        if not rule:
+            yield row
+            continue
+        start = row[date_indexes[0]]
+        for day in occurrences(rule, start, window_start, window_end, exceptions, last):
+            values = list(row)
+            for index in date_indexes:
+                values[index] = day
+            yield tuple(values)
@@ -0,0 +1,254 @@
+"""
+Shared response cache for read endpoints.
+
+Entries are keyed by route, query string and user, and carry the version of
+every tag they depend on (user:<id>, team:<id>, meeting:<id>). Invalidating
+a tag bumps its version, which makes every entry recorded against the older
+version stale. No tag-to-key index needs to be maintained.
+
+Versions come from one invalidation counter (the epoch): an invalidation
+takes the next epoch value and stores it as the version of each of its tags.
+A fill notes the epoch before computing and is only stored if none of its own
+tags has a newer version afterwards, so invalidations of unrelated tags do
+not discard it.
+
+Two backends share this interface: MemoryBackend for a single process, and
+RedisBackend, which speaks the Redis protocol so all Gunicorn workers see the
+same entries and invalidations. Select one with RESPONSE_CACHE_URL
+("memory://" or "redis://host:port/db").
+"""
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+TAG_PREFIX = "planit:tag:"
+ENTRY_PREFIX = "planit:resp:"
+LOCK_PREFIX = "planit:lock:"
+EPOCH_KEY = "planit:epoch"
+MAX_TAG_VERSIONS = 100000
+
+
+class MemoryBackend:
+    """
+    Process-local backend; invalidations are not seen by other workers.
+    At most max_tags tag versions are kept, evicting the least recently
+    invalidated. Tags without a version read as the highest evicted version,
+    so an eviction can only make entries look stale, never fresh.
+    """
+
+    def __init__(self, max_tags=MAX_TAG_VERSIONS):
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (expires_at, entry)
+        self._versions = OrderedDict()  # tag -> epoch of its last invalidation, oldest first
+        self._max_tags = max_tags
+        self._evicted_version = 0
+        self._fill_locks = {}  # key -> expires_at
+        self._epoch = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return item[1]
+
+    def set(self, key, entry, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entry)
+
+    def tag_versions(self, tags):
+        with self._lock:
+            return [self._versions.get(tag, self._evicted_version) for tag in tags]
+
+    def epoch(self):
+        with self._lock:
+            return self._epoch
+
+    def invalidate(self, tags):
+        with self._lock:
+            self._epoch += 1
+            for tag in tags:
+                self._versions[tag] = self._epoch
+                self._versions.move_to_end(tag)
+            while len(self._versions) > self._max_tags:
+                _, version = self._versions.popitem(last=False)
+                self._evicted_version = max(self._evicted_version, version)
+            now = time.monotonic()
+            for key in [key for key, item in self._entries.items() if item[0] <= now]:
+                del self._entries[key]
+
+    def acquire_fill_lock(self, key, timeout):
+        with self._lock:
+            now = time.monotonic()
+            if self._fill_locks.get(key, 0) > now:
+                return None
+            self._fill_locks[key] = now + timeout
+            return True
+
+    def release_fill_lock(self, key, token):
+        with self._lock:
+            self._fill_locks.pop(key, None)
+
+
+class RedisBackend:
+    """Backend for any server speaking the Redis protocol"""
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self.client.get(ENTRY_PREFIX + key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key, entry, ttl):
+        self.client.set(ENTRY_PREFIX + key, json.dumps(entry), ex=ttl)
+
+    def tag_versions(self, tags):
+        if not tags:
+            return []
+        return [int(version or 0) for version in self.client.mget([TAG_PREFIX + tag for tag in tags])]
+
+    def epoch(self):
+        return int(self.client.get(EPOCH_KEY) or 0)
+
+    def invalidate(self, tags):
+        # Watching the epoch serializes invalidations, so a tag's version only ever grows
+        def bump(pipeline):
+            epoch = int(pipeline.get(EPOCH_KEY) or 0) + 1
+            pipeline.multi()
+            pipeline.set(EPOCH_KEY, epoch)
+            pipeline.mset({TAG_PREFIX + tag: epoch for tag in tags})
+        self.client.transaction(bump, EPOCH_KEY)
+
+    def acquire_fill_lock(self, key, timeout):
+        token = uuid.uuid4().hex
+        if self.client.set(LOCK_PREFIX + key, token, nx=True, px=int(timeout * 1000)):
+            return token
+        return None
+
+    def release_fill_lock(self, key, token):
+        if self.client.get(LOCK_PREFIX + key) == token.encode():
+            self.client.delete(LOCK_PREFIX + key)
+
+
+class ResponseCache:
+    """
+    Cache-aside wrapper with tag validation and single-flight fills.
+    Only one caller per key computes a cold entry: threads in this process
+    queue on a local lock, and other processes wait on the backend's fill
+    lock, polling for the entry until fill_timeout runs out.
+    """
+
+    def __init__(self, backend, ttl=300, fill_timeout=5.0, poll_interval=0.05):
+        self.backend = backend
+        self.ttl = ttl
+        self.fill_timeout = fill_timeout
+        self.poll_interval = poll_interval
+        self._locks_lock = threading.Lock()
+        self._key_locks = {}  # key -> [lock, waiter count]
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'fills': 0, 'waits': 0, 'skippedFills': 0, 'uncacheable': 0, 'invalidations': 0}
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats, backend=type(self.backend).__name__, ttl=self.ttl)
+
+    def _lookup(self, key):
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        tags = list(entry['tags'])
+        if self.backend.tag_versions(tags) != [entry['tags'][tag] for tag in tags]:
+            return None
+        return entry
+
+    def _acquire_key_lock(self, key):
+        with self._locks_lock:
+            slot = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            slot[1] += 1
+        slot[0].acquire()
+        return slot
+
+    def _release_key_lock(self, key, slot):
+        slot[0].release()
+        with self._locks_lock:
+            slot[1] -= 1
+            if slot[1] == 0:
+                del self._key_locks[key]
+
+    def get_or_compute(self, key, compute):
+        """
+        Return (entry, hit) where entry is {'status', 'body', 'tags'}.
+        compute() must return (status, body, tags); only 200 responses are stored,
+        and a body of None marks a response that must not be cached.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            self._count('hits')
+            return entry, True
+
+        slot = self._acquire_key_lock(key)
+        try:
+            entry = self._lookup(key)
+            if entry is not None:
+                self._count('hits')
+                return entry, True
+
+            token = self.backend.acquire_fill_lock(key, self.fill_timeout)
+            if token is None:
+                self._count('waits')
+                deadline = time.monotonic() + self.fill_timeout
+                while time.monotonic() < deadline:
+                    time.sleep(self.poll_interval)
+                    entry = self._lookup(key)
+                    if entry is not None:
+                        self._count('hits')
+                        return entry, True
+
+            self._count('misses')
+            try:
+                epoch = self.backend.epoch()
+                status, body, tags = compute()
+                tags = sorted(set(tags))
+                entry = {'status': status, 'body': body, 'tags': dict(zip(tags, self.backend.tag_versions(tags)))}
+                # A newer tag version means an invalidation landed while computing, which body may miss
+                if body is None:
+                    self._count('uncacheable')
+                elif status == 200 and max(entry['tags'].values(), default=0) <= epoch:
+                    self.backend.set(key, entry, self.ttl)
+                    self._count('fills')
+                elif status == 200:
+                    self._count('skippedFills')
+                return entry, False
+            finally:
+                if token is not None:
+                    self.backend.release_fill_lock(key, token)
+        finally:
+            self._release_key_lock(key, slot)
+
+    def invalidate(self, tags):
+        tags = set(tags)
+        if tags:
+            self.backend.invalidate(tags)
+            self._count('invalidations')
+
+
+def create_response_cache(url, ttl=300):
+    """Build a cache from RESPONSE_CACHE_URL; returns None when caching is disabled"""
+    if not url:
+        return None
+    if url.startswith('memory://'):
+        return ResponseCache(MemoryBackend(), ttl=ttl)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return ResponseCache(RedisBackend(url), ttl=ttl)
+    raise ValueError(f"Unsupported RESPONSE_CACHE_URL: {url}")
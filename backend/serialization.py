@@ -0,0 +1,94 @@
+"""
+Fast JSON responses for the read endpoints.
+
+psycopg2 rows are turned into dicts by precomputed RowEncoders and dumped to
+bytes with orjson. orjson writes date and datetime values natively in the same
+ISO 8601 form as isoformat(), so only TIME columns need a converter (hhmm).
+Payloads built here must be sent with json_response, not jsonify, which would
+render dates as HTTP dates.
+"""
+from decimal import Decimal
+
+import orjson
+from flask import Response
+
+
+def hhmm(value):
+    """Format a TIME value as HH:MM"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value[:5]
+    return f'{value.hour:02d}:{value.minute:02d}'
+
+
+class RowEncoder:
+    """
+    Map a contiguous slice of a row tuple to a dict.
+    fields is a sequence of (key, converter) pairs in column order, starting at
+    column `offset`; converter is None for values orjson can emit as they are.
+    """
+
+    def __init__(self, fields, offset=0):
+        self.keys = tuple(key for key, _ in fields)
+        self.start = offset
+        self.stop = offset + len(self.keys)
+        self.converters = tuple((key, converter) for key, converter in fields if converter is not None)
+
+    def __call__(self, row):
+        item = dict(zip(self.keys, row[self.start:self.stop]))
+        for key, converter in self.converters:
+            item[key] = converter(item[key])
+        return item
+
+    def many(self, rows):
+        return [self(row) for row in rows]
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(payload):
+    return orjson.dumps(payload, default=_default)
+
+
+def json_response(payload, status=200):
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def stream_json_object(fields, key, items, chunk_size=65536):
+    """
+    Yield a JSON object holding the given fields and then `key`, whose array is
+    written from the items iterable one element at a time. Output is buffered into
+    chunks of about chunk_size bytes, so memory does not grow with the item count.
+    """
+    buffer = bytearray(dumps(fields)[:-1])
+    if fields:
+        buffer += b','
+    buffer += dumps(key) + b':['
+    separator = b''
+    for item in items:
+        buffer += separator
+        buffer += dumps(item)
+        separator = b','
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b']}'
+    yield bytes(buffer)
+
+
+def stream_json_array(documents, head, tail):
+    """
+    Yield head, then the JSON texts from documents joined as array elements, then tail.
+    The texts are passed through untouched, e.g. documents rendered by Postgres.
+    """
+    yield head
+    separator = ''
+    for document in documents:
+        yield separator + document
+        separator = ','
+    yield tail
@@ -0,0 +1,70 @@
+from datetime import date, time
+
+import pytest
+
+import app as planit
+
+# Two activities starting in the same minute, a few seconds apart
+ROWS = [
+    (date(2026, 3, 2), time(10, 0, 15), 7) + (None,) * len(planit.ACTIVITY_FIELDS),
+    (date(2026, 3, 2), time(10, 0, 45), 8) + (None,) * len(planit.ACTIVITY_FIELDS),
+]
+
+
+class FakeCursor:
+    def __init__(self, executed):
+        self.executed = executed
+        self.rows = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+        self.rows = [(0,)] if 'UserDataVersion' in query else ROWS
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self.executed)
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    conn = FakeConnection()
+    monkeypatch.setattr(planit, 'get_db_connection', lambda: conn)
+    monkeypatch.setattr(planit, 'response_cache', None)
+    return conn
+
+
+def get_page(**args):
+    response = planit.app.test_client().get('/api/activities', query_string={'userId': 1, **args})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()
+
+
+def test_next_cursor_keeps_seconds(conn):
+    page = get_page(limit=1)
+    assert planit._decode_cursor(page['nextCursor']) == ['2026-03-02', '10:00:15', 7]
+
+    get_page(limit=1, cursor=page['nextCursor'])
+    query, params = conn.executed[-1]
+    assert 'ActivityStartTime > %s' in query
+    assert time(10, 0, 15) in params
+
+
+def test_hhmm_cursor_still_accepted(conn):
+    get_page(limit=1, cursor=planit._encode_cursor(['2026-03-02', '10:00', 7]))
+    assert time(10, 0) in conn.executed[-1][1]
+
+
+def test_malformed_cursor_time_is_rejected(conn):
+    cursor = planit._encode_cursor(['2026-03-02', 'noon', 7])
+    response = planit.app.test_client().get('/api/activities', query_string={'userId': 1, 'limit': 1, 'cursor': cursor})
+    assert response.status_code == 400
@@ -0,0 +1,43 @@
+from flask import Response, jsonify
+
+import app as planit
+from response_cache import MemoryBackend, ResponseCache
+
+
+def test_streamed_responses_are_passed_through_unread(monkeypatch):
+    cache = ResponseCache(MemoryBackend())
+    monkeypatch.setattr(planit, 'response_cache', cache)
+    produced = []
+
+    def chunks():
+        for chunk in ('{"items": [', '1', ']}'):
+            produced.append(chunk)
+            yield chunk
+
+    view = planit.cached_response(lambda: Response(chunks(), mimetype='application/json'))
+    with planit.app.test_request_context('/api/activities?userId=1'):
+        response = view()
+        assert response.is_streamed
+        assert response.headers['X-Cache'] == 'BYPASS'
+        assert produced == []
+        assert b''.join(response.iter_encoded()) == b'{"items": [1]}'
+    assert cache.stats()['uncacheable'] == 1
+    assert cache.stats()['fills'] == 0
+
+
+def test_buffered_responses_are_cached(monkeypatch):
+    monkeypatch.setattr(planit, 'response_cache', ResponseCache(MemoryBackend()))
+    calls = []
+
+    def list_items():
+        calls.append(1)
+        planit._tag_response('user:1')
+        return jsonify({'items': [1]})
+
+    view = planit.cached_response(list_items)
+    for expected in ('MISS', 'HIT'):
+        with planit.app.test_request_context('/api/activities?userId=1'):
+            response = view()
+            assert response.headers['X-Cache'] == expected
+            assert response.get_json() == {'items': [1]}
+    assert len(calls) == 1
@@ -0,0 +1,53 @@
+import psycopg2
+from flask import jsonify
+
+import app as planit
+
+
+class FakeConnection:
+    """A connection that, like PostgreSQL, refuses every query after a failed one until rollback"""
+
+    def __init__(self):
+        self.aborted = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.aborted = False
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        if self.conn.aborted:
+            raise psycopg2.errors.InFailedSqlTransaction(
+                "current transaction is aborted, commands ignored until end of transaction block")
+        if 'UserDataVersion' in query:
+            self.conn.aborted = True
+            raise psycopg2.errors.UndefinedTable('relation "userdataversion" does not exist')
+
+    def fetchone(self):
+        return (1,)
+
+
+def test_view_still_runs_when_the_version_lookup_fails(monkeypatch):
+    conn = FakeConnection()
+    monkeypatch.setattr(planit, 'get_db_connection', lambda: conn)
+
+    def list_items():
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        return jsonify({'success': True, 'items': [cur.fetchone()[0]]})
+
+    view = planit.conditional_get(list_items)
+    with planit.app.test_request_context('/api/activities?userId=1'):
+        response = planit.app.make_response(view())
+    assert response.status_code == 200
+    assert response.get_json() == {'success': True, 'items': [1]}
+    assert 'ETag' not in response.headers
+    assert conn.rollbacks == 1
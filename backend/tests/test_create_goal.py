@@ -0,0 +1,29 @@
+import pytest
+
+import app as planit
+
+TIMELINE = {'timelineTitle': 'Draft', 'timelineStartDate': '2026-03-02', 'timelineEndDate': '2026-03-06'}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def no_database():
+        raise AssertionError("Invalid input must be rejected before the database is used")
+
+    monkeypatch.setattr(planit, 'get_db_connection', no_database)
+    return planit.app.test_client()
+
+
+@pytest.mark.parametrize('user_id, timeline', [
+    ('google-oauth-id', TIMELINE),
+    (1, {**TIMELINE, 'timelineStartDate': '03/02/2026'}),
+    (1, {**TIMELINE, 'timelineEndDate': None}),
+    (1, {'timelineTitle': 'No dates'}),
+    (1, 'not a timeline'),
+])
+def test_conflict_check_rejects_invalid_input(client, user_id, timeline):
+    response = client.post('/api/goals', json={
+        'userId': user_id, 'goalTitle': 'Thesis', 'timelines': [timeline], 'checkConflicts': True
+    })
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
@@ -0,0 +1,102 @@
+import threading
+import time
+
+import psycopg2.extensions
+import pytest
+
+import db
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        if self.conn.probe is not None:
+            self.conn.probe()
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, probe=None):
+        self.closed = 0
+        self.probe = probe
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Connections handed out by psycopg2.connect, in order; later calls get plain ones"""
+    queue = []
+    monkeypatch.setattr(db.psycopg2, 'connect', lambda dsn: queue.pop(0) if queue else FakeConnection())
+    return queue
+
+
+def test_slow_health_check_does_not_block_other_checkouts(connections):
+    probe_started = threading.Event()
+    release_probe = threading.Event()
+
+    def slow_probe():
+        probe_started.set()
+        release_probe.wait(5)
+
+    slow = FakeConnection(probe=slow_probe)
+    connections.append(slow)
+    pool = db.ConnectionPool('dsn', min_size=1, max_size=2, health_check_interval=0)
+
+    checked_out = []
+    worker = threading.Thread(target=lambda: checked_out.append(pool.getconn()))
+    worker.start()
+    assert probe_started.wait(5)
+
+    started = time.monotonic()
+    other = pool.getconn()
+    assert time.monotonic() - started < 1
+    assert other is not slow
+
+    release_probe.set()
+    worker.join(5)
+    assert checked_out == [slow]
+    assert pool.stats()['inUse'] == 2
+
+
+def test_failed_health_check_replaces_connection(connections):
+    def dead_probe():
+        raise psycopg2.OperationalError("server closed the connection")
+
+    dead = FakeConnection(probe=dead_probe)
+    connections.append(dead)
+    pool = db.ConnectionPool('dsn', min_size=1, max_size=1, health_check_interval=0)
+
+    conn = pool.getconn()
+    assert conn is not dead
+    assert dead.closed
+    stats = pool.stats()
+    assert stats['failedHealthChecks'] == 1
+    assert stats['connectionsCreated'] == 2
+    assert stats['inUse'] == 1
+
+    pool.putconn(conn)
+    assert pool.stats()['inUse'] == 0
+    assert pool.stats()['idle'] == 1
+
+
+def test_checkout_times_out_when_pool_is_exhausted(connections):
+    pool = db.ConnectionPool('dsn', min_size=0, max_size=1, timeout=0.05)
+    pool.getconn()
+    with pytest.raises(db.PoolError):
+        pool.getconn()
+    assert pool.stats()['timeouts'] == 1
@@ -0,0 +1,96 @@
+import psycopg2
+import psycopg2.extensions
+import pytest
+
+import db
+import outbox
+
+
+class StopWorker(BaseException):
+    pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.rollbacks = 0
+        self.notifies = []
+        self.listening = False
+        self.in_transaction = False
+
+    def set_isolation_level(self, level):
+        pass
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=None):
+        self.listening = self.listening or query.startswith('LISTEN')
+
+    def get_transaction_status(self):
+        if self.in_transaction:
+            return psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        return psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """Run run_worker against fake connections; process_batch follows the given script of results"""
+    connections = []
+
+    def connect(dsn):
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(psycopg2, 'connect', connect)
+    monkeypatch.setattr(db, '_pool', db.ConnectionPool('dsn', min_size=0))
+    monkeypatch.setattr(outbox, 'outbox_stats', lambda cur: {'pending': 0, 'failed': 0, 'lagSeconds': 0.0})
+    monkeypatch.setattr(outbox.select, 'select', lambda *args: ([], [], []))
+    delays = []
+    monkeypatch.setattr(outbox.time, 'sleep', delays.append)
+
+    def run(script):
+        steps = iter(script)
+
+        def process_batch(conn):
+            conn.in_transaction = True
+            step = next(steps)
+            if isinstance(step, BaseException):
+                raise step
+            return step
+
+        monkeypatch.setattr(outbox, 'process_batch', process_batch)
+        with pytest.raises(StopWorker):
+            outbox.run_worker()
+        return connections, delays
+
+    return run
+
+
+def test_worker_reconnects_with_growing_delay(worker):
+    error = psycopg2.OperationalError("server closed the connection unexpectedly")
+    connections, delays = worker([error, error, error, 0, StopWorker()])
+
+    assert delays == [1, 2, 4]
+    listeners = [conn for conn in connections if conn.listening]
+    workers = [conn for conn in connections if not conn.listening]
+    assert len(listeners) == 4
+    assert all(conn.closed for conn in listeners)
+    # The worker connection was rolled back after each failure and went back to the pool
+    assert len(workers) == 1
+    assert workers[0].rollbacks >= 3
+    assert db._pool.stats()['inUse'] == 0
+
+
+def test_worker_delay_resets_after_a_successful_batch(worker):
+    error = psycopg2.OperationalError("terminating connection due to administrator command")
+    _, delays = worker([error, error, 0, error, StopWorker()])
+
+    assert delays == [1, 2, 1]
@@ -0,0 +1,189 @@
+import calendar
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from recurrence import MAX_COUNT, Recurrence, expand_rows, occurrences, parse_series
+
+
+def days(rule, start, window_start, window_end, exceptions=()):
+    return list(Recurrence.parse(rule).between(start, window_start, window_end, frozenset(exceptions)))
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('FREQ=DAILY', 'FREQ=DAILY'),
+    ('RRULE:freq=weekly;byday=fr,mo;count=4', 'FREQ=WEEKLY;BYDAY=MO,FR;COUNT=4'),
+    (' FREQ=MONTHLY ; INTERVAL=2 ; UNTIL=20261231T235959Z ', 'FREQ=MONTHLY;INTERVAL=2;UNTIL=20261231'),
+    ('FREQ=YEARLY;INTERVAL=1;WKST=MO', 'FREQ=YEARLY'),
+])
+def test_parse_normalizes_rules(text, expected):
+    assert str(Recurrence.parse(text)) == expected
+
+
+@pytest.mark.parametrize('text', [
+    None, '', '   ', 'DAILY', 'FREQ=HOURLY', 'FREQ=DAILY;FREQ=WEEKLY', 'FREQ=DAILY;BYMONTH=1',
+    'FREQ=DAILY;COUNT=2;UNTIL=20260101', 'FREQ=MONTHLY;BYDAY=MO', 'FREQ=WEEKLY;BYDAY=XX',
+    'FREQ=DAILY;INTERVAL=0', 'FREQ=DAILY;INTERVAL=two', f'FREQ=DAILY;COUNT={MAX_COUNT + 1}',
+    'FREQ=DAILY;UNTIL=2026-01-01', 'FREQ=WEEKLY;WKST=SU',
+])
+def test_parse_rejects_invalid_rules(text):
+    with pytest.raises(ValueError):
+        Recurrence.parse(text)
+
+
+def test_daily_interval_starts_at_the_window():
+    assert days('FREQ=DAILY;INTERVAL=3', date(2026, 1, 1), date(2026, 3, 1), date(2026, 3, 10)) == [
+        date(2026, 3, 2), date(2026, 3, 5), date(2026, 3, 8)
+    ]
+
+
+def test_weekly_rule_uses_the_start_weekday_or_byday():
+    monday = date(2026, 3, 2)
+    assert days('FREQ=WEEKLY', monday, monday, monday + timedelta(days=20)) == [
+        monday, monday + timedelta(days=7), monday + timedelta(days=14)
+    ]
+    assert days('FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,SU', monday, monday, monday + timedelta(days=20)) == [
+        date(2026, 3, 3), date(2026, 3, 8), date(2026, 3, 17), date(2026, 3, 22)
+    ]
+
+
+def test_weekly_byday_skips_days_before_the_start():
+    wednesday = date(2026, 3, 4)
+    assert days('FREQ=WEEKLY;BYDAY=MO,WE;COUNT=3', wednesday, date(2026, 3, 1), date(2026, 3, 31)) == [
+        date(2026, 3, 4), date(2026, 3, 9), date(2026, 3, 11)
+    ]
+
+
+def test_window_before_the_start_is_empty():
+    assert days('FREQ=DAILY', date(2026, 5, 1), date(2026, 4, 1), date(2026, 4, 30)) == []
+
+
+def test_exceptions_are_skipped():
+    assert days('FREQ=DAILY', date(2026, 1, 1), date(2026, 1, 1), date(2026, 1, 4), {date(2026, 1, 2)}) == [
+        date(2026, 1, 1), date(2026, 1, 3), date(2026, 1, 4)
+    ]
+
+
+def test_exceptions_still_count_towards_count():
+    assert days('FREQ=DAILY;COUNT=3', date(2026, 1, 1), date(2026, 1, 1), date(2026, 1, 31), {date(2026, 1, 2)}) == [
+        date(2026, 1, 1), date(2026, 1, 3)
+    ]
+
+
+def test_monthly_on_the_31st_skips_short_months():
+    assert days('FREQ=MONTHLY', date(2026, 1, 31), date(2026, 1, 1), date(2026, 8, 31)) == [
+        date(2026, 1, 31), date(2026, 3, 31), date(2026, 5, 31), date(2026, 7, 31), date(2026, 8, 31)
+    ]
+
+
+def test_yearly_on_february_29_only_falls_in_leap_years():
+    assert days('FREQ=YEARLY', date(2024, 2, 29), date(2024, 1, 1), date(2033, 12, 31)) == [
+        date(2024, 2, 29), date(2028, 2, 29), date(2032, 2, 29)
+    ]
+
+
+def test_count_only_counts_real_occurrences():
+    rule = Recurrence.parse('FREQ=MONTHLY;COUNT=3')
+    assert rule.last_date(date(2026, 1, 31)) == date(2026, 5, 31)
+
+
+@pytest.mark.parametrize('rule, start, last', [
+    ('FREQ=DAILY', date(2026, 1, 1), None),
+    ('FREQ=DAILY;UNTIL=20260310', date(2026, 1, 1), date(2026, 3, 10)),
+    ('FREQ=DAILY;INTERVAL=2;COUNT=5', date(2026, 1, 1), date(2026, 1, 9)),
+    ('FREQ=WEEKLY;BYDAY=MO,FR;COUNT=4', date(2026, 3, 2), date(2026, 3, 13)),
+    ('FREQ=YEARLY;COUNT=2', date(2024, 2, 29), date(2028, 2, 29)),
+])
+def test_last_date(rule, start, last):
+    assert Recurrence.parse(rule).last_date(start) == last
+
+
+def test_stored_recurrence_end_bounds_the_window():
+    # RecurrenceEnd is passed as `last` instead of being recomputed from COUNT
+    assert list(occurrences('FREQ=DAILY', date(2026, 1, 1), date(2026, 1, 1), date(2026, 1, 31),
+                            last=date(2026, 1, 3))) == [date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 3)]
+
+
+def test_parse_series_returns_column_values():
+    assert parse_series(None, None, date(2026, 1, 1)) == (None, [], None)
+    rule, exceptions, last = parse_series('freq=daily;count=3', ['2026-01-03', '2026-01-02', '2026-01-03'], date(2026, 1, 1))
+    assert (rule, exceptions, last) == ('FREQ=DAILY;COUNT=3', [date(2026, 1, 2), date(2026, 1, 3)], date(2026, 1, 3))
+
+
+@pytest.mark.parametrize('rule, exception_dates', [
+    ('FREQ=DAILY', '2026-01-02'),
+    ('FREQ=DAILY', ['01/02/2026']),
+    ('FREQ=DAILY;UNTIL=20251231', []),
+    ('FREQ=SECONDLY', []),
+])
+def test_parse_series_rejects_invalid_input(rule, exception_dates):
+    with pytest.raises(ValueError):
+        parse_series(rule, exception_dates, date(2026, 1, 1))
+
+
+def test_expand_rows_passes_plain_rows_and_replaces_series_dates():
+    plain = (1, date(2026, 1, 5), 'one-off', date(2026, 1, 5), None, [], None)
+    series = (2, date(2026, 1, 1), 'series', date(2026, 1, 1), 'FREQ=WEEKLY', [date(2026, 1, 8)], None)
+    rows = list(expand_rows([plain, series], (1, 3), 4, date(2026, 1, 1), date(2026, 1, 22)))
+    assert rows == [
+        plain,
+        (2, date(2026, 1, 1), 'series', date(2026, 1, 1), 'FREQ=WEEKLY', [date(2026, 1, 8)], None),
+        (2, date(2026, 1, 15), 'series', date(2026, 1, 15), 'FREQ=WEEKLY', [date(2026, 1, 8)], None),
+        (2, date(2026, 1, 22), 'series', date(2026, 1, 22), 'FREQ=WEEKLY', [date(2026, 1, 8)], None),
+    ]
+
+
+def test_expand_rows_respects_recurrence_end():
+    series = (date(2026, 1, 1), 'FREQ=DAILY', [], date(2026, 1, 2))
+    assert [row[0] for row in expand_rows([series], (0,), 1, date(2025, 12, 1), date(2026, 2, 1))] == [
+        date(2026, 1, 1), date(2026, 1, 2)
+    ]
+
+
+def reference_dates(rule, start, window_start, window_end):
+    """Day-by-day reading of the supported RFC 5545 subset, for comparison"""
+    result = []
+    count = 0
+    day = start
+    while day <= window_end and (rule.until is None or day <= rule.until):
+        if rule.freq == 'DAILY':
+            matches = (day - start).days % rule.interval == 0
+        elif rule.freq == 'WEEKLY':
+            weeks = ((day - timedelta(days=day.weekday())) - (start - timedelta(days=start.weekday()))).days // 7
+            matches = weeks % rule.interval == 0 and day.weekday() in (rule.weekdays or (start.weekday(),))
+        elif rule.freq == 'MONTHLY':
+            months = (day.year - start.year) * 12 + day.month - start.month
+            matches = months % rule.interval == 0 and day.day == start.day
+        else:
+            matches = (day.year - start.year) % rule.interval == 0 and (day.month, day.day) == (start.month, start.day)
+        if matches:
+            count += 1
+            if rule.count is not None and count > rule.count:
+                break
+            if day >= window_start:
+                result.append(day)
+        day += timedelta(days=1)
+    return result
+
+
+def test_matches_a_day_by_day_reference():
+    generator = random.Random(2026)
+    for _ in range(400):
+        freq = generator.choice(('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY'))
+        year, month = generator.randint(2023, 2026), generator.randint(1, 12)
+        start = date(year, month, generator.randint(1, calendar.monthrange(year, month)[1]))
+        parts = [f'FREQ={freq}', f'INTERVAL={generator.randint(1, 3)}']
+        if freq == 'WEEKLY' and generator.random() < 0.5:
+            parts.append('BYDAY=' + ','.join(generator.sample(('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU'), generator.randint(1, 3))))
+        ending = generator.random()
+        if ending < 0.3:
+            parts.append(f'COUNT={generator.randint(1, 20)}')
+        elif ending < 0.6:
+            parts.append(f"UNTIL={(start + timedelta(days=generator.randint(0, 900))).strftime('%Y%m%d')}")
+        rule = Recurrence.parse(';'.join(parts))
+        window_start = start + timedelta(days=generator.randint(-60, 800))
+        window_end = window_start + timedelta(days=generator.randint(0, 120))
+
+        assert list(rule.between(start, window_start, window_end)) == reference_dates(rule, start, window_start, window_end), \
+            (str(rule), start, window_start, window_end)
@@ -0,0 +1,129 @@
+import threading
+
+import pytest
+
+from response_cache import MemoryBackend, RedisBackend, ResponseCache
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def backend(request, monkeypatch):
+    if request.param == 'memory':
+        return MemoryBackend()
+    fakeredis = pytest.importorskip('fakeredis')
+    import redis
+    monkeypatch.setattr(redis.Redis, 'from_url', lambda url: fakeredis.FakeRedis())
+    return RedisBackend('redis://localhost:6379/0')
+
+
+@pytest.fixture
+def cache(backend):
+    return ResponseCache(backend, ttl=60, fill_timeout=0.2, poll_interval=0.01)
+
+
+def computed(body, *tags, status=200, during=None):
+    """A compute callback returning body with tags; during() runs in the middle of it"""
+    calls = []
+
+    def compute():
+        calls.append(body)
+        if during:
+            during()
+        return status, body, set(tags)
+
+    compute.calls = calls
+    return compute
+
+
+def test_entry_is_served_until_a_tag_is_invalidated(cache):
+    entry, hit = cache.get_or_compute('/api/teams?userId=1', computed('v1', 'user:1', 'team:2'))
+    assert (entry['body'], hit) == ('v1', False)
+
+    entry, hit = cache.get_or_compute('/api/teams?userId=1', computed('unused'))
+    assert (entry['body'], hit) == ('v1', True)
+
+    cache.invalidate(['team:2'])
+    entry, hit = cache.get_or_compute('/api/teams?userId=1', computed('v2', 'user:1', 'team:2'))
+    assert (entry['body'], hit) == ('v2', False)
+
+
+def test_unrelated_invalidation_during_fill_keeps_the_entry(cache):
+    compute = computed('v1', 'user:1', during=lambda: cache.invalidate(['user:2', 'team:9']))
+    cache.get_or_compute('/api/activities?userId=1', compute)
+
+    _, hit = cache.get_or_compute('/api/activities?userId=1', computed('unused'))
+    assert hit
+    assert cache.stats()['fills'] == 1
+    assert cache.stats()['skippedFills'] == 0
+
+
+def test_invalidation_of_own_tag_during_fill_skips_the_entry(cache):
+    compute = computed('v1', 'user:1', 'team:2', during=lambda: cache.invalidate(['team:2']))
+    entry, hit = cache.get_or_compute('/api/teams?userId=1', compute)
+    assert (entry['body'], hit) == ('v1', False)
+    assert cache.stats()['skippedFills'] == 1
+
+    entry, hit = cache.get_or_compute('/api/teams?userId=1', computed('v2', 'user:1', 'team:2'))
+    assert (entry['body'], hit) == ('v2', False)
+
+
+def test_error_responses_are_not_stored(cache):
+    cache.get_or_compute('/api/teams?userId=1', computed('boom', 'user:1', status=500))
+    entry, hit = cache.get_or_compute('/api/teams?userId=1', computed('ok', 'user:1'))
+    assert (entry['body'], hit) == ('ok', False)
+
+
+def test_concurrent_misses_compute_once(cache):
+    release = threading.Event()
+    compute = computed('v1', 'user:1', during=lambda: release.wait(1))
+    results = []
+
+    def fetch():
+        results.append(cache.get_or_compute('/api/goals?userId=1', compute)[0]['body'])
+
+    threads = [threading.Thread(target=fetch) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(2)
+    assert results == ['v1'] * 5
+    assert len(compute.calls) == 1
+
+
+def test_tag_versions_follow_the_epoch(backend):
+    backend.invalidate({'user:1', 'team:2'})
+    backend.invalidate({'team:2'})
+    assert backend.epoch() == 2
+    assert backend.tag_versions(['user:1', 'team:2', 'user:3']) == [1, 2, 0]
+
+
+def test_memory_backend_keeps_a_bounded_number_of_tag_versions():
+    backend = MemoryBackend(max_tags=2)
+    cache = ResponseCache(backend)
+    cache.invalidate(['user:1'])
+    cache.get_or_compute('/api/activities?userId=1', computed('v1', 'user:1'))
+
+    cache.invalidate(['user:2'])
+    cache.invalidate(['user:3'])
+    assert len(backend._versions) == 2
+    # Evicted and unknown tags read as the highest evicted version: user:1's own for now,
+    # then user:2's, which makes the entry stale (a spurious miss, never a stale hit)
+    assert backend.tag_versions(['user:1']) == [1]
+    _, hit = cache.get_or_compute('/api/activities?userId=1', computed('unused'))
+    assert hit
+    cache.invalidate(['user:4'])
+    assert backend.tag_versions(['user:1', 'user:9']) == [2, 2]
+    _, hit = cache.get_or_compute('/api/activities?userId=1', computed('v2', 'user:1'))
+    assert not hit
+
+
+def test_memory_backend_eviction_during_fill_skips_the_entry():
+    backend = MemoryBackend(max_tags=1)
+    cache = ResponseCache(backend)
+
+    def invalidate_and_evict():
+        cache.invalidate(['user:1'])
+        cache.invalidate(['user:2'])
+
+    cache.get_or_compute('/api/activities?userId=1', computed('v1', 'user:1', during=invalidate_and_evict))
+    assert cache.stats()['skippedFills'] == 1
@@ -0,0 +1,139 @@
+"""
+PUT /api/goals/<id> saves the goal's timelines through _save_timelines. execute_values is
+replaced by a stub that applies the statement to an in-memory Timeline table the way the
+CTE does, hands out IDs from a sequence and returns its result rows in reverse, so the
+test shows every new ID is paired with its input row through Ord and not by position.
+"""
+import pytest
+
+import app as planit
+
+GOAL_ID = 7
+OWNER_ID = 1
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.timelines = {
+            10: {'goal': GOAL_ID, 'title': 'Research'},
+            11: {'goal': GOAL_ID, 'title': 'Outline'},
+            12: {'goal': GOAL_ID, 'title': 'Abandoned'},
+            20: {'goal': 8, 'title': 'Another goal'},
+        }
+        self.next_id = 100
+        self.tombstones = []
+
+    def save_timelines(self, rows):
+        kept = [row for row in rows if row[1] in self.timelines and self.timelines[row[1]]['goal'] == row[7]]
+        kept_ids = {row[1] for row in kept}
+        deleted = [timeline_id for timeline_id, timeline in self.timelines.items()
+                   if timeline['goal'] == GOAL_ID and timeline_id not in kept_ids]
+        for timeline_id in deleted:
+            del self.timelines[timeline_id]
+        for row in kept:
+            self.timelines[row[1]]['title'] = row[2]
+        fresh = []
+        for row in rows:
+            if row not in kept:
+                fresh.append((row[0], self.next_id))
+                self.timelines[self.next_id] = {'goal': row[7], 'title': row[2]}
+                self.next_id += 1
+        results = ([('saved', row[0], row[1]) for row in kept]
+                   + [('saved', ord_, timeline_id) for ord_, timeline_id in fresh]
+                   + [('deleted', None, timeline_id) for timeline_id in deleted])
+        return results[::-1]
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, query, params=None):
+        assert 'UPDATE Goal' in query, query
+        self.rows = [(OWNER_ID,)]
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+        self.committed = False
+
+    def cursor(self):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeDatabase()
+    conn = FakeConnection(db)
+
+    def execute_values(cur, sql, rows, template=None, page_size=100, fetch=False):
+        if 'INSERT INTO DeletedItems' in sql:
+            db.tombstones.extend(rows)
+            return None
+        assert 'WITH input' in sql, sql
+        return db.save_timelines(rows)
+
+    monkeypatch.setattr(planit, 'get_db_connection', lambda: conn)
+    monkeypatch.setattr(planit, 'execute_values', execute_values)
+    monkeypatch.setattr(planit, 'response_cache', None)
+    db.conn = conn
+    return db
+
+
+def update_goal(timelines):
+    return planit.app.test_client().put(f'/api/goals/{GOAL_ID}', json={'goalTitle': 'Thesis', 'timelines': timelines})
+
+
+def test_kept_new_and_deleted_timelines(db):
+    titles = ['Draft', 'Outline v2', 'Review', 'Research', 'Submit']
+    response = update_goal([
+        {'timelineTitle': 'Draft', 'timelineId': None},
+        {'timelineTitle': 'Outline v2', 'timelineId': 11},
+        {'timelineTitle': 'Review'},
+        {'timelineTitle': 'Research', 'timelineId': '10'},
+        # Belongs to another goal, so it is inserted as a new timeline instead
+        {'timelineTitle': 'Submit', 'timelineId': 20},
+    ])
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    timeline_ids = response.get_json()['timelineIds']
+    assert timeline_ids[1] == 11 and timeline_ids[3] == 10
+    assert sorted(timeline_ids[i] for i in (0, 2, 4)) == [100, 101, 102]
+    assert [db.timelines[timeline_id]['title'] for timeline_id in timeline_ids] == titles
+    assert db.timelines[20]['goal'] == 8
+    assert 12 not in db.timelines
+    assert db.tombstones == [(OWNER_ID, 'timeline', 12)]
+    assert db.conn.committed
+
+
+def test_repeated_timeline_id_is_saved_once(db):
+    response = update_goal([
+        {'timelineTitle': 'Research', 'timelineId': 10},
+        {'timelineTitle': 'Research copy', 'timelineId': 10},
+    ])
+    assert response.status_code == 200
+    timeline_ids = response.get_json()['timelineIds']
+    assert timeline_ids[0] == 10
+    assert db.timelines[timeline_ids[1]]['title'] == 'Research copy'
+
+
+@pytest.mark.parametrize('timeline_id', ['abc', '1.5', 1.5, -3, True, [10], {'id': 10}])
+def test_non_integer_timeline_id_is_rejected(monkeypatch, timeline_id):
+    def no_database():
+        raise AssertionError("Invalid input must be rejected before the database is used")
+
+    monkeypatch.setattr(planit, 'get_db_connection', no_database)
+    response = update_goal([{'timelineTitle': 'Draft', 'timelineId': timeline_id}])
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
@@ -0,0 +1,27 @@
+import pytest
+
+import app as planit
+
+STATS_PATHS = ['/api/db/pool-stats', '/api/cache/stats', '/api/outbox/stats']
+
+
+@pytest.mark.parametrize('path', STATS_PATHS)
+def test_stats_endpoints_are_off_by_default(monkeypatch, path):
+    def no_database():
+        raise AssertionError("Disabled stats endpoints must not touch the database")
+
+    monkeypatch.setattr(planit, 'get_db_connection', no_database)
+    monkeypatch.setattr(planit, 'get_pool', no_database)
+    response = planit.app.test_client().get(path)
+    assert response.status_code == 404
+    assert response.get_json()['success'] is False
+
+
+def test_cache_stats_when_enabled(monkeypatch):
+    monkeypatch.setattr(planit, 'STATS_ENDPOINTS', True)
+    monkeypatch.setattr(planit, 'response_cache', None)
+    response = planit.app.test_client().get('/api/cache/stats')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['success'] and body['responses'] is None
+    assert 'hits' in body['profiles']
@@ -0,0 +1,117 @@
+"""
+GET /api/sync against a cursor stub that models PostgreSQL transaction ids: rows carry
+the id of the transaction that wrote them and only become visible once it commits.
+"""
+from datetime import date, datetime
+
+import pytest
+
+import app as planit
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.next_xid = 100
+        self.running = set()
+        self.activities = []
+
+    def begin(self):
+        xid = self.next_xid
+        self.next_xid += 1
+        self.running.add(xid)
+        return xid
+
+    def insert_activity(self, xid, activity_id, title):
+        self.activities.append((xid, (activity_id, title, None, 'work', 'medium', date(2026, 1, 5), None, None, None, [])))
+
+    def commit(self, xid):
+        self.running.discard(xid)
+
+    def snapshot_xmin(self):
+        return min(self.running, default=self.next_xid)
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, query, params=None):
+        if 'pg_current_snapshot' in query:
+            self.rows = [(datetime(2026, 1, 5, 12), str(self.db.snapshot_xmin()), False)]
+        elif 'FROM Activity a' in query:
+            since = int(params[1]) if len(params) > 1 else 0
+            self.rows = [row for xid, row in self.db.activities if xid not in self.db.running and xid >= since]
+        elif 'FROM Goal g' in query or 'FROM TeamMeeting tm' in query or 'FROM Notifications n' in query:
+            self.rows = []
+        elif 'FROM DeletedItems' in query:
+            self.rows = []
+        else:
+            raise AssertionError(f"Unexpected query: {query}")
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return FakeCursor(self.db)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeDatabase()
+    monkeypatch.setattr(planit, 'get_db_connection', lambda: FakeConnection(db))
+    return db
+
+
+def sync(client, cursor=None):
+    response = client.get('/api/sync?userId=1' + (f'&since={cursor}' if cursor else ''))
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()
+
+
+def titles(body):
+    return [activity['activitytitle'] for activity in body['activities']]
+
+
+def test_slow_writer_is_picked_up_by_the_next_sync(db):
+    client = planit.app.test_client()
+    setup = db.begin()
+    db.insert_activity(setup, 1, 'Standup')
+    db.commit(setup)
+    full = sync(client)
+    assert full['full'] and titles(full) == ['Standup']
+
+    # A long import starts before a sync and commits after it, with an older id than
+    # a quick write that starts and commits in between
+    slow = db.begin()
+    db.insert_activity(slow, 2, 'Imported')
+    quick = db.begin()
+    db.insert_activity(quick, 3, 'Lunch')
+    db.commit(quick)
+
+    during = sync(client, full['cursor'])
+    assert titles(during) == ['Lunch']
+
+    db.commit(slow)
+    after = sync(client, during['cursor'])
+    assert not after['full']
+    assert 'Imported' in titles(after)
+    assert titles(sync(client, after['cursor'])) == []
+
+
+@pytest.mark.parametrize('cursor', [
+    'not-a-cursor',
+    planit._encode_cursor(['2026-01-05T12:00:00']),
+    planit._encode_cursor(['2026-01-05T12:00:00', 'abc']),
+])
+def test_invalid_cursor_is_rejected(db, cursor):
+    response = planit.app.test_client().get(f'/api/sync?userId=1&since={cursor}')
+    assert response.status_code == 400
@@ -0,0 +1,79 @@
+from datetime import time
+
+import pytest
+
+import app as planit
+
+
+class FakeCursor:
+    """Answers the availability queries: one team, two users, and no busy time"""
+
+    def __init__(self, executed):
+        self.executed = executed
+        self.rows = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+        if 'FROM Team WHERE' in query:
+            self.rows = [(time(9), time(17))]
+        elif 'LOWER(UserEmail)' in query:
+            users = [(2, 'Ana', 'Ana@Example.com'), (3, 'Ben', 'ben@example.com')]
+            self.rows = [
+                (user_id, name, email, None, None, None, None) for user_id, name, email in users
+                if user_id in params[0] or email.lower() in params[1]
+            ]
+        else:
+            self.rows = []
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self.executed)
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    conn = FakeConnection()
+    monkeypatch.setattr(planit, 'get_db_connection', lambda: conn)
+    planit.user_profile_cache.clear()
+    return conn
+
+
+def post_availability(**payload):
+    body = {'startDate': '2026-03-02', 'endDate': '2026-03-06', **payload}
+    return planit.app.test_client().post('/api/teams/1/availability', json=body)
+
+
+@pytest.mark.parametrize('payload', [
+    {'endDate': '2026-04-02'},
+    {'startDate': '2025-01-01', 'endDate': '2026-12-31'},
+    {'limit': 0},
+    {'limit': -5},
+])
+def test_rejects_long_ranges_and_non_positive_limits(conn, payload):
+    response = post_availability(**payload)
+    assert response.status_code == 400
+    assert conn.executed == []
+
+
+def test_accepts_a_31_day_range(conn):
+    response = post_availability(startDate='2026-03-01', endDate='2026-03-31', limit=1)
+    assert response.status_code == 200
+    assert len(response.get_json()['suggestedSlots']) == 1
+
+
+def test_member_emails_match_case_insensitively(conn):
+    response = post_availability(memberEmails=['ana@example.com', 'BEN@example.com', 'nobody@example.com'], memberIds=[2])
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [member['userid'] for member in body['members']] == [2, 3]
+    assert body['missingEmails'] == ['nobody@example.com']
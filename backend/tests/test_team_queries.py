@@ -0,0 +1,135 @@
+"""
+The team endpoints must issue a fixed number of queries however many teams, meetings
+and invitees they return. The database is replaced by a cursor stub that answers each
+query from an in-memory data set and counts execute() calls.
+"""
+import json
+from datetime import date, time
+
+import pytest
+
+import app as planit
+
+USER_ID = 1
+
+
+class FakeData:
+    def __init__(self, teams, meetings_per_team, invitees_per_meeting):
+        self.teams = [
+            (team_id, f'Team {team_id}', None, time(9), time(17), USER_ID)
+            for team_id in range(1, teams + 1)
+        ]
+        self.meetings = []
+        self.invitations = []
+        meeting_id = 0
+        for team in self.teams:
+            for _ in range(meetings_per_team):
+                meeting_id += 1
+                self.meetings.append((team[0], meeting_id, f'Meeting {meeting_id}', None,
+                                      date(2026, 1, 5), time(10), time(11), 'mandatory', None, []))
+                for user_id in range(2, invitees_per_meeting + 2):
+                    self.invitations.append((meeting_id, user_id, 'accepted', 'mandatory'))
+
+    def team_documents(self):
+        for team in self.teams:
+            meetings = [row for row in self.meetings if row[0] == team[0]]
+            document = {'teamid': team[0], 'teamname': team[1], 'meetings': [{'teammeetingid': row[1]} for row in meetings]}
+            invited = sorted({row[1] for row in self.invitations if row[0] in {m[1] for m in meetings}})
+            yield json.dumps(document), team[0], [row[1] for row in meetings], invited
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+        self.itersize = 1
+
+    def execute(self, query, params=None):
+        self.conn.executed.append(query)
+        data = self.conn.data
+        if 'UserDataVersion' in query:
+            self.rows = [(1,)]
+        elif 'json_build_object' in query:
+            self.rows = list(data.team_documents())
+        elif 'FROM MeetingInvitations WHERE MeetingId = ANY' in query:
+            self.rows = [row for row in data.invitations if row[0] in params[0]]
+        elif 'FROM Users' in query:
+            self.rows = [(user_id, f'user{user_id}', f'user{user_id}@example.com', None, None, None, None)
+                         for user_id in params[0]]
+        elif 'FROM TeamMeeting tm' in query and 'JOIN Team t' in query:
+            self.rows = [row for row in data.meetings if row[0] in params[0]]
+        elif 'FROM TeamMeeting tm' in query:
+            self.rows = [row[1:] for row in data.meetings if row[0] == params[0]]
+        elif 'TeamMembers' in query:
+            self.rows = list(data.teams)
+        elif 'FROM Team' in query:
+            self.rows = [row for row in data.teams if row[0] == params[0]]
+        else:
+            raise AssertionError(f"Unexpected query: {query}")
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, data):
+        self.data = data
+        self.executed = []
+
+    def cursor(self, name=None):
+        return FakeCursor(self)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(planit, 'response_cache', None)
+    return planit.app.test_client()
+
+
+def count_queries(monkeypatch, client, url, teams, meetings_per_team, invitees_per_meeting):
+    conn = FakeConnection(FakeData(teams, meetings_per_team, invitees_per_meeting))
+    monkeypatch.setattr(planit, 'get_db_connection', lambda: conn)
+    # Cached profiles would skip the Users query and hide a change in the count
+    planit.user_profile_cache.clear()
+    response = client.get(url)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    body = response.get_json()
+    assert body['success']
+    return len(conn.executed), body
+
+
+SIZES = [(1, 1, 1), (5, 10, 3), (50, 40, 10)]
+
+
+@pytest.mark.parametrize('json_documents', [False, True])
+def test_get_teams_query_count_is_constant(monkeypatch, client, json_documents):
+    monkeypatch.setattr(planit, 'DB_JSON_DOCUMENTS', json_documents)
+    counts = set()
+    for teams, meetings, invitees in SIZES:
+        count, body = count_queries(monkeypatch, client, f'/api/teams?userId={USER_ID}', teams, meetings, invitees)
+        assert len(body['teams']) == teams
+        assert sum(len(team['meetings']) for team in body['teams']) == teams * meetings
+        counts.add(count)
+    assert len(counts) == 1
+
+
+@pytest.mark.parametrize('json_documents', [False, True])
+def test_get_team_details_query_count_is_constant(monkeypatch, client, json_documents):
+    monkeypatch.setattr(planit, 'DB_JSON_DOCUMENTS', json_documents)
+    counts = set()
+    for teams, meetings, invitees in SIZES:
+        count, body = count_queries(monkeypatch, client, f'/api/teams/1?userId={USER_ID}', teams, meetings, invitees)
+        assert len(body['team']['meetings']) == meetings
+        if not json_documents:
+            assert all(len(meeting['members']) == invitees for meeting in body['team']['meetings'])
+        counts.add(count)
+    assert len(counts) == 1
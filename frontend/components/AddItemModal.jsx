@@ -549,13 +549,35 @@ const AddItemModal = ({ isOpen, onClose }) => {
       const memberGoals = {}
       const memberTeams = {}
 
+      // Resolve every member email in one request
+      let foundEmails = {}
+      const usersById = {}
+      try {
+        const lookupResponse = await fetch(`${API_URL}/api/users/batch`, {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+          },
+          body: JSON.stringify({ emails: allMemberEmails }),
+        })
+        if (lookupResponse.ok) {
+          const lookupData = await lookupResponse.json()
+          foundEmails = lookupData.found.emails
+          lookupData.users.forEach((user) => {
+            usersById[user.userid] = user
+          })
+        }
+      } catch (error) {
+        console.error("Error looking up team members:", error)
+      }
+
       for (const email of allMemberEmails) {
         try {
-          const userResponse = await fetch(`${API_URL}/api/users/by-email/${encodeURIComponent(email)}`)
+          const foundUser = usersById[foundEmails[email]]
 
-          if (userResponse.ok) {
-            const userData = await userResponse.json()
-            const userId = userData.user.userid
+          if (foundUser) {
+            const userData = { user: foundUser }
+            const userId = foundUser.userid
 
             teamMembers.push({
               userid: userId,
@@ -2,6 +2,7 @@
 
 import { useRef, useEffect, useState } from "react"
 import { Edit2, Trash2 } from "lucide-react"
+import { avatarSrc } from "../services/avatars"
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000'
 
 const CalendarGrid = ({ currentDate, setCurrentDate, dataUpdateTrigger }) => {
@@ -547,7 +548,7 @@ const CalendarGrid = ({ currentDate, setCurrentDate, dataUpdateTrigger }) => {
                 <div className="text-sm">
                     <span className="font-medium">Created by:</span>
                     <div className="flex items-center mt-1">
-                        <img src={creator.userprofilepicture || `https://ui-avatars.com/api/?name=${creator.username}&background=0D8ABC&color=fff`} alt={creator.username} className="w-6 h-6 rounded-full mr-2" />
+                        <img src={avatarSrc(creator.userprofilepicture, creator.username)} alt={creator.username} className="w-6 h-6 rounded-full mr-2" />
                         <span>{creator.userid === getUserId() ? "You" : creator.username}</span>
                     </div>
                 </div>
@@ -561,7 +562,7 @@ const CalendarGrid = ({ currentDate, setCurrentDate, dataUpdateTrigger }) => {
                         {item.members && item.members.length > 0 ? (
                             item.members.map((member) => (
                                 <div key={member.userid} className="flex items-center">
-                                    <img src={member.userprofilepicture || `https://ui-avatars.com/api/?name=${member.username}&background=0D8ABC&color=fff`} alt={member.username} className="w-6 h-6 rounded-full mr-2" />
+                                    <img src={avatarSrc(member.userprofilepicture, member.username)} alt={member.username} className="w-6 h-6 rounded-full mr-2" />
                                     <span>{member.userid === getUserId() ? "You" : member.username}</span>
                                     {item.invitationtype === "request" && (
                                         <span className={`text-xs px-2 py-1 rounded ml-2 ${
@@ -2,18 +2,18 @@
 
 import { Search, ChevronLeft, ChevronRight, User, X, Bell } from "lucide-react"
 import { useState, useEffect, useRef } from "react"
+import { avatarSrc } from "../services/avatars"
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000'
 
 const Header = ({ currentDate, setCurrentDate, onProfileClick, onNotificationClick, dataUpdateTrigger }) => {
   const [searchQuery, setSearchQuery] = useState("")
   const [searchResults, setSearchResults] = useState([])
   const [showResults, setShowResults] = useState(false)
-  const [activities, setActivities] = useState([])
-  const [goals, setGoals] = useState([])
-  const [teams, setTeams] = useState([])
   const [userProfileData, setUserProfileData] = useState(null)
   const [unreadCount, setUnreadCount] = useState(0)
   const searchRef = useRef(null)
+  const searchTimeoutRef = useRef(null)
+  const latestSearchRef = useRef("")
 
   const getUserId = () => {
     const storedUser = JSON.parse(localStorage.getItem("user") || "{}")
@@ -24,7 +24,7 @@ const Header = ({ currentDate, setCurrentDate, onProfileClick, onNotificationCli
     try {
       const userId = getUserId()
       if (!userId) return;
-      const response = await fetch(`${API_URL}/api/notifications?userId=${userId}`)
+      const response = await fetch(`${API_URL}/api/notifications/unread-count?userId=${userId}`)
       if (response.ok) {
         const data = await response.json()
         setUnreadCount(data.unreadCount || 0)
@@ -43,7 +43,7 @@ const Header = ({ currentDate, setCurrentDate, onProfileClick, onNotificationCli
       if (response.ok) {
         const { user: apiUser } = await response.json()
         setUserProfileData({
-          imageUrl: apiUser.userprofilepicture || null,
+          imageUrl: avatarSrc(apiUser.userprofilepicture) || null,
           username: apiUser.username,
           isGoogleUser: !!apiUser.isgoogleuser,
         })
@@ -68,12 +68,22 @@ const Header = ({ currentDate, setCurrentDate, onProfileClick, onNotificationCli
   }
 
   useEffect(() => {
-    fetchAllData()
     fetchNotifications()
     fetchUserProfile()
 
-    const notificationInterval = setInterval(fetchNotifications, 30000)
-    
+    // New notifications are pushed over Server-Sent Events; poll only if the browser lacks EventSource
+    const userId = getUserId()
+    let notificationStream = null
+    let notificationInterval = null
+    if (userId && typeof EventSource !== "undefined") {
+      notificationStream = new EventSource(`${API_URL}/api/notifications/stream?userId=${userId}`)
+      notificationStream.addEventListener("notification", () => {
+        window.dispatchEvent(new CustomEvent("notificationsUpdated"))
+      })
+    } else {
+      notificationInterval = setInterval(fetchNotifications, 30000)
+    }
+
     const handleNotificationsUpdate = () => fetchNotifications()
     window.addEventListener("notificationsUpdated", handleNotificationsUpdate)
 
@@ -81,127 +91,57 @@ const Header = ({ currentDate, setCurrentDate, onProfileClick, onNotificationCli
     window.addEventListener("profileUpdated", handleProfileUpdate)
 
     return () => {
-      clearInterval(notificationInterval)
+      if (notificationStream) notificationStream.close()
+      if (notificationInterval) clearInterval(notificationInterval)
       window.removeEventListener("notificationsUpdated", handleNotificationsUpdate)
       window.removeEventListener("profileUpdated", handleProfileUpdate)
     }
   }, [dataUpdateTrigger])
 
-  const fetchAllData = async () => {
-    try {
-      const userId = getUserId()
-      if (!userId) return;
-
-      const [activitiesRes, goalsRes, teamsRes] = await Promise.all([
-        fetch(`${API_URL}/api/activities?userId=${userId}`),
-        fetch(`${API_URL}/api/goals?userId=${userId}`),
-        fetch(`${API_URL}/api/teams?userId=${userId}`)
-      ]);
-      
-      if (activitiesRes.ok) {
-        const activitiesData = await activitiesRes.json()
-        setActivities(activitiesData.activities || [])
-      } else {
-        console.error("Failed to fetch activities:", activitiesRes.status)
-      }
-
-      if (goalsRes.ok) {
-        const goalsData = await goalsRes.json()
-        setGoals(goalsData.goals || [])
-      } else {
-        console.error("Failed to fetch goals:", goalsRes.status)
-      }
-
-      if (teamsRes.ok) {
-        const teamsData = await teamsRes.json()
-        setTeams(teamsData.teams || [])
-      } else {
-        console.error("Failed to fetch teams:", teamsRes.status)
-      }
-    } catch (error) {
-      console.error("Error fetching data:", error)
-    }
+  const subtitleFor = (result) => {
+    if (result.type === "activity") return `Activity - ${result.data.activitydate}`
+    if (result.type === "goal") return `Goal - ${result.data.timelinestartdate} to ${result.data.timelineenddate}`
+    return `Meeting - ${result.data.teamname} - ${result.data.meetingdate}`
   }
 
-  const performSearch = (query) => {
+  const performSearch = async (query) => {
+    latestSearchRef.current = query
     if (!query.trim()) {
       setSearchResults([])
       setShowResults(false)
       return
     }
 
-    const results = []
-    const lowerQuery = query.toLowerCase()
-
-    activities.forEach((activity) => {
-      if (activity.activitytitle?.toLowerCase().includes(lowerQuery)) {
-        results.push({
-          id: activity.activityid,
-          type: "activity",
-          title: activity.activitytitle,
-          subtitle: `Activity - ${activity.activitydate}`,
-          data: activity,
-        })
-      }
-    })
-
-    goals.forEach((goal) => {
-      if (goal.timelines) {
-        goal.timelines.forEach((timeline) => {
-          const goalTimelineTitle = `${goal.goaltitle} - ${timeline.timelinetitle}`
-          if (
-            goalTimelineTitle.toLowerCase().includes(lowerQuery) ||
-            goal.goaltitle?.toLowerCase().includes(lowerQuery) ||
-            timeline.timelinetitle?.toLowerCase().includes(lowerQuery)
-          ) {
-            results.push({
-              id: goal.goalid,
-              type: "goal",
-              timelineId: timeline.timelineid,
-              title: goalTimelineTitle,
-              subtitle: `Goal - ${timeline.timelinestartdate} to ${timeline.timelineenddate}`,
-              data: { ...goal, ...timeline },
-            })
-          }
-        })
-      }
-    })
-
-    teams.forEach((team) => {
-      if (team.meetings) {
-        team.meetings.forEach((meeting) => {
-          if (meeting.meetingtitle?.toLowerCase().includes(lowerQuery)) {
-            results.push({
-              id: meeting.teammeetingid,
-              type: "meeting",
-              title: meeting.meetingtitle,
-              subtitle: `Meeting - ${team.teamname} - ${meeting.meetingdate}`,
-              data: { ...meeting, teamname: team.teamname },
-            })
-          }
-        })
+    try {
+      const userId = getUserId()
+      if (!userId) return
+
+      const response = await fetch(`${API_URL}/api/search?userId=${userId}&q=${encodeURIComponent(query)}&limit=10`)
+      if (!response.ok) {
+        console.error("Failed to search:", response.status)
+        return
       }
-    })
-
-    results.sort((a, b) => {
-      const aExact = a.title.toLowerCase() === lowerQuery
-      const bExact = b.title.toLowerCase() === lowerQuery
-      if (aExact && !bExact) return -1
-      if (!aExact && bExact) return 1
-      return a.title.localeCompare(b.title)
-    })
-
-    setSearchResults(results.slice(0, 10))
-    setShowResults(true)
+      const data = await response.json()
+      // Ignore responses for queries the user has already typed past
+      if (latestSearchRef.current !== query) return
+
+      setSearchResults((data.results || []).map((result) => ({ ...result, subtitle: subtitleFor(result) })))
+      setShowResults(true)
+    } catch (error) {
+      console.error("Error searching:", error)
+    }
   }
 
   const handleSearchChange = (e) => {
     const query = e.target.value
     setSearchQuery(query)
-    performSearch(query)
+    clearTimeout(searchTimeoutRef.current)
+    searchTimeoutRef.current = setTimeout(() => performSearch(query), 200)
   }
 
   const handleResultClick = (result) => {
+    clearTimeout(searchTimeoutRef.current)
+    latestSearchRef.current = ""
     setSearchQuery("")
     setSearchResults([])
     setShowResults(false)
@@ -268,6 +208,8 @@ const Header = ({ currentDate, setCurrentDate, onProfileClick, onNotificationCli
   }
 
   const clearSearch = () => {
+    clearTimeout(searchTimeoutRef.current)
+    latestSearchRef.current = ""
     setSearchQuery("")
     setSearchResults([])
     setShowResults(false)
@@ -3,6 +3,7 @@
 import { useState, useEffect, useRef } from "react"
 import { User, Mail, Calendar, Edit2, Lock, LogOut, Trash2, X, Camera, Save, AlertCircle, Users, ChevronRight, Plus, Eye } from "lucide-react"
 import { useNavigate, Link } from "react-router-dom"
+import { avatarSrc } from "../services/avatars"
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000'
 
 const ProfileSidebar = ({ isOpen, onClose, setCurrentDate }) => {
@@ -867,7 +868,7 @@ const ProfileSidebar = ({ isOpen, onClose, setCurrentDate }) => {
   
   const getDisplayProfilePicture = () => {
     const pictureSource = isEditing ? editedUser.profilePicture : user?.userprofilepicture
-    return pictureSource || null
+    return avatarSrc(pictureSource) || null
   }
   
   const handleViewMeetingOnCalendar = (meeting) => {
@@ -995,7 +996,7 @@ const ProfileSidebar = ({ isOpen, onClose, setCurrentDate }) => {
                       <div>
                         <span className="block text-sm font-medium text-gray-400 mb-1">Created by:</span>
                         <div className="flex items-center">
-                            <img src={creator.userprofilepicture || `https://ui-avatars.com/api/?name=${creator.username}&background=0D8ABC&color=fff`} alt={creator.username} className="w-8 h-8 rounded-full mr-3" />
+                            <img src={avatarSrc(creator.userprofilepicture, creator.username)} alt={creator.username} className="w-8 h-8 rounded-full mr-3" />
                             <p className="text-white">
                                 {creator.userid === user?.userid ? `${creator.username} (You)` : creator.username}
                             </p>
@@ -1467,7 +1468,7 @@ const ProfileSidebar = ({ isOpen, onClose, setCurrentDate }) => {
                           <div className="flex flex-col gap-2 mt-1">
                           {meeting.members?.map((member) => (
                               <div key={member.userid} className="flex items-center">
-                                  <img src={member.userprofilepicture || `https://ui-avatars.com/api/?name=${member.username}&background=0D8ABC&color=fff`} alt={member.username} className="w-6 h-6 rounded-full mr-2" />
+                                  <img src={avatarSrc(member.userprofilepicture, member.username)} alt={member.username} className="w-6 h-6 rounded-full mr-2" />
                                   <span
                                       className={`text-xs px-2 py-1 rounded ${
                                       meeting.invitationtype === 'request' && member.status === "accepted"
@@ -0,0 +1,14 @@
+const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000'
+
+// Uploaded avatars are stored by the API and referenced as /api/avatars/<hash>, which only
+// resolves against the API's origin. Other pictures (Google photos, data URLs) pass through.
+// Pass a name to fall back to a generated avatar when the user has no picture.
+export const avatarSrc = (picture, name) => {
+  if (picture && picture.startsWith("/api/")) {
+    return `${API_URL}${picture}`
+  }
+  if (picture || !name) {
+    return picture
+  }
+  return `https://ui-avatars.com/api/?name=${encodeURIComponent(name)}&background=0D8ABC&color=fff`
+}